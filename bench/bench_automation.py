@@ -0,0 +1,58 @@
+import argparse
+import time
+from typing import Callable
+
+from core.tools.automation import LIKE_QUERY, ElementResolver, UiaController
+from tests.fakes import FakeAutomationTree, FakeWindowController
+
+HWND = 0x1234
+
+
+def _per_call(function: Callable[[], object], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="UI Automation element cache benchmark on a fake tree")
+    parser.add_argument("--nodes", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    tree = FakeAutomationTree(size=args.nodes)
+    resolver = ElementResolver(tree)
+    cached = _per_call(lambda: resolver.run(HWND, LIKE_QUERY, tree.invoke), args.rounds)
+
+    def fresh() -> None:
+        resolver.invalidate(HWND)
+        resolver.run(HWND, LIKE_QUERY, tree.invoke)
+
+    uncached = _per_call(fresh, max(1, args.rounds // 10))
+
+    finds = tree.finds
+    stale_rounds = max(1, args.rounds // 100)
+    recovery = 0.0
+    for _ in range(stale_rounds):
+        tree.rebuild()
+        recovery += _per_call(lambda: resolver.run(HWND, LIKE_QUERY, tree.invoke), 1)
+    recovery /= stale_rounds
+    stale_lookups = (tree.finds - finds) / stale_rounds
+
+    automation = UiaController(FakeWindowController(HWND), tree)  # type: ignore[arg-type]
+    try:
+        automation.like().result()
+        worker = _per_call(lambda: automation.like().result(), args.rounds)
+    finally:
+        automation.shutdown()
+
+    print(f"nodes:                 {args.nodes}")
+    print(f"cached run:            {cached * 1e6:9.1f} us")
+    print(f"fresh tree walk:       {uncached * 1e6:9.1f} us")
+    print(f"stale recovery:        {recovery * 1e6:9.1f} us ({stale_lookups:.1f} lookups)")
+    print(f"cached via worker:     {worker * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import os
+import tempfile
+import time
+
+from core.constants import LOG_FILENAME
+from core.log import RingLog
+
+
+def _per_call_us(call, calls: int) -> float:
+    started = time.perf_counter()
+    for index in range(calls):
+        call("Hotkey %s #%d", "ctrl+space", index)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-event cost of RingLog calls against a live writer")
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        ring = RingLog()
+        ring.start(directory)
+        baseline = _per_call_us(lambda msg, *call_args: None, args.calls)
+        info = _per_call_us(ring.info, args.calls)
+        debug = _per_call_us(ring.debug, args.calls)
+        started = time.perf_counter()
+        ring.stop()
+        drain = (time.perf_counter() - started) * 1000.0
+        written = sum(
+            os.path.getsize(os.path.join(directory, name))
+            for name in os.listdir(directory)
+            if name.startswith(LOG_FILENAME)
+        )
+
+    print(f"calls:                    {args.calls}")
+    print(f"empty call:               {baseline:8.2f} us")
+    print(f"log.info (ring + file):   {info - baseline:8.2f} us added")
+    print(f"log.debug (ring only):    {debug - baseline:8.2f} us added")
+    print(f"drain on stop:            {drain:8.1f} ms")
+    print(f"written (after rotation): {written} bytes")
+
+
+if __name__ == "__main__":
+    main()
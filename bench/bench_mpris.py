@@ -0,0 +1,62 @@
+import argparse
+import time
+from typing import Callable, List
+
+from jeepney import DBusAddress, new_method_call
+from jeepney.io.blocking import open_dbus_connection
+
+from core.tools.actions import ACTIONS_BY_NAME
+from core.tools.mpris import MPRIS_PATH, MPRIS_PLAYER_INTERFACE, MprisController
+from tests.dbus_player import DBusDaemon, MockPlayer
+
+
+def _latencies(function: Callable[[], object], rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return sorted(samples)
+
+
+def _report(label: str, samples: List[float]) -> None:
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<28}{p50:9.3f}{p99:9.3f}{samples[-1]:9.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MPRIS command latency against a mock player on a private bus")
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    daemon = DBusDaemon()
+    player = MockPlayer(daemon.address)
+    controller = MprisController(bus=daemon.address, timeout=2.0)
+    try:
+        controller.start()
+        play_pause = ACTIONS_BY_NAME["play_pause"]
+        controller.perform(play_pause)
+        persistent = _latencies(lambda: controller.perform(play_pause), args.rounds)
+        volume = _latencies(lambda: controller.perform(ACTIONS_BY_NAME["volume_up"]), args.rounds)
+
+        address = DBusAddress(MPRIS_PATH, bus_name=player.name, interface=MPRIS_PLAYER_INTERFACE)
+
+        def connect_per_press() -> None:
+            with open_dbus_connection(bus=daemon.address) as conn:
+                conn.send_and_get_reply(new_method_call(address, "PlayPause"), timeout=2.0)
+
+        fresh = _latencies(connect_per_press, max(1, args.rounds // 10))
+    finally:
+        controller.stop()
+        player.close()
+        daemon.close()
+
+    print(f"{'command':<28}{'p50':>9}{'p99':>9}{'max':>9}  (ms)")
+    _report("PlayPause (persistent)", persistent)
+    _report("volume step (Get+Set)", volume)
+    _report("PlayPause (connect/press)", fresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import sys
+import tempfile
+import time
+
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard, write_dummy_plugins
+
+install_keyboard()
+
+from core.tools.listener import HotkeyListener  # noqa: E402
+from core.tools.plugins import PluginRegistry  # noqa: E402
+from core.tools.timers import TimerWheel  # noqa: E402
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup cost of plugin discovery with dummy manifest plugins")
+    parser.add_argument("--plugins", type=int, default=50)
+    parser.add_argument("--entry-points", action="store_true", help="also scan installed entry points")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        names = write_dummy_plugins(directory, args.plugins, "bench_plugin")
+        wheel = TimerWheel(lambda: 0.0, threaded=False)
+        player = FakePlayer()
+        config = FakeConfig({"plugin_hotkeys": {names[0]: "ctrl+k"}})
+        group = "yandex_music_hotkeys.actions" if args.entry_points else "ymh.bench.none"
+        plugins = PluginRegistry(directory, group=group)
+
+        started = time.perf_counter()
+        listener = HotkeyListener(player, config, plugins=plugins, wheel=wheel)  # type: ignore[arg-type]
+        listener.start()
+        hooks_live = _ms(started)
+
+        started = time.perf_counter()
+        plugins.discover()
+        discover = _ms(started)
+
+        started = time.perf_counter()
+        listener.add_plugin_actions()
+        add_actions = _ms(started)
+        imported = sum(name in sys.modules for name in names)
+
+        keyboard = install_keyboard()
+        started = time.perf_counter()
+        keyboard.tap("ctrl+k")
+        wheel.run_due()
+        first_fire = _ms(started)
+
+        started = time.perf_counter()
+        keyboard.tap("ctrl+k")
+        wheel.run_due()
+        second_fire = _ms(started)
+
+    print(f"plugins:                    {len(plugins.actions())}")
+    print(f"listener to hooks live:     {hooks_live:8.2f} ms")
+    print(f"discovery (after hooks):    {discover:8.2f} ms")
+    print(f"add plugin actions:         {add_actions:8.2f} ms")
+    print(f"modules imported at start:  {imported}")
+    print(f"first fire (imports):       {first_fire:8.2f} ms")
+    print(f"second fire:                {second_fire:8.2f} ms")
+    print(f"dispatched:                 {player.performed}")
+
+
+if __name__ == "__main__":
+    main()
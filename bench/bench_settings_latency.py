@@ -0,0 +1,117 @@
+import argparse
+import multiprocessing
+import threading
+import time
+from typing import List
+
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard
+
+install_keyboard()
+
+from core.tools.listener import HotkeyListener  # noqa: E402
+
+
+def tk_ui(stop: "threading.Event", slice_ms: float, rows: int = 40) -> None:
+    import tkinter as tk
+
+    root = tk.Tk()
+    buttons = []
+    for row in range(rows):
+        tk.Label(root, text=f"Action {row}").grid(row=row, column=0, sticky="w")
+        button = tk.Button(root, text="ctrl+space", width=16)
+        button.grid(row=row, column=1)
+        buttons.append(button)
+    tick = 0
+    try:
+        while not stop.is_set():
+            deadline = time.perf_counter() + slice_ms / 1000.0
+            while time.perf_counter() < deadline:
+                tick += 1
+                for button in buttons:
+                    button.configure(text=f"ctrl+f{tick % 12 + 1}")
+                root.update_idletasks()
+            root.update()
+    finally:
+        root.destroy()
+
+
+def _has_display() -> bool:
+    import tkinter as tk
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+    return True
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(events: int, interval: float) -> List[float]:
+    keyboard = install_keyboard()
+    keyboard.reset()
+    listener = HotkeyListener(FakePlayer(), FakeConfig())  # type: ignore[arg-type]
+    listener.start()
+    latencies: List[float] = []
+
+    def hook_thread() -> None:
+        due = time.perf_counter()
+        for _ in range(events):
+            due += interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            keyboard.press("ctrl")
+            keyboard.press("space")
+            keyboard.release("space")
+            keyboard.release("ctrl")
+            latencies.append((time.perf_counter() - due) * 1000.0)
+
+    thread = threading.Thread(target=hook_thread, name="Hook")
+    thread.start()
+    thread.join()
+    listener.stop()
+    return latencies
+
+
+def run(mode: str, events: int, interval: float, slice_ms: float) -> List[float]:
+    if mode == "idle":
+        return measure(events, interval)
+    if mode == "in-process":
+        stop = threading.Event()
+        worker = threading.Thread(target=tk_ui, args=(stop, slice_ms), name="SettingsUI", daemon=True)
+    else:
+        stop = multiprocessing.Event()
+        worker = multiprocessing.Process(target=tk_ui, args=(stop, slice_ms), daemon=True)
+    worker.start()
+    try:
+        return measure(events, interval)
+    finally:
+        stop.set()
+        worker.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hook callback latency while the settings UI is busy")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    parser.add_argument("--slice-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    if not _has_display():
+        raise SystemExit("Tk needs a display to run this benchmark")
+
+    print(f"{'mode':<16}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+    for mode in ("idle", "in-process", "out-of-process"):
+        samples = run(mode, args.events, args.interval_ms / 1000.0, args.slice_ms)
+        print(
+            f"{mode:<16}"
+            + "".join(f"{_percentile(samples, q):9.2f}" for q in (0.5, 0.9, 0.99))
+            + f"{max(samples):9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
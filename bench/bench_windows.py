@@ -0,0 +1,62 @@
+import argparse
+import time
+import tracemalloc
+
+from core.tools.routing import TargetRouter
+from core.tools.windows import Win32WindowBackend
+from tests.fakes import FakeUser32, fake_user32
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Window enumeration allocations against a fake user32")
+    parser.add_argument("--windows", type=int, default=300)
+    parser.add_argument("--match-at", type=int, default=40)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    titles = [f"Window {index}" for index in range(args.windows)]
+    titles[args.match_at] = "Yandex Music"
+    user32 = FakeUser32(titles)
+
+    def visit(hwnd: int, title: str) -> bool:
+        return "Yandex Music" not in title
+
+    with fake_user32(user32) as allocations:
+        backend = Win32WindowBackend()
+        router = TargetRouter(backend)
+        setup = (allocations.callbacks, allocations.buffers)
+        backend.enum_windows(visit)
+
+        user32.visited = 0
+        started = time.perf_counter()
+        for _ in range(args.lookups):
+            backend.enum_windows(visit)
+        lookup = (time.perf_counter() - started) / args.lookups
+        visited = user32.visited / args.lookups
+
+        tracemalloc.start()
+        for _ in range(args.lookups):
+            backend.enum_windows(visit)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        user32.visited = 0
+        started = time.perf_counter()
+        router.rebuild()
+        rebuild = time.perf_counter() - started
+
+    callbacks = allocations.callbacks - setup[0]
+    buffers = allocations.buffers - setup[1]
+    lookups = args.lookups * 2
+    print(f"windows:                  {args.windows} (match at {args.match_at + 1})")
+    print(f"setup allocations:        {setup[0]} callback, {setup[1]} buffer")
+    print(f"callbacks per lookup:     {callbacks / lookups:.3f}")
+    print(f"buffers per lookup:       {buffers / lookups:.3f}")
+    print(f"traced peak:              {peak} bytes over {args.lookups} lookups")
+    print(f"windows visited/lookup:   {visited:.0f}")
+    print(f"lookup:                   {lookup * 1e6:8.1f} us")
+    print(f"full rebuild:             {rebuild * 1e6:8.1f} us ({user32.visited} windows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import subprocess
 import textwrap
 import os
@@ -55,6 +56,14 @@ def generate_version_file() -> str:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=f"Build {APP_NAME} with PyInstaller")
+    parser.add_argument(
+        "--onefile",
+        action="store_true",
+        help="single executable; every launch, including each settings window, re-extracts the whole bundle",
+    )
+    args = parser.parse_args()
+
     version_file = generate_version_file()
 
     excluded = [
@@ -70,7 +79,7 @@ def main() -> None:
     cmd = [
         sys.executable, "-m", "PyInstaller",
         "--noconsole",
-        "--onefile",
+        "--onefile" if args.onefile else "--onedir",
         "--name", APP_NAME,
         "--add-data", "assets;assets",
         "--icon", "assets/icon.ico",
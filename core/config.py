@@ -2,16 +2,22 @@ import json
 import locale
 import os
 import sys
-import winreg
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from core.constants import (
     APP_NAME,
     CONFIG_FILENAME,
     DEFAULT_HOTKEYS,
+    DEFAULT_LINKS,
+    GESTURE_KINDS,
     REGISTRY_RUN_PATH,
+    YANDEX_MUSIC_PROTOCOL,
 )
 from core.i18n import DEFAULT_LOCALE, SUPPORTED_LOCALES
+from core.log import log
+
+if sys.platform == "win32":
+    import winreg
 
 
 def _default_language() -> str:
@@ -44,7 +50,11 @@ class Config:
 
     def load_config(self) -> Dict[str, Any]:
         if not os.path.isfile(self.config_path):
-            default = {"hotkeys": dict(DEFAULT_HOTKEYS), "language": _default_language()}
+            default = {
+                "hotkeys": dict(DEFAULT_HOTKEYS),
+                "language": _default_language(),
+                "profiles": {},
+            }
             self._write_config(default)
             return default
 
@@ -52,7 +62,12 @@ class Config:
             with open(self.config_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except (json.JSONDecodeError, OSError):
-            return {"hotkeys": dict(DEFAULT_HOTKEYS), "language": _default_language()}
+            log.exception("Failed to read config %s", self.config_path)
+            return {
+                "hotkeys": dict(DEFAULT_HOTKEYS),
+                "language": _default_language(),
+                "profiles": {},
+            }
 
         hotkeys = data.get("hotkeys") or {}
         merged = dict(DEFAULT_HOTKEYS)
@@ -64,37 +79,165 @@ class Config:
         if lang not in SUPPORTED_LOCALES:
             lang = DEFAULT_LOCALE
 
-        return {"hotkeys": merged, "language": lang}
+        return {
+            "hotkeys": merged,
+            "language": lang,
+            "profiles": self._parse_profiles(data.get("profiles")),
+            "targets": self._parse_targets(data.get("targets")),
+            "gestures": self._parse_gestures(data.get("gestures")),
+            "links": self._parse_links(data.get("links")),
+            "plugin_hotkeys": self._parse_plugin_hotkeys(data.get("plugin_hotkeys")),
+            "settings_out_of_process": bool(data.get("settings_out_of_process", True)),
+        }
+
+    @staticmethod
+    def _parse_gestures(raw: Any) -> Dict[str, Dict[str, str]]:
+        gestures: Dict[str, Dict[str, str]] = {}
+        if not isinstance(raw, dict):
+            return gestures
+        for combo, kinds in raw.items():
+            combo_name = str(combo).strip().lower()
+            if not combo_name or not isinstance(kinds, dict):
+                continue
+            binding = {
+                kind: action.strip()
+                for kind, action in kinds.items()
+                if kind in GESTURE_KINDS and isinstance(action, str) and action.strip()
+            }
+            if binding:
+                gestures[combo_name] = binding
+        return gestures
+
+    @staticmethod
+    def _parse_plugin_hotkeys(raw: Any) -> Dict[str, str]:
+        if not isinstance(raw, dict):
+            return {}
+        return {
+            str(action): str(combo).strip().lower()
+            for action, combo in raw.items()
+            if action not in DEFAULT_HOTKEYS and isinstance(combo, str) and combo.strip()
+        }
+
+    @staticmethod
+    def _parse_links(raw: Any) -> Dict[str, str]:
+        links = dict(DEFAULT_LINKS)
+        if not isinstance(raw, dict):
+            return links
+        for action, url in raw.items():
+            if action not in DEFAULT_LINKS:
+                continue
+            url = str(url or "").strip()
+            if url and not url.startswith(YANDEX_MUSIC_PROTOCOL):
+                log.warning("Ignoring link for %s: %s is not a %s URL", action, url, YANDEX_MUSIC_PROTOCOL)
+                continue
+            links[action] = url
+        return links
+
+    @staticmethod
+    def _parse_targets(raw: Any) -> List[Dict[str, Any]]:
+        targets: List[Dict[str, Any]] = []
+        if not isinstance(raw, list):
+            return targets
+        for entry in raw:
+            if not isinstance(entry, dict):
+                continue
+            titles = [str(title) for title in entry.get("titles") or [] if str(title)]
+            if not titles:
+                continue
+            try:
+                priority = int(entry.get("priority") or 0)
+            except (TypeError, ValueError):
+                priority = 0
+            target: Dict[str, Any] = {
+                "name": str(entry.get("name") or titles[0]),
+                "titles": titles,
+                "priority": priority,
+            }
+            if isinstance(entry.get("actions"), list):
+                target["actions"] = [str(action) for action in entry["actions"]]
+            targets.append(target)
+        return targets
+
+    @staticmethod
+    def _parse_profiles(raw: Any) -> Dict[str, Dict[str, Any]]:
+        profiles: Dict[str, Dict[str, Any]] = {}
+        if not isinstance(raw, dict):
+            return profiles
+        for app, overrides in raw.items():
+            app_name = str(app).strip().lower()
+            if not app_name:
+                continue
+            if overrides is False:
+                profiles[app_name] = {"disabled": True, "hotkeys": {}}
+            elif isinstance(overrides, dict):
+                profiles[app_name] = {
+                    "disabled": False,
+                    "hotkeys": {
+                        str(key).strip(): str(combo or "").strip().lower()
+                        for key, combo in overrides.items()
+                        if str(key).strip()
+                    },
+                }
+        return profiles
+
+    def _read_raw(self) -> Dict[str, Any]:
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError):
+            log.exception("Failed to read config %s", self.config_path)
+            return {}
+        return data if isinstance(data, dict) else {}
 
     def _write_config(self, data: Dict[str, Any]) -> None:
         try:
             with open(self.config_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except OSError:
-            pass
+            log.exception("Failed to write config %s", self.config_path)
 
     def save_default_config(self) -> None:
         self._write_config({
             "hotkeys": dict(DEFAULT_HOTKEYS),
             "language": self.get_language(),
+            "profiles": {},
         })
 
     def get_hotkeys(self) -> Dict[str, str]:
         return self.load_config().get("hotkeys", dict(DEFAULT_HOTKEYS))
 
+    def get_plugin_hotkeys(self) -> Dict[str, str]:
+        return self.load_config().get("plugin_hotkeys", {})
+
+    def get_profiles(self) -> Dict[str, Dict[str, Any]]:
+        return self.load_config().get("profiles", {})
+
+    def get_targets(self) -> List[Dict[str, Any]]:
+        return self.load_config().get("targets", [])
+
+    def get_links(self) -> Dict[str, str]:
+        return self.load_config().get("links", dict(DEFAULT_LINKS))
+
+    def is_settings_out_of_process(self) -> bool:
+        return self.load_config().get("settings_out_of_process", True)
+
     def get_language(self) -> str:
         return self.load_config().get("language", _default_language())
 
     def set_language(self, lang: str) -> None:
         if lang not in SUPPORTED_LOCALES:
             lang = DEFAULT_LOCALE
-        data = self.load_config()
+        data = self._read_raw()
         data["language"] = lang
         self._write_config(data)
 
-    def save_config(self, hotkeys: Dict[str, str]) -> None:
-        data = self.load_config()
+    def save_config(self, hotkeys: Dict[str, str], plugin_hotkeys: Optional[Dict[str, str]] = None) -> None:
+        data = self._read_raw()
         data["hotkeys"] = hotkeys
+        if plugin_hotkeys is not None:
+            data["plugin_hotkeys"] = plugin_hotkeys
         self._write_config(data)
 
     @staticmethod
@@ -104,6 +247,9 @@ class Config:
         return sys.argv[0]
 
     def set_autostart(self, enabled: bool) -> None:
+        if sys.platform != "win32":
+            log.info("Autostart is only supported on Windows")
+            return
         try:
             key = winreg.OpenKey(
                 winreg.HKEY_CURRENT_USER,
@@ -123,9 +269,11 @@ class Config:
                     pass
             winreg.CloseKey(key)
         except OSError:
-            pass
+            log.exception("Failed to update autostart (enabled=%s)", enabled)
 
     def is_autostart_enabled(self) -> bool:
+        if sys.platform != "win32":
+            return False
         try:
             key = winreg.OpenKey(
                 winreg.HKEY_CURRENT_USER,
@@ -140,6 +288,8 @@ class Config:
             return False
 
     def fix_autostart_path(self) -> None:
+        if sys.platform != "win32":
+            return
         try:
             key = winreg.OpenKey(
                 winreg.HKEY_CURRENT_USER,
@@ -162,8 +312,9 @@ class Config:
                     if " " in path_to_write:
                         path_to_write = f'"{path_to_write}"'
                     winreg.SetValueEx(key, APP_NAME, 0, winreg.REG_SZ, path_to_write)
+                    log.info("Autostart path updated to %s", path_to_write)
             except FileNotFoundError:
                 pass
             winreg.CloseKey(key)
         except OSError:
-            pass
+            log.exception("Failed to fix autostart path")
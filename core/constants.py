@@ -7,24 +7,81 @@ APP_VERSION = "1.0.0"
 APP_OWNER = "Valiantsin Dzerakh"
 OWNER_TAGNAME = "valentderah"
 
+SETTINGS_UI_FLAG = "--settings-ui"
+
 CONFIG_FILENAME = "config.json"
+LOG_FILENAME = "app.log"
+LOG_MAX_BYTES = 512 * 1024
+LOG_BACKUP_COUNT = 2
+LOG_RING_SIZE = 2048
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 1.0
+
+PLUGINS_DIRNAME = "plugins"
+PLUGIN_ENTRY_POINT_GROUP = "yandex_music_hotkeys.actions"
 
 TARGET_WINDOW_TITLES = ["Yandex Music", "Яндекс Музыка"]
 
 YANDEX_MUSIC_PROTOCOL = "yandexmusic://"
+LAUNCH_THROTTLE_SECONDS = 5.0
+DEFAULT_LINKS: Dict[str, str] = {
+    "open_app": YANDEX_MUSIC_PROTOCOL,
+    "open_my_wave": YANDEX_MUSIC_PROTOCOL + "radio/user/onyourwave",
+    "open_playlist": "",
+}
 REGISTRY_RUN_PATH = r"Software\Microsoft\Windows\CurrentVersion\Run"
 
 DEFAULT_HOTKEYS: Dict[str, str] = {
     "next_track": "ctrl+right",
     "previous_track": "ctrl+left",
     "play_pause": "ctrl+space",
+    "volume_up": "",
+    "volume_down": "",
+    "mute": "",
+    "seek_forward": "",
+    "seek_backward": "",
+    "open_app": "",
+    "open_my_wave": "",
+    "open_playlist": "",
+    "like": "",
+    "dislike": "",
 }
 
 WM_APPCOMMAND = 0x0319
+SEND_MESSAGE_TIMEOUT_MS = 200
 
 APPCOMMAND_MEDIA_NEXTTRACK = 11
 APPCOMMAND_MEDIA_PREVIOUSTRACK = 12
 APPCOMMAND_MEDIA_PLAY_PAUSE = 14
+APPCOMMAND_VOLUME_MUTE = 8
+APPCOMMAND_VOLUME_DOWN = 9
+APPCOMMAND_VOLUME_UP = 10
+APPCOMMAND_MEDIA_FAST_FORWARD = 49
+APPCOMMAND_MEDIA_REWIND = 50
+
+MPRIS_BUS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PLAYER_HINTS = ("yandex",)
+MPRIS_CALL_TIMEOUT = SEND_MESSAGE_TIMEOUT_MS / 1000
+MPRIS_SEEK_STEP_US = 5_000_000
+MPRIS_VOLUME_STEP = 0.05
+
+STEP_COALESCE_WINDOW = 0.12
+
+GESTURE_KINDS = ("tap", "double_tap", "hold")
+GESTURE_DOUBLE_TAP_WINDOW = 0.3
+GESTURE_HOLD_THRESHOLD = 0.5
+GESTURE_HOLD_REPEAT = 0.25
+
+STARTUP_TARGET_MS = 250.0
+
+WAKEUP_WINDOW_MINUTES = 10
+
+HOOK_SLOW_CALLBACK_SECONDS = 0.1
+HOOK_THREAD_STOP_TIMEOUT = 1.0
+WATCHDOG_PROBE_TIMEOUT = 0.5
+WATCHDOG_MIN_INTERVAL = 30.0
+WATCHDOG_PROBE_VK = 0x88
+WATCHDOG_MISS_LIMIT = 3
 
 
 def get_resource_path(relative_path: str) -> str:
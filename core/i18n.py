@@ -9,6 +9,7 @@ _TRANSLATIONS: Dict[str, Dict[str, str]] = {
     "en": {
         "menu.open_app": "Open Yandex Music",
         "menu.settings": "Settings",
+        "menu.save_log": "Save diagnostic log",
         "menu.exit": "Exit",
         "window.settings_title": "Settings",
         "settings.title": "Settings",
@@ -20,12 +21,23 @@ _TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "hotkeys.next_track": "Next track",
         "hotkeys.previous_track": "Previous track",
         "hotkeys.play_pause": "Play/Pause",
+        "hotkeys.volume_up": "Volume up",
+        "hotkeys.volume_down": "Volume down",
+        "hotkeys.mute": "Mute",
+        "hotkeys.seek_forward": "Seek forward",
+        "hotkeys.seek_backward": "Seek backward",
+        "hotkeys.open_app": "Open app",
+        "hotkeys.open_my_wave": "Open My Wave",
+        "hotkeys.open_playlist": "Open playlist",
+        "hotkeys.like": "Like",
+        "hotkeys.dislike": "Dislike",
         "lang.en": "English",
         "lang.ru": "Русский",
     },
     "ru": {
         "menu.open_app": "Открыть Яндекс Музыку",
         "menu.settings": "Настройки",
+        "menu.save_log": "Сохранить журнал диагностики",
         "menu.exit": "Закрыть",
         "window.settings_title": "Настройки",
         "settings.title": "Настройки",
@@ -37,6 +49,16 @@ _TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "hotkeys.next_track": "Следующий трек",
         "hotkeys.previous_track": "Предыдущий трек",
         "hotkeys.play_pause": "Воспроизведение/Пауза",
+        "hotkeys.volume_up": "Громче",
+        "hotkeys.volume_down": "Тише",
+        "hotkeys.mute": "Без звука",
+        "hotkeys.seek_forward": "Перемотка вперёд",
+        "hotkeys.seek_backward": "Перемотка назад",
+        "hotkeys.open_app": "Открыть приложение",
+        "hotkeys.open_my_wave": "Открыть Мою волну",
+        "hotkeys.open_playlist": "Открыть плейлист",
+        "hotkeys.like": "Нравится",
+        "hotkeys.dislike": "Не нравится",
         "lang.en": "English",
         "lang.ru": "Русский",
     },
@@ -0,0 +1,187 @@
+import atexit
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+from core.constants import (
+    LOG_BACKUP_COUNT,
+    LOG_BATCH_SIZE,
+    LOG_FILENAME,
+    LOG_FLUSH_INTERVAL,
+    LOG_MAX_BYTES,
+    LOG_RING_SIZE,
+)
+from core.tools.wakeups import wakeups
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+_LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+Record = Tuple[float, int, str, Tuple[Any, ...]]
+
+
+def _format(record: Record) -> str:
+    created, level, msg, args = record
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args!r}"
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+    millis = int((created % 1) * 1000)
+    return f"{stamp}.{millis:03d} {_LEVEL_NAMES.get(level, level)} {msg}\n"
+
+
+class RingLog:
+    def __init__(
+        self,
+        ring_size: int = LOG_RING_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        max_bytes: int = LOG_MAX_BYTES,
+        backup_count: int = LOG_BACKUP_COUNT,
+        file_level: int = INFO,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ) -> None:
+        self._ring: Deque[Record] = deque(maxlen=ring_size)
+        self._pending: Deque[Record] = deque(maxlen=ring_size)
+        self._dropped = 0
+        self._reported_dropped = 0
+        self._batch_size = batch_size
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._file_level = file_level
+        self._flush_interval = flush_interval
+        self._wake = threading.Event()
+        self._urgent = threading.Event()
+        self._stopping = False
+        self._atexit_registered = False
+        self._thread: Optional[threading.Thread] = None
+        self._directory: Optional[str] = None
+
+    def debug(self, msg: str, *args: Any) -> None:
+        self._push(DEBUG, msg, args)
+
+    def info(self, msg: str, *args: Any) -> None:
+        self._push(INFO, msg, args)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        self._push(WARNING, msg, args)
+
+    def error(self, msg: str, *args: Any) -> None:
+        self._push(ERROR, msg, args)
+
+    def exception(self, msg: str, *args: Any) -> None:
+        self._push(ERROR, "%s\n%s", (msg % args if args else msg, traceback.format_exc().rstrip()))
+
+    # Records are formatted by the writer, not here: strftime and %-formatting
+    # would add about 3 us to every call made from the keyboard hook.
+    def _push(self, level: int, msg: str, args: Tuple[Any, ...]) -> None:
+        record = (time.time(), level, msg, args)
+        self._ring.append(record)
+        if level < self._file_level:
+            return
+        pending = self._pending
+        if len(pending) == pending.maxlen:
+            self._dropped += 1
+        pending.append(record)
+        if level >= WARNING or len(pending) >= self._batch_size:
+            self._urgent.set()
+            self._wake.set()
+        elif len(pending) == 1:
+            self._wake.set()
+
+    def start(self, directory: str) -> None:
+        if self._thread is not None:
+            return
+        self._directory = directory
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="RingLogWriter", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            self._atexit_registered = True
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._urgent.set()
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def flush(self) -> None:
+        self._urgent.set()
+        self._wake.set()
+
+    def snapshot(self) -> List[str]:
+        return [_format(record) for record in list(self._ring)]
+
+    def dump(self) -> Optional[str]:
+        if self._directory is None:
+            return None
+        name = time.strftime("ring-%Y%m%d-%H%M%S.log")
+        path = os.path.join(self._directory, name)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(self.snapshot())
+        except OSError:
+            return None
+        return path
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._stopping:
+                self._urgent.wait(self._flush_interval)
+            self._urgent.clear()
+            wakeups.note("log_writer")
+            self._write_pending()
+            if self._stopping:
+                break
+
+    def _write_pending(self) -> None:
+        lines: List[str] = []
+        dropped = self._dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            lines.append(_format((time.time(), WARNING, "Dropped %d log records, the writer fell behind", (dropped,))))
+        while self._pending:
+            try:
+                lines.append(_format(self._pending.popleft()))
+            except IndexError:
+                break
+        if not lines or self._directory is None:
+            return
+        path = os.path.join(self._directory, LOG_FILENAME)
+        try:
+            self._rotate_if_needed(path)
+            with open(path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError:
+            pass
+
+    def _rotate_if_needed(self, path: str) -> None:
+        try:
+            if os.path.getsize(path) < self._max_bytes:
+                return
+        except OSError:
+            return
+        for index in range(self._backup_count - 1, 0, -1):
+            src = f"{path}.{index}"
+            if os.path.exists(src):
+                os.replace(src, f"{path}.{index + 1}")
+        if self._backup_count > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+
+
+log = RingLog()
@@ -0,0 +1,65 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.constants import STARTUP_TARGET_MS
+from core.log import log
+
+PHASE_HOOKS_LIVE = "hooks_live"
+PHASE_TRAY_VISIBLE = "tray_visible"
+PHASE_BACKGROUND_DONE = "background_done"
+
+
+class StartupScheduler:
+    def __init__(self, origin: Optional[float] = None, target_ms: float = STARTUP_TARGET_MS) -> None:
+        self._origin = origin if origin is not None else time.perf_counter()
+        self.target_ms = target_ms
+        self.phases: Dict[str, float] = {}
+        self._tasks: List[Tuple[int, int, str, Callable[[], None]]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def mark(self, phase: str) -> None:
+        elapsed = (time.perf_counter() - self._origin) * 1000.0
+        with self._lock:
+            if phase in self.phases:
+                return
+            self.phases[phase] = elapsed
+        if phase == PHASE_HOOKS_LIVE and not self.within_target():
+            log.warning("Hotkeys went live after %.0f ms, target is %.0f ms", elapsed, self.target_ms)
+
+    def submit(self, name: str, task: Callable[[], None], priority: int = 0) -> None:
+        with self._lock:
+            heapq.heappush(self._tasks, (priority, next(self._counter), name, task))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="StartupScheduler", daemon=True)
+        self._thread.start()
+
+    def within_target(self) -> bool:
+        hooks_live = self.phases.get(PHASE_HOOKS_LIVE)
+        return hooks_live is not None and hooks_live <= self.target_ms
+
+    def report(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(sorted(self.phases.items(), key=lambda item: item[1]))
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    break
+                _, _, name, task = heapq.heappop(self._tasks)
+            try:
+                task()
+            except Exception:
+                log.exception("Startup task %s failed", name)
+            finally:
+                self.mark(f"task:{name}")
+        self.mark(PHASE_BACKGROUND_DONE)
+        log.info("Startup phases (ms): %s", self.report())
@@ -0,0 +1,94 @@
+import threading
+from typing import Callable, Dict, NamedTuple, Tuple
+
+from core.constants import (
+    APPCOMMAND_MEDIA_FAST_FORWARD,
+    APPCOMMAND_MEDIA_NEXTTRACK,
+    APPCOMMAND_MEDIA_PLAY_PAUSE,
+    APPCOMMAND_MEDIA_PREVIOUSTRACK,
+    APPCOMMAND_MEDIA_REWIND,
+    APPCOMMAND_VOLUME_DOWN,
+    APPCOMMAND_VOLUME_MUTE,
+    APPCOMMAND_VOLUME_UP,
+    DEFAULT_LINKS,
+    STEP_COALESCE_WINDOW,
+)
+from core.log import log
+from core.tools.timers import TimerWheel, timers
+
+
+class MediaAction(NamedTuple):
+    name: str
+    command: int
+    step: bool = False
+    needs_player: bool = True
+
+
+MEDIA_ACTIONS: Tuple[MediaAction, ...] = (
+    MediaAction("next_track", APPCOMMAND_MEDIA_NEXTTRACK),
+    MediaAction("previous_track", APPCOMMAND_MEDIA_PREVIOUSTRACK),
+    MediaAction("play_pause", APPCOMMAND_MEDIA_PLAY_PAUSE),
+    MediaAction("volume_up", APPCOMMAND_VOLUME_UP, step=True),
+    MediaAction("volume_down", APPCOMMAND_VOLUME_DOWN, step=True),
+    MediaAction("mute", APPCOMMAND_VOLUME_MUTE),
+    MediaAction("seek_forward", APPCOMMAND_MEDIA_FAST_FORWARD, step=True),
+    MediaAction("seek_backward", APPCOMMAND_MEDIA_REWIND, step=True),
+)
+
+ACTIONS_BY_NAME: Dict[str, MediaAction] = {action.name: action for action in MEDIA_ACTIONS}
+
+LINK_ACTIONS: Tuple[str, ...] = tuple(DEFAULT_LINKS)
+
+
+class StepCoalescer:
+    def __init__(
+        self,
+        dispatch: Callable[[MediaAction, int], bool],
+        window: float = STEP_COALESCE_WINDOW,
+        wheel: TimerWheel = timers,
+    ) -> None:
+        self._dispatch = dispatch
+        self._window = window
+        self._wheel = wheel
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def push(self, action: MediaAction) -> None:
+        with self._lock:
+            if action.name in self._pending:
+                self._pending[action.name] += 1
+                return
+            self._pending[action.name] = 0
+        if self._send(action, 1):
+            self._schedule(action)
+        else:
+            self._drop(action)
+
+    def _schedule(self, action: MediaAction) -> None:
+        self._wheel.call_later(self._window, lambda: self._flush(action))
+
+    def _flush(self, action: MediaAction) -> None:
+        with self._lock:
+            count = self._pending.pop(action.name, 0)
+            if count:
+                self._pending[action.name] = 0
+        if not count:
+            return
+        if self._send(action, count):
+            self._schedule(action)
+        else:
+            self._drop(action)
+
+    def _send(self, action: MediaAction, count: int) -> bool:
+        try:
+            return self._dispatch(action, count)
+        except Exception:
+            log.exception("%s x%d failed", action.name, count)
+            return False
+
+    def _drop(self, action: MediaAction) -> None:
+        # Steps pressed while nothing answered are discarded rather than replayed later.
+        with self._lock:
+            dropped = self._pending.pop(action.name, 0)
+        if dropped:
+            log.info("Dropped %d coalesced %s step(s)", dropped, action.name)
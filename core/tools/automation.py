@@ -0,0 +1,242 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, NamedTuple, Optional, Protocol, Tuple, TypeVar
+
+from core.log import log
+from core.tools.controller import MediaController
+
+T = TypeVar("T")
+
+UIA_INVOKE_PATTERN_ID = 10000
+UIA_NAME_PROPERTY_ID = 30005
+UIA_AUTOMATION_ID_PROPERTY_ID = 30011
+TREE_SCOPE_DESCENDANTS = 4
+
+
+class ElementQuery(NamedTuple):
+    key: str
+    automation_ids: Tuple[str, ...] = ()
+    names: Tuple[str, ...] = ()
+
+
+class TrackInfo(NamedTuple):
+    title: str
+    artist: str
+
+
+LIKE_QUERY = ElementQuery("like", automation_ids=("player-like-button",), names=("Нравится", "Like"))
+DISLIKE_QUERY = ElementQuery(
+    "dislike", automation_ids=("player-dislike-button",), names=("Не нравится", "Dislike")
+)
+TRACK_TITLE_QUERY = ElementQuery("track_title", automation_ids=("player-track-title",))
+TRACK_ARTIST_QUERY = ElementQuery("track_artist", automation_ids=("player-track-artists",))
+DEFAULT_QUERIES: Tuple[ElementQuery, ...] = (LIKE_QUERY, DISLIKE_QUERY, TRACK_TITLE_QUERY, TRACK_ARTIST_QUERY)
+
+
+class StaleElementError(Exception):
+    pass
+
+
+class AutomationBackend(Protocol):
+    def initialize(self) -> None: ...
+
+    def root(self, hwnd: int) -> Any: ...
+
+    def find(self, root: Any, query: ElementQuery) -> Optional[Any]: ...
+
+    def invoke(self, element: Any) -> bool: ...
+
+    def read_name(self, element: Any) -> str: ...
+
+
+class ElementResolver:
+    def __init__(self, backend: AutomationBackend) -> None:
+        self._backend = backend
+        self._roots: Dict[int, Any] = {}
+        self._elements: Dict[Tuple[int, str], Any] = {}
+        self.lookups = 0
+
+    def element(self, hwnd: int, query: ElementQuery) -> Optional[Any]:
+        key = (hwnd, query.key)
+        element = self._elements.get(key)
+        if element is not None:
+            return element
+        root = self._roots.get(hwnd)
+        if root is None:
+            root = self._roots[hwnd] = self._backend.root(hwnd)
+        self.lookups += 1
+        element = self._backend.find(root, query)
+        if element is not None:
+            self._elements[key] = element
+        return element
+
+    def run(self, hwnd: int, query: ElementQuery, operation: Callable[[Any], T]) -> Optional[T]:
+        for attempt in range(2):
+            try:
+                element = self.element(hwnd, query)
+                if element is None:
+                    return None
+                return operation(element)
+            except StaleElementError:
+                self.invalidate(hwnd)
+                if attempt:
+                    raise
+        return None
+
+    def invalidate(self, hwnd: Optional[int] = None) -> None:
+        if hwnd is None:
+            self._roots.clear()
+            self._elements.clear()
+            return
+        self._roots.pop(hwnd, None)
+        for key in [key for key in self._elements if key[0] == hwnd]:
+            del self._elements[key]
+
+
+class UiaController:
+    def __init__(
+        self,
+        controller: MediaController,
+        backend: AutomationBackend,
+        queries: Tuple[ElementQuery, ...] = DEFAULT_QUERIES,
+    ) -> None:
+        self._controller = controller
+        self._backend = backend
+        self._queries = {query.key: query for query in queries}
+        self._resolver = ElementResolver(backend)
+        self._available = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="Automation",
+            initializer=self._initialize,
+        )
+        controller.router.add_window_listener(self.invalidate)
+
+    def like(self) -> "Future[bool]":
+        return self._executor.submit(self._invoke, LIKE_QUERY.key)
+
+    def dislike(self) -> "Future[bool]":
+        return self._executor.submit(self._invoke, DISLIKE_QUERY.key)
+
+    def track_info(self) -> "Future[Optional[TrackInfo]]":
+        return self._executor.submit(self._read_track_info)
+
+    def invalidate(self, hwnd: int) -> None:
+        self._executor.submit(self._resolver.invalidate, hwnd)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _initialize(self) -> None:
+        try:
+            self._backend.initialize()
+        except Exception:
+            self._available = False
+            log.exception("UI Automation is not available")
+
+    def _target(self, action: str) -> Optional[int]:
+        if not self._available:
+            return None
+        hwnd = self._controller.find_yandex_music_window(action)
+        if not hwnd:
+            log.info("No target window for %s", action)
+        return hwnd
+
+    def _invoke(self, key: str) -> bool:
+        hwnd = self._target(key)
+        if not hwnd:
+            return False
+        try:
+            invoked = self._resolver.run(hwnd, self._queries[key], self._backend.invoke)
+        except StaleElementError:
+            log.warning("Automation element for %s went stale", key)
+            return False
+        if invoked is None:
+            log.info("No automation element for %s", key)
+            return False
+        if not invoked:
+            log.info("Automation element for %s is not invokable", key)
+        return invoked
+
+    def _read_track_info(self) -> Optional[TrackInfo]:
+        hwnd = self._target("track_info")
+        if not hwnd:
+            return None
+        try:
+            title = self._resolver.run(hwnd, self._queries[TRACK_TITLE_QUERY.key], self._backend.read_name)
+            artist = self._resolver.run(hwnd, self._queries[TRACK_ARTIST_QUERY.key], self._backend.read_name)
+        except StaleElementError:
+            log.warning("Automation elements for track info went stale")
+            return None
+        if title is None:
+            return None
+        return TrackInfo(title, artist or "")
+
+
+class ComtypesAutomation:
+    def __init__(self) -> None:
+        self._uia: Any = None
+        self._module: Any = None
+        self._cache: Any = None
+        self._conditions: Dict[Tuple[str, int], Any] = {}
+        self._com_error: Any = None
+
+    def initialize(self) -> None:
+        import comtypes
+        import comtypes.client
+
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        comtypes.client.GetModule("UIAutomationCore.dll")
+        from comtypes.gen import UIAutomationClient
+
+        self._module = UIAutomationClient
+        self._com_error = comtypes.COMError
+        self._uia = comtypes.CoCreateInstance(
+            UIAutomationClient.CUIAutomation._reg_clsid_,
+            interface=UIAutomationClient.IUIAutomation,
+            clsctx=comtypes.CLSCTX_INPROC_SERVER,
+        )
+        cache = self._uia.CreateCacheRequest()
+        cache.AddProperty(UIA_NAME_PROPERTY_ID)
+        cache.AddProperty(UIA_AUTOMATION_ID_PROPERTY_ID)
+        cache.AddPattern(UIA_INVOKE_PATTERN_ID)
+        self._cache = cache
+
+    def root(self, hwnd: int) -> Any:
+        return self._call(self._uia.ElementFromHandleBuildCache, hwnd, self._cache)
+
+    def find(self, root: Any, query: ElementQuery) -> Optional[Any]:
+        searches = ((UIA_AUTOMATION_ID_PROPERTY_ID, query.automation_ids), (UIA_NAME_PROPERTY_ID, query.names))
+        for prop, values in searches:
+            if not values:
+                continue
+            condition = self._condition(query.key, prop, values)
+            element = self._call(root.FindFirstBuildCache, TREE_SCOPE_DESCENDANTS, condition, self._cache)
+            if element:
+                return element
+        return None
+
+    def invoke(self, element: Any) -> bool:
+        pattern = self._call(element.GetCachedPattern, UIA_INVOKE_PATTERN_ID)
+        if not pattern:
+            return False
+        self._call(pattern.QueryInterface(self._module.IUIAutomationInvokePattern).Invoke)
+        return True
+
+    def read_name(self, element: Any) -> str:
+        return str(self._call(lambda: element.CurrentName) or "")
+
+    def _condition(self, key: str, prop: int, values: Tuple[str, ...]) -> Any:
+        condition = self._conditions.get((key, prop))
+        if condition is None:
+            parts = [self._uia.CreatePropertyCondition(prop, value) for value in values]
+            condition = parts[0]
+            for part in parts[1:]:
+                condition = self._uia.CreateOrCondition(condition, part)
+            self._conditions[(key, prop)] = condition
+        return condition
+
+    def _call(self, function: Callable[..., T], *args: Any) -> T:
+        try:
+            return function(*args)
+        except self._com_error as exc:
+            raise StaleElementError(str(exc)) from exc
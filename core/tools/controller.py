@@ -1,51 +1,97 @@
 import ctypes
 from ctypes import wintypes
-from typing import Optional, List
+from typing import Callable, Optional, Protocol
 
-from core.constants import (
-    WM_APPCOMMAND,
-    APPCOMMAND_MEDIA_NEXTTRACK,
-    APPCOMMAND_MEDIA_PREVIOUSTRACK,
-    APPCOMMAND_MEDIA_PLAY_PAUSE,
-    TARGET_WINDOW_TITLES
-)
+from core.constants import SEND_MESSAGE_TIMEOUT_MS, WM_APPCOMMAND
+from core.tools.actions import ACTIONS_BY_NAME, MediaAction
+from core.tools.routing import TargetRouter
+from core.log import log
+
+SMTO_ABORTIFHUNG = 0x0002
+
+
+class PlayerBackend(Protocol):
+    @property
+    def has_player(self) -> bool: ...
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None: ...
+
+    def perform(self, action: MediaAction, count: int = 1) -> bool: ...
 
 
 class MediaController:
-    def __init__(self) -> None:
-        self.user32 = ctypes.windll.user32
-        self.enum_results: List[int] = []
-
-    def enum_callback(self, hwnd: int, _lparam: int) -> int:
-        length = self.user32.GetWindowTextLengthW(hwnd) + 1
-        buf = ctypes.create_unicode_buffer(length)
-        self.user32.GetWindowTextW(hwnd, buf, length)
-        title = buf.value or ""
-
-        if any(target in title for target in TARGET_WINDOW_TITLES):
-            self.enum_results.append(hwnd)
-        return 1
-
-    def find_yandex_music_window(self) -> Optional[int]:
-        self.enum_results = []
-        WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
-        self.user32.EnumWindows(WNDENUMPROC(self.enum_callback), 0)
-        return self.enum_results[0] if self.enum_results else None
+    def __init__(self, router: TargetRouter) -> None:
+        self.router = router
+        self.user32 = ctypes.WinDLL("user32")
+        self._declare_prototypes()
+
+    def _declare_prototypes(self) -> None:
+        self.user32.IsWindow.argtypes = [wintypes.HWND]
+        self.user32.IsWindow.restype = wintypes.BOOL
+        self.user32.SendMessageTimeoutW.argtypes = [
+            wintypes.HWND,
+            wintypes.UINT,
+            wintypes.WPARAM,
+            wintypes.LPARAM,
+            wintypes.UINT,
+            wintypes.UINT,
+            ctypes.POINTER(ctypes.c_size_t),
+        ]
+        self.user32.SendMessageTimeoutW.restype = wintypes.LPARAM
+
+    @property
+    def has_player(self) -> bool:
+        return self.router.has_target
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        self.router.add_listener(callback)
+
+    def find_yandex_music_window(self, action: str = "play_pause") -> Optional[int]:
+        hwnd = self.router.resolve(action)
+        if hwnd and not self.user32.IsWindow(hwnd):
+            self.router.window_destroyed(hwnd)
+            hwnd = self.router.resolve(action)
+        return hwnd
 
     def send_command(self, hwnd: int, cmd: int) -> bool:
         if not hwnd or not self.user32.IsWindow(hwnd):
             return False
-        return self.user32.SendMessageW(hwnd, WM_APPCOMMAND, hwnd, cmd << 16) != 0
+        result = ctypes.c_size_t(0)
+        ok = self.user32.SendMessageTimeoutW(
+            hwnd,
+            WM_APPCOMMAND,
+            hwnd,
+            cmd << 16,
+            SMTO_ABORTIFHUNG,
+            SEND_MESSAGE_TIMEOUT_MS,
+            ctypes.byref(result),
+        )
+        if not ok:
+            log.warning("Target window %s did not answer command %d", hwnd, cmd)
+            return False
+        return result.value != 0
 
-    def send_media_key(self, cmd: int) -> bool:
-        hwnd = self.find_yandex_music_window()
-        return self.send_command(hwnd, cmd) if hwnd else False
+    def perform(self, action: MediaAction, count: int = 1) -> bool:
+        hwnd = self.find_yandex_music_window(action.name)
+        if not hwnd:
+            log.info("No target window for %s", action.name)
+            return False
+        sent = False
+        for _ in range(max(count, 1)):
+            sent = self.send_command(hwnd, action.command) or sent
+        if action.name == "play_pause":
+            self.router.toggle_playing(hwnd)
+        elif action.name in ("next_track", "previous_track"):
+            self.router.note_used(hwnd, playing=True)
+        else:
+            self.router.note_used(hwnd)
+        return sent
 
     def next_track(self) -> bool:
-        return self.send_media_key(APPCOMMAND_MEDIA_NEXTTRACK)
+        return self.perform(ACTIONS_BY_NAME["next_track"])
 
     def previous_track(self) -> bool:
-        return self.send_media_key(APPCOMMAND_MEDIA_PREVIOUSTRACK)
+        return self.perform(ACTIONS_BY_NAME["previous_track"])
 
     def play_pause(self) -> bool:
-        return self.send_media_key(APPCOMMAND_MEDIA_PLAY_PAUSE)
+        return self.perform(ACTIONS_BY_NAME["play_pause"])
@@ -0,0 +1,73 @@
+import ctypes
+import os
+from ctypes import wintypes
+from typing import Callable, List, Optional
+
+from core.tools.winevents import WinEventLoop
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_MAX_PATH = 1024
+
+
+class ForegroundTracker:
+    def __init__(self, events: WinEventLoop) -> None:
+        self.user32 = ctypes.WinDLL("user32")
+        self.kernel32 = ctypes.WinDLL("kernel32")
+        self.current_app: Optional[str] = None
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        self._path_buf = ctypes.create_unicode_buffer(_MAX_PATH)
+        self._declare_prototypes()
+        events.subscribe(EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, self._on_foreground)
+
+    def _declare_prototypes(self) -> None:
+        self.user32.GetForegroundWindow.argtypes = []
+        self.user32.GetForegroundWindow.restype = wintypes.HWND
+        self.user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+        self.user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+        self.kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self.kernel32.OpenProcess.restype = wintypes.HANDLE
+        self.kernel32.QueryFullProcessImageNameW.argtypes = [
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.LPWSTR,
+            ctypes.POINTER(wintypes.DWORD),
+        ]
+        self.kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+        self.kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self.kernel32.CloseHandle.restype = wintypes.BOOL
+
+    def add_listener(self, callback: Callable[[Optional[str]], None]) -> None:
+        self._listeners.append(callback)
+        callback(self.current_app)
+
+    def refresh(self) -> None:
+        self._set_current(self._resolve_app(self.user32.GetForegroundWindow() or 0))
+
+    def _on_foreground(self, _event: int, hwnd: int, _id_object: int, _id_child: int) -> None:
+        self._set_current(self._resolve_app(hwnd))
+
+    def _set_current(self, app: Optional[str]) -> None:
+        if app == self.current_app:
+            return
+        self.current_app = app
+        for callback in self._listeners:
+            callback(app)
+
+    def _resolve_app(self, hwnd: int) -> Optional[str]:
+        if not hwnd:
+            return None
+        pid = wintypes.DWORD(0)
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        if not pid.value:
+            return None
+        handle = self.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not handle:
+            return None
+        try:
+            size = wintypes.DWORD(_MAX_PATH)
+            if not self.kernel32.QueryFullProcessImageNameW(handle, 0, self._path_buf, ctypes.byref(size)):
+                return None
+            return os.path.basename(self._path_buf.value).lower() or None
+        finally:
+            self.kernel32.CloseHandle(handle)
@@ -0,0 +1,143 @@
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+from core.constants import (
+    GESTURE_DOUBLE_TAP_WINDOW,
+    GESTURE_HOLD_REPEAT,
+    GESTURE_HOLD_THRESHOLD,
+)
+from core.tools.timers import TimerWheel
+
+Action = Callable[[], None]
+
+
+class GestureBinding(NamedTuple):
+    tap: Optional[Action] = None
+    double_tap: Optional[Action] = None
+    hold: Optional[Action] = None
+
+
+class _PressState:
+    __slots__ = ("down", "taps", "held", "hold_timer", "tap_timer")
+
+    def __init__(self) -> None:
+        self.down = False
+        self.taps = 0
+        self.held = False
+        self.hold_timer = 0
+        self.tap_timer = 0
+
+
+class GestureRecognizer:
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        double_tap_window: float = GESTURE_DOUBLE_TAP_WINDOW,
+        hold_threshold: float = GESTURE_HOLD_THRESHOLD,
+        hold_repeat: float = GESTURE_HOLD_REPEAT,
+    ) -> None:
+        self._wheel = wheel
+        self._double_tap_window = double_tap_window
+        self._hold_threshold = hold_threshold
+        self._hold_repeat = hold_repeat
+        self._states: Dict[str, _PressState] = {}
+        self._lock = threading.Lock()
+
+    def key_down(self, combo: str, binding: GestureBinding) -> None:
+        with self._lock:
+            self._press(combo, binding)
+
+    def trigger(self, combo: str, binding: GestureBinding) -> "GestureTrigger":
+        return GestureTrigger(self, combo, binding)
+
+    def _press(self, combo: str, binding: GestureBinding) -> None:
+        state = self._states.get(combo)
+        if state is None:
+            state = self._states[combo] = _PressState()
+        if state.down:
+            return
+        state.down = True
+        state.held = False
+        if state.tap_timer:
+            self._wheel.cancel(state.tap_timer)
+            state.tap_timer = 0
+            state.taps = 2
+        else:
+            state.taps = 1
+        if binding.hold is not None:
+            state.hold_timer = self._wheel.call_later(
+                self._hold_threshold, lambda: self._on_hold(combo, binding)
+            )
+
+    def key_up(self, combo: str, binding: GestureBinding) -> None:
+        with self._lock:
+            action = self._release(combo, binding)
+        self._fire(action)
+
+    def _release(self, combo: str, binding: GestureBinding) -> Optional[Action]:
+        state = self._states.get(combo)
+        if state is None or not state.down:
+            return None
+        state.down = False
+        self._wheel.cancel(state.hold_timer)
+        state.hold_timer = 0
+        if state.held:
+            state.taps = 0
+            return None
+        if state.taps >= 2:
+            state.taps = 0
+            return binding.double_tap or binding.tap
+        if binding.double_tap is not None:
+            state.tap_timer = self._wheel.call_later(
+                self._double_tap_window, lambda: self._on_tap_timeout(combo, binding)
+            )
+            return None
+        state.taps = 0
+        return binding.tap
+
+    def reset(self) -> None:
+        with self._lock:
+            for state in self._states.values():
+                self._wheel.cancel(state.hold_timer)
+                self._wheel.cancel(state.tap_timer)
+            self._states.clear()
+
+    def _on_hold(self, combo: str, binding: GestureBinding) -> None:
+        with self._lock:
+            state = self._states.get(combo)
+            if state is None or not state.down:
+                return
+            state.held = True
+            state.hold_timer = self._wheel.call_later(
+                self._hold_repeat, lambda: self._on_hold(combo, binding)
+            )
+        self._fire(binding.hold)
+
+    def _on_tap_timeout(self, combo: str, binding: GestureBinding) -> None:
+        with self._lock:
+            state = self._states.get(combo)
+            if state is None or state.down or not state.tap_timer:
+                return
+            state.tap_timer = 0
+            state.taps = 0
+        self._fire(binding.tap)
+
+    @staticmethod
+    def _fire(action: Optional[Action]) -> None:
+        if action is not None:
+            action()
+
+
+class GestureTrigger:
+    __slots__ = ("_recognizer", "_combo", "_binding")
+
+    def __init__(self, recognizer: GestureRecognizer, combo: str, binding: GestureBinding) -> None:
+        self._recognizer = recognizer
+        self._combo = combo
+        self._binding = binding
+
+    def __call__(self) -> None:
+        self._recognizer.key_down(self._combo, self._binding)
+
+    def release(self) -> None:
+        self._recognizer.key_up(self._combo, self._binding)
@@ -0,0 +1,97 @@
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from core.constants import LAUNCH_THROTTLE_SECONDS, YANDEX_MUSIC_PROTOCOL
+from core.log import log
+
+if sys.platform == "win32":
+    import winreg
+
+_URL_PLACEHOLDERS = ("%1", "%l", "%L")
+
+
+def _split_command(command: str) -> Optional[List[str]]:
+    parts = [part.strip('"') for part in shlex.split(command, posix=False)]
+    parts = [part for part in parts if part]
+    if not parts:
+        return None
+    if not any(placeholder in part for part in parts for placeholder in _URL_PLACEHOLDERS):
+        parts.append("%1")
+    return parts
+
+
+def _expand(command: List[str], url: str) -> List[str]:
+    args = []
+    for part in command:
+        for placeholder in _URL_PLACEHOLDERS:
+            part = part.replace(placeholder, url)
+        args.append(part)
+    return args
+
+
+class ProtocolLauncher:
+    def __init__(
+        self,
+        protocol: str = YANDEX_MUSIC_PROTOCOL,
+        throttle: float = LAUNCH_THROTTLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._scheme = protocol.split(":", 1)[0]
+        self._throttle = throttle
+        self._clock = clock
+        self._command: Optional[List[str]] = None
+        self._resolved = False
+        self._last_launch: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Optional[List[str]]:
+        with self._lock:
+            if not self._resolved:
+                self._command = self._find_handler()
+                self._resolved = True
+                if self._command:
+                    log.info("%s:// is handled by %s", self._scheme, self._command[0])
+                else:
+                    log.warning("No handler registered for %s://", self._scheme)
+            return self._command
+
+    def warm(self) -> None:
+        self.resolve()
+
+    def _find_handler(self) -> Optional[List[str]]:
+        if sys.platform == "win32":
+            try:
+                with winreg.OpenKey(winreg.HKEY_CLASSES_ROOT, rf"{self._scheme}\shell\open\command") as key:
+                    command, _ = winreg.QueryValueEx(key, "")
+            except OSError:
+                return None
+            return _split_command(os.path.expandvars(str(command)))
+        opener = shutil.which("xdg-open")
+        return [opener, "%1"] if opener else None
+
+    def launch(self, url: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            last = self._last_launch.get(url)
+            if last is not None and now - last < self._throttle:
+                log.info("Skipping repeated launch of %s", url)
+                return False
+            self._last_launch[url] = now
+        command = self.resolve()
+        try:
+            if command is not None:
+                subprocess.Popen(_expand(command, url), close_fds=True)
+            elif sys.platform == "win32":
+                os.startfile(url)
+            else:
+                return False
+        except OSError:
+            log.exception("Failed to open %s", url)
+            return False
+        return True
@@ -1,67 +1,384 @@
+import ctypes
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
 import keyboard
-from typing import Dict, Callable, Set, Optional, Tuple
+from typing import Any, Dict, Callable, List, Set, Optional, Tuple, TYPE_CHECKING
 
-from core.tools.controller import MediaController
+from core.tools.actions import LINK_ACTIONS, MEDIA_ACTIONS, MediaAction, StepCoalescer
+from core.tools.automation import UiaController
+from core.tools.controller import PlayerBackend
+from core.tools.gestures import GestureBinding, GestureRecognizer, GestureTrigger
+from core.tools.launcher import ProtocolLauncher
+from core.tools.plugins import PluginAction, PluginRegistry
+from core.tools.timers import TimerWheel, timers
 from core.config import Config
+from core.constants import (
+    DEFAULT_LINKS,
+    GESTURE_KINDS,
+    HOOK_SLOW_CALLBACK_SECONDS,
+    HOOK_THREAD_STOP_TIMEOUT,
+    WATCHDOG_PROBE_VK,
+)
+from core.log import log
+from core.tools.wakeups import wakeups
+
+if TYPE_CHECKING:
+    from core.tools.foreground import ForegroundTracker
 
 _MODIFIERS: Tuple[str, ...] = ("ctrl", "shift", "alt", "win")
+_MODIFIER_VKEYS: Dict[str, Tuple[int, ...]] = {
+    "ctrl": (0x11,),
+    "shift": (0x10,),
+    "alt": (0x12,),
+    "win": (0x5B, 0x5C),
+}
+
+# keyboard reports ``scan_code or -vk``; the probe is injected without a scan code.
+_PROBE_SCAN_CODE = -WATCHDOG_PROBE_VK
+
+WM_NULL = 0x0000
+WM_QUIT = 0x0012
+
+_get_async_key_state: Optional[Callable[[int], int]] = None
+_post_thread_message: Optional[Callable[[int, int, int, int], int]] = None
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32")
+    _user32.GetAsyncKeyState.argtypes = [ctypes.c_int]
+    _user32.GetAsyncKeyState.restype = ctypes.c_short
+    _user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    _user32.PostThreadMessageW.restype = wintypes.BOOL
+    _get_async_key_state = _user32.GetAsyncKeyState
+    _post_thread_message = _user32.PostThreadMessageW
+
+
+def _automation_result(name: str, future: "Future[Any]") -> Any:
+    if future.cancelled():
+        return None
+    error = future.exception()
+    if error is not None:
+        log.error("Automation %s failed: %r", name, error)
+        return None
+    return future.result()
+
+
+def normalize_key_name(name: Optional[str]) -> str:
+    key = (name or "").strip().lower()
+    if "ctrl" in key:
+        return "ctrl"
+    if "alt" in key:
+        return "alt"
+    if "shift" in key:
+        return "shift"
+    if "win" in key or "cmd" in key:
+        return "win"
+    return key
+
+
+def _is_modifier_down(mod: str) -> bool:
+    if _get_async_key_state is None:
+        return True
+    return any(_get_async_key_state(vk) & 0x8000 for vk in _MODIFIER_VKEYS[mod])
+
+
+def _post_quit(thread_id: int) -> bool:
+    if _post_thread_message is None:
+        return False
+    # Depending on its version, keyboard's message loop ends on WM_QUIT or on the first real message.
+    _post_thread_message(thread_id, WM_QUIT, 0, 0)
+    return bool(_post_thread_message(thread_id, WM_NULL, 0, 0))
+
+
+def restart_os_hook() -> bool:
+    os_listener = getattr(keyboard, "_listener", None)
+    thread = getattr(os_listener, "listening_thread", None)
+    if os_listener is None or thread is None:
+        return False
+    if thread.is_alive():
+        if not _post_quit(thread.native_id):
+            return False
+        thread.join(HOOK_THREAD_STOP_TIMEOUT)
+        if thread.is_alive():
+            log.warning("Keyboard hook thread did not stop, keeping it")
+            return False
+    thread = threading.Thread(target=os_listener.listen, name="KeyboardHook", daemon=True)
+    os_listener.listening_thread = thread
+    thread.start()
+    return True
 
 
 class HotkeyListener:
-    def __init__(self, controller: MediaController, config: Config) -> None:
+    def __init__(
+        self,
+        controller: PlayerBackend,
+        config: Config,
+        foreground: Optional["ForegroundTracker"] = None,
+        launcher: Optional[ProtocolLauncher] = None,
+        plugins: Optional[PluginRegistry] = None,
+        automation: Optional[UiaController] = None,
+        wheel: TimerWheel = timers,
+    ) -> None:
         self.controller = controller
         self.config = config
+        self.launcher = launcher
+        self.plugins = plugins
+        self.automation = automation
+        self._links: Dict[str, str] = dict(DEFAULT_LINKS)
         self._hotkeys: Dict[str, Callable[[], None]] = {}
+        self._profiles: Dict[str, Dict[str, Callable[[], None]]] = {}
+        self._active_hotkeys: Dict[str, Callable[[], None]] = self._hotkeys
+        self._foreground_app: Optional[str] = None
         self._pressed_keys: Set[str] = set()
         self._hook_handle: Optional[object] = None
+        self._capture_callback: Optional[Callable[[str], None]] = None
+        self._suspended = False
+        self._probe_pending = False
+        self._wheel = wheel
+        self._gestures = GestureRecognizer(wheel)
+        self._gesture_triggers: List[GestureTrigger] = []
+        self._held_gestures: Dict[str, GestureTrigger] = {}
+        self.last_event_time = 0.0
+        self.max_callback_seconds = 0.0
+        self.slow_callbacks = 0
+        self._coalescer = StepCoalescer(self.controller.perform, wheel=wheel)
+        self._player_free: Set[Callable[[], None]] = set()
+        self._action_map = self._build_action_map()
+        if foreground is not None:
+            foreground.add_listener(self._on_foreground_changed)
+
+    def _build_action_map(self) -> Dict[str, Callable[[], None]]:
+        action_map = {action.name: self._make_callback(action) for action in MEDIA_ACTIONS}
+        if self.launcher is not None:
+            for name in LINK_ACTIONS:
+                action_map[name] = self._make_link_callback(name)
+        if self.automation is not None:
+            action_map["like"] = self._make_automation_callback("like", self.automation.like)
+            action_map["dislike"] = self._make_automation_callback("dislike", self.automation.dislike)
+        if self.plugins is not None:
+            for plugin_action in self.plugins.actions():
+                action_map[plugin_action.name] = self._make_plugin_callback(plugin_action)
+        return action_map
+
+    def add_plugin_actions(self) -> None:
+        if self.plugins is None:
+            return
+        action_map = dict(self._action_map)
+        for plugin_action in self.plugins.actions():
+            if plugin_action.name not in action_map:
+                action_map[plugin_action.name] = self._make_plugin_callback(plugin_action)
+        self._action_map = action_map
+        self.reload()
+
+    def plugin_actions(self) -> List[Tuple[str, str]]:
+        if self.plugins is None:
+            return []
+        return [(action.name, action.title) for action in self.plugins.actions()]
+
+    def load_plugin(self, name: str) -> bool:
+        return self.plugins is not None and self.plugins.load(name) is not None
+
+    def _make_callback(self, action: MediaAction) -> Callable[[], None]:
+        def run() -> None:
+            if action.step:
+                self._coalescer.push(action)
+            else:
+                self.controller.perform(action)
+
+        def callback() -> None:
+            self._wheel.call_later(0.0, run)
 
-    def on_next(self) -> None:
-        self.controller.next_track()
+        if not action.needs_player:
+            self._player_free.add(callback)
+        return callback
 
-    def on_previous(self) -> None:
-        self.controller.previous_track()
+    def _make_link_callback(self, name: str) -> Callable[[], None]:
+        def callback() -> None:
+            self._wheel.call_later(0.0, lambda: self._open_link(name))
 
-    def on_play_pause(self) -> None:
-        self.controller.play_pause()
+        self._player_free.add(callback)
+        return callback
+
+    def _open_link(self, name: str) -> None:
+        url = self._links.get(name)
+        if not url or self.launcher is None:
+            log.info("No link configured for %s", name)
+            return
+        self.launcher.launch(url)
+
+    def _make_automation_callback(self, name: str, request: Callable[[], "Future[bool]"]) -> Callable[[], None]:
+        def callback() -> None:
+            request().add_done_callback(lambda future: self._on_automation_done(name, future))
+
+        return callback
+
+    def _on_automation_done(self, name: str, future: "Future[bool]") -> None:
+        if not _automation_result(name, future) or self.automation is None:
+            return
+        self.automation.track_info().add_done_callback(lambda info: self._log_track(name, info))
+
+    @staticmethod
+    def _log_track(name: str, future: "Future[Any]") -> None:
+        info = _automation_result("track_info", future)
+        if info is not None:
+            log.info("%s: %s - %s", name, info.title, info.artist)
+
+    def _make_plugin_callback(self, action: PluginAction) -> Callable[[], None]:
+        def run() -> None:
+            if self.plugins is not None:
+                self.plugins.run(action.name, self.controller)
+
+        def callback() -> None:
+            self._wheel.call_later(0.0, run)
+
+        if not action.needs_player:
+            self._player_free.add(callback)
+        return callback
 
     def _build_hotkey_map(self) -> None:
-        self._hotkeys.clear()
-        hotkeys_config = self.config.get_hotkeys()
-        action_map: Dict[str, Callable[[], None]] = {
-            "next_track": self.on_next,
-            "previous_track": self.on_previous,
-            "play_pause": self.on_play_pause,
-        }
+        data = self.config.load_config()
+        self._links = data.get("links", dict(DEFAULT_LINKS))
+        hotkeys_config = dict(data.get("plugin_hotkeys", {}))
+        hotkeys_config.update(data.get("hotkeys", {}))
+        gestures = data.get("gestures", {})
+        self._player_free.difference_update(self._gesture_triggers)
+        self._gesture_triggers = []
+        self._hotkeys = self._compile_bindings(hotkeys_config, gestures)
+        self._profiles = {}
+        for app, profile in data.get("profiles", {}).items():
+            if profile.get("disabled"):
+                self._profiles[app] = {}
+                continue
+            overrides = profile.get("hotkeys", {})
+            profile_config = dict(hotkeys_config)
+            profile_config.update(overrides)
+            disabled = {action for action, combo in overrides.items() if not combo}
+            profile_gestures = {
+                combo: {kind: action for kind, action in kinds.items() if action not in disabled}
+                for combo, kinds in gestures.items()
+            }
+            self._profiles[app] = self._compile_bindings(profile_config, profile_gestures)
+        self._on_foreground_changed(self._foreground_app)
+
+    def _compile_bindings(
+        self,
+        hotkeys_config: Dict[str, str],
+        gestures: Dict[str, Dict[str, str]],
+    ) -> Dict[str, Callable[[], None]]:
+        bindings: Dict[str, Callable[[], None]] = {}
         for action, combo in hotkeys_config.items():
-            if combo and action in action_map:
-                self._hotkeys[combo.lower()] = action_map[action]
+            if combo and action in self._action_map:
+                bindings[combo.lower()] = self._action_map[action]
+        for combo, kinds in gestures.items():
+            binding = GestureBinding(*(self._action_map.get(kinds.get(kind, "")) for kind in GESTURE_KINDS))
+            if not any(binding):
+                continue
+            trigger = self._gestures.trigger(combo, binding)
+            if all(action is None or action in self._player_free for action in binding):
+                self._player_free.add(trigger)
+            self._gesture_triggers.append(trigger)
+            bindings[combo] = trigger
+        return bindings
+
+    def _on_foreground_changed(self, app: Optional[str]) -> None:
+        self._foreground_app = app
+        self._active_hotkeys = self._profiles.get(app, self._hotkeys) if app else self._hotkeys
+
+    @property
+    def is_hooked(self) -> bool:
+        return self._hook_handle is not None
 
     def _on_key_event(self, event: keyboard.KeyboardEvent) -> bool:
-        key_name = (event.name or "").strip().lower()
+        started = time.perf_counter()
+        self.last_event_time = started
+        try:
+            return self._handle_key_event(event)
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed > self.max_callback_seconds:
+                self.max_callback_seconds = elapsed
+            if elapsed > HOOK_SLOW_CALLBACK_SECONDS:
+                self.slow_callbacks += 1
+
+    def _handle_key_event(self, event: keyboard.KeyboardEvent) -> bool:
+        wakeups.note("keyboard")
+        if self._probe_pending and event.scan_code == _PROBE_SCAN_CODE:
+            return False
+        if self._suspended:
+            return True
+        key_name = normalize_key_name(event.name)
         if not key_name:
             return True
 
         if event.event_type == keyboard.KEY_UP:
             self._pressed_keys.discard(key_name)
+            if self._held_gestures:
+                trigger = self._held_gestures.pop(key_name, None)
+                if trigger is not None:
+                    trigger.release()
             return True
 
-        self._pressed_keys.add(key_name)
         if key_name in _MODIFIERS:
+            self._pressed_keys.add(key_name)
             return True
 
         mods = [m for m in _MODIFIERS if m in self._pressed_keys]
+        if mods:
+            mods = self._drop_stale_modifiers(mods)
         current_combo = "+".join(mods + [key_name])
-        callback = self._hotkeys.get(current_combo)
+        capture = self._capture_callback
+        if capture is not None:
+            self._capture_callback = None
+            capture(current_combo)
+            return False
+        callback = self._active_hotkeys.get(current_combo)
         if callback:
-            callback()
+            if not self.controller.has_player and callback not in self._player_free:
+                return True
+            log.info("Hotkey %s", current_combo)
+            if isinstance(callback, GestureTrigger):
+                self._held_gestures[key_name] = callback
+            try:
+                callback()
+            except Exception:
+                log.exception("Hotkey %s failed", current_combo)
             return False
         return True
 
+    def _drop_stale_modifiers(self, mods: List[str]) -> List[str]:
+        live = [m for m in mods if _is_modifier_down(m)]
+        if len(live) != len(mods):
+            self._pressed_keys.intersection_update(live)
+        return live
+
     def apply_hotkeys(self) -> None:
         self.stop()
         self._build_hotkey_map()
-        if self._hotkeys:
-            self._hook_handle = keyboard.hook(self._on_key_event)
+        if self._suspended:
+            return
+        if self._hotkeys or any(self._profiles.values()) or self._capture_callback is not None:
+            self._hook_handle = keyboard.hook(self._on_key_event, suppress=True)
+
+    def reinstall_hook(self) -> bool:
+        if self._suspended:
+            return False
+        restarted = restart_os_hook()
+        self.apply_hotkeys()
+        return restarted
+
+    def expect_probe(self, pending: bool) -> None:
+        self._probe_pending = pending
+
+    def start_capture(self, callback: Callable[[str], None]) -> None:
+        self._capture_callback = callback
+        if self._hook_handle is None and not self._suspended:
+            self._hook_handle = keyboard.hook(self._on_key_event, suppress=True)
+
+    def cancel_capture(self) -> None:
+        self._capture_callback = None
 
     def start(self) -> None:
         self.apply_hotkeys()
@@ -71,9 +388,20 @@ class HotkeyListener:
             try:
                 keyboard.unhook(self._hook_handle)
             except Exception:
-                pass
+                log.exception("Failed to remove keyboard hook")
             self._hook_handle = None
         self._pressed_keys.clear()
+        self._held_gestures.clear()
+        self._gestures.reset()
 
     def reload(self) -> None:
         self.apply_hotkeys()
+
+    def set_session_active(self, active: bool) -> None:
+        if active == (not self._suspended):
+            return
+        self._suspended = not active
+        if active:
+            self.reinstall_hook()
+        else:
+            self.stop()
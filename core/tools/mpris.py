@@ -0,0 +1,157 @@
+import threading
+from queue import Queue
+from typing import Callable, List, Optional, Sequence
+
+from jeepney import DBusAddress, DBusErrorResponse, MatchRule, Message, Properties, message_bus, new_method_call
+from jeepney.io.common import RouterClosed
+from jeepney.io.threading import DBusRouter, Proxy, open_dbus_connection
+from jeepney.wrappers import unwrap_msg
+
+from core.constants import (
+    MPRIS_BUS_PREFIX,
+    MPRIS_CALL_TIMEOUT,
+    MPRIS_PLAYER_HINTS,
+    MPRIS_SEEK_STEP_US,
+    MPRIS_VOLUME_STEP,
+)
+from core.log import log
+from core.tools.actions import MediaAction
+
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+MPRIS_PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+
+_METHODS = {
+    "next_track": "Next",
+    "previous_track": "Previous",
+    "play_pause": "PlayPause",
+}
+_SEEK_DIRECTIONS = {"seek_forward": 1, "seek_backward": -1}
+_VOLUME_DIRECTIONS = {"volume_up": 1, "volume_down": -1}
+
+
+class MprisController:
+    def __init__(
+        self,
+        hints: Sequence[str] = MPRIS_PLAYER_HINTS,
+        bus: str = "SESSION",
+        timeout: float = MPRIS_CALL_TIMEOUT,
+    ) -> None:
+        self._hints = tuple(hint.lower() for hint in hints)
+        self._bus = bus
+        self._timeout = timeout
+        self._router: Optional[DBusRouter] = None
+        self._signals: Optional[Queue] = None
+        self._players: List[str] = []
+        self._listeners: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def has_player(self) -> bool:
+        return bool(self._players)
+
+    @property
+    def player_name(self) -> Optional[str]:
+        players = self._players
+        return players[0] if players else None
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        self._listeners.append(callback)
+
+    def start(self) -> None:
+        if self._router is not None:
+            return
+        router = DBusRouter(open_dbus_connection(bus=self._bus))
+        bus = Proxy(message_bus, router, timeout=self._timeout)
+        rule = MatchRule(
+            type="signal",
+            sender=message_bus.bus_name,
+            interface=message_bus.interface,
+            member="NameOwnerChanged",
+            path=message_bus.object_path,
+        )
+        rule.add_arg_condition(0, MPRIS_BUS_PREFIX.rstrip("."), kind="namespace")
+        self._signals = Queue()
+        router.filter(rule, queue=self._signals)
+        bus.AddMatch(rule)
+        self._router = router
+        names = bus.ListNames()[0]
+        with self._lock:
+            self._players = [name for name in names if self._is_player(name)]
+        threading.Thread(target=self._watch_names, name="MprisWatch", daemon=True).start()
+        self._notify()
+
+    def stop(self) -> None:
+        router = self._router
+        if router is None:
+            return
+        self._router = None
+        if self._signals is not None:
+            self._signals.put(None)
+        router.close()
+        router.conn.close()
+
+    def _is_player(self, name: str) -> bool:
+        if not name.startswith(MPRIS_BUS_PREFIX):
+            return False
+        suffix = name[len(MPRIS_BUS_PREFIX):].lower()
+        return any(hint in suffix for hint in self._hints)
+
+    def _watch_names(self) -> None:
+        signals = self._signals
+        while signals is not None:
+            message: Optional[Message] = signals.get()
+            if message is None:
+                return
+            name, _old_owner, new_owner = message.body
+            if self._is_player(name):
+                self._player_changed(name, bool(new_owner))
+
+    def _player_changed(self, name: str, present: bool) -> None:
+        with self._lock:
+            had_player = bool(self._players)
+            players = [player for player in self._players if player != name]
+            if present:
+                players.insert(0, name)
+            self._players = players
+        log.info("MPRIS player %s %s", name, "appeared" if present else "vanished")
+        if had_player != bool(players):
+            self._notify()
+
+    def _notify(self) -> None:
+        present = self.has_player
+        for callback in list(self._listeners):
+            try:
+                callback(present)
+            except Exception:
+                log.exception("Player listener failed")
+
+    def perform(self, action: MediaAction, count: int = 1) -> bool:
+        router = self._router
+        name = self.player_name
+        if router is None or name is None:
+            log.info("No MPRIS player for %s", action.name)
+            return False
+        address = DBusAddress(MPRIS_PATH, bus_name=name, interface=MPRIS_PLAYER_INTERFACE)
+        count = max(count, 1)
+        try:
+            if action.name in _METHODS:
+                for _ in range(count):
+                    self._call(router, new_method_call(address, _METHODS[action.name]))
+            elif action.name in _SEEK_DIRECTIONS:
+                offset = _SEEK_DIRECTIONS[action.name] * MPRIS_SEEK_STEP_US * count
+                self._call(router, new_method_call(address, "Seek", "x", (offset,)))
+            elif action.name in _VOLUME_DIRECTIONS:
+                properties = Properties(address)
+                _signature, volume = self._call(router, properties.get("Volume"))[0]
+                volume += _VOLUME_DIRECTIONS[action.name] * MPRIS_VOLUME_STEP * count
+                self._call(router, properties.set("Volume", "d", min(max(volume, 0.0), 1.0)))
+            else:
+                log.info("MPRIS has no equivalent for %s", action.name)
+                return False
+        except (DBusErrorResponse, RouterClosed, TimeoutError, OSError) as exc:
+            log.warning("MPRIS player %s did not answer %s: %s", name, action.name, exc)
+            return False
+        return True
+
+    def _call(self, router: DBusRouter, message: Message) -> tuple:
+        return unwrap_msg(router.send_and_get_reply(message, timeout=self._timeout))
@@ -0,0 +1,135 @@
+import importlib
+import json
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from core.constants import DEFAULT_HOTKEYS, PLUGIN_ENTRY_POINT_GROUP
+from core.log import log
+
+PluginCallable = Callable[[Any], None]
+
+
+class PluginAction(NamedTuple):
+    name: str
+    title: str
+    entry: str
+    path: Optional[str] = None
+    needs_player: bool = True
+
+
+def _entry_points(group: str) -> Iterable[Any]:
+    from importlib.metadata import entry_points
+
+    try:
+        return entry_points(group=group)
+    except TypeError:
+        return entry_points().get(group, [])
+
+
+class PluginRegistry:
+    def __init__(self, directory: Optional[str] = None, group: str = PLUGIN_ENTRY_POINT_GROUP) -> None:
+        self._directory = directory
+        self._group = group
+        self._actions: Dict[str, PluginAction] = {}
+        self._loaded: Dict[str, PluginCallable] = {}
+        self._failed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def actions(self) -> List[PluginAction]:
+        return list(self._actions.values())
+
+    def get(self, name: str) -> Optional[PluginAction]:
+        return self._actions.get(name)
+
+    def discover(self) -> None:
+        self._actions.clear()
+        if not getattr(sys, "frozen", False):
+            try:
+                for entry_point in _entry_points(self._group):
+                    self._add(PluginAction(entry_point.name, entry_point.name, entry_point.value))
+            except Exception:
+                log.exception("Failed to read %s entry points", self._group)
+        if self._directory and os.path.isdir(self._directory):
+            for filename in sorted(os.listdir(self._directory)):
+                if filename.endswith(".json"):
+                    self._read_manifest(os.path.join(self._directory, filename))
+        if self._actions:
+            log.info("Found %d plugin actions", len(self._actions))
+
+    def _read_manifest(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            log.exception("Failed to read plugin manifest %s", path)
+            return
+        entries = manifest.get("actions") if isinstance(manifest, dict) else None
+        if not isinstance(entries, list):
+            log.warning("Plugin manifest %s has no actions", path)
+            return
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get("name") or not entry.get("entry"):
+                continue
+            name = str(entry["name"])
+            self._add(PluginAction(
+                name,
+                str(entry.get("title") or name),
+                str(entry["entry"]),
+                os.path.dirname(path),
+                bool(entry.get("needs_player", True)),
+            ))
+
+    def _add(self, action: PluginAction) -> None:
+        if action.name in DEFAULT_HOTKEYS or action.name in self._actions:
+            log.warning("Ignoring plugin action %s: the name is already taken", action.name)
+            return
+        if ":" not in action.entry:
+            log.warning("Ignoring plugin action %s: entry %r is not module:attribute", action.name, action.entry)
+            return
+        self._actions[action.name] = action
+
+    def load(self, name: str) -> Optional[PluginCallable]:
+        function = self._loaded.get(name)
+        if function is not None:
+            return function
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            if name in self._failed:
+                return None
+            action = self._actions.get(name)
+            if action is None:
+                return None
+            try:
+                function = self._import(action)
+            except Exception:
+                self._failed.add(name)
+                log.exception("Failed to load plugin action %s from %s", name, action.entry)
+                return None
+            self._loaded[name] = function
+            return function
+
+    @staticmethod
+    def _import(action: PluginAction) -> PluginCallable:
+        if action.path and action.path not in sys.path:
+            sys.path.append(action.path)
+        module_name, _, attribute = action.entry.partition(":")
+        target: Any = importlib.import_module(module_name)
+        for part in attribute.split("."):
+            target = getattr(target, part)
+        if not callable(target):
+            raise TypeError(f"{action.entry} is not callable")
+        return target
+
+    def run(self, name: str, controller: Any) -> bool:
+        function = self.load(name)
+        if function is None:
+            return False
+        try:
+            function(controller)
+        except Exception:
+            log.exception("Plugin action %s failed", name)
+            return False
+        return True
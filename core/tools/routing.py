@@ -0,0 +1,191 @@
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Protocol, Tuple
+
+from core.constants import TARGET_WINDOW_TITLES
+from core.log import log
+
+
+class TargetDefinition(NamedTuple):
+    name: str
+    titles: Tuple[str, ...]
+    priority: int = 0
+    actions: Optional[FrozenSet[str]] = None
+
+    def matches(self, title: str) -> bool:
+        return any(fragment in title for fragment in self.titles)
+
+    def supports(self, action: str) -> bool:
+        return self.actions is None or action in self.actions
+
+
+DEFAULT_TARGETS: Tuple[TargetDefinition, ...] = (
+    TargetDefinition("yandex_music", tuple(TARGET_WINDOW_TITLES), priority=100),
+)
+
+
+def load_targets(entries: List[Dict[str, Any]]) -> Tuple[TargetDefinition, ...]:
+    targets = tuple(
+        TargetDefinition(
+            entry["name"],
+            tuple(entry["titles"]),
+            entry.get("priority", 0),
+            frozenset(entry["actions"]) if "actions" in entry else None,
+        )
+        for entry in entries
+    )
+    return targets or DEFAULT_TARGETS
+
+
+class WindowBackend(Protocol):
+    def enum_windows(self, callback: Callable[[int, str], bool]) -> None: ...
+    def get_title(self, hwnd: int) -> str: ...
+    def is_window(self, hwnd: int) -> bool: ...
+
+
+class TargetWindow:
+    __slots__ = ("hwnd", "target", "last_used", "playing")
+
+    def __init__(self, hwnd: int, target: TargetDefinition) -> None:
+        self.hwnd = hwnd
+        self.target = target
+        self.last_used = 0.0
+        self.playing = False
+
+    def rank(self) -> Tuple[bool, int, float]:
+        return self.playing, self.target.priority, self.last_used
+
+
+class TargetRouter:
+    def __init__(
+        self,
+        backend: WindowBackend,
+        targets: Tuple[TargetDefinition, ...] = DEFAULT_TARGETS,
+    ) -> None:
+        self._backend = backend
+        self._targets = targets
+        self._windows: Dict[int, TargetWindow] = {}
+        self._routes: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[bool], None]] = []
+        self._window_listeners: List[Callable[[int], None]] = []
+
+    @property
+    def has_target(self) -> bool:
+        return bool(self._windows)
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        self._listeners.append(callback)
+
+    def add_window_listener(self, callback: Callable[[int], None]) -> None:
+        self._window_listeners.append(callback)
+
+    def windows(self) -> List[TargetWindow]:
+        return list(self._windows.values())
+
+    def rebuild(self) -> None:
+        found: Dict[int, TargetWindow] = {}
+
+        def collect(hwnd: int, title: str) -> bool:
+            target = self._match(title)
+            if target is not None:
+                found[hwnd] = self._windows.get(hwnd) or TargetWindow(hwnd, target)
+                found[hwnd].target = target
+            return True
+
+        self._backend.enum_windows(collect)
+        with self._lock:
+            had_target = bool(self._windows)
+            gone = [hwnd for hwnd in self._windows if hwnd not in found]
+            self._windows = found
+            self._routes = {}
+        log.info("Routing rebuilt: %d target window(s)", len(found))
+        for hwnd in gone:
+            self._window_gone(hwnd)
+        self._notify(had_target)
+
+    def window_changed(self, hwnd: int) -> None:
+        target = self._match(self._backend.get_title(hwnd))
+        with self._lock:
+            had_target = bool(self._windows)
+            window = self._windows.get(hwnd)
+            if target is None:
+                if window is None:
+                    return
+                del self._windows[hwnd]
+            elif window is None:
+                self._windows[hwnd] = TargetWindow(hwnd, target)
+            elif window.target is target:
+                return
+            else:
+                window.target = target
+            self._routes = {}
+        if window is not None:
+            self._window_gone(hwnd)
+        self._notify(had_target)
+
+    def window_destroyed(self, hwnd: int) -> None:
+        with self._lock:
+            if hwnd not in self._windows:
+                return
+            had_target = bool(self._windows)
+            del self._windows[hwnd]
+            self._routes = {}
+        self._window_gone(hwnd)
+        self._notify(had_target)
+
+    def resolve(self, action: str) -> Optional[int]:
+        hwnd = self._routes.get(action, 0)
+        if hwnd != 0:
+            return hwnd
+        with self._lock:
+            best: Optional[TargetWindow] = None
+            for window in self._windows.values():
+                if window.target.supports(action) and (best is None or window.rank() > best.rank()):
+                    best = window
+            hwnd = best.hwnd if best is not None else None
+            self._routes[action] = hwnd
+        return hwnd
+
+    def note_used(self, hwnd: int, playing: Optional[bool] = None) -> None:
+        window = self._windows.get(hwnd)
+        if window is None:
+            return
+        window.last_used = time.monotonic()
+        if playing is not None:
+            window.playing = playing
+        if playing is False or any(route is not None and route != hwnd for route in self._routes.values()):
+            with self._lock:
+                self._routes = {}
+
+    def toggle_playing(self, hwnd: int) -> None:
+        window = self._windows.get(hwnd)
+        if window is not None:
+            self.note_used(hwnd, not window.playing)
+
+    def _match(self, title: str) -> Optional[TargetDefinition]:
+        if not title:
+            return None
+        best: Optional[TargetDefinition] = None
+        for target in self._targets:
+            if target.matches(title) and (best is None or target.priority > best.priority):
+                best = target
+        return best
+
+    def _window_gone(self, hwnd: int) -> None:
+        for callback in self._window_listeners:
+            try:
+                callback(hwnd)
+            except Exception:
+                log.exception("Window listener failed")
+
+    def _notify(self, had_target: bool) -> None:
+        present = bool(self._windows)
+        if present == had_target:
+            return
+        log.info("Player %s", "found" if present else "missing")
+        for callback in self._listeners:
+            try:
+                callback(present)
+            except Exception:
+                log.exception("Routing listener failed")
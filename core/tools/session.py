@@ -0,0 +1,303 @@
+import ctypes
+import os
+import sys
+import threading
+from ctypes import wintypes
+from queue import Queue
+from typing import Callable, List, Optional, Protocol, Set
+
+from core.log import log
+from core.tools.wakeups import wakeups
+
+REASON_LOCK = "lock"
+REASON_SUSPEND = "suspend"
+REASON_DISCONNECT = "disconnect"
+
+SessionHandler = Callable[[bool, str], None]
+
+
+class SessionSource(Protocol):
+    def start(self, handler: SessionHandler) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class SessionMonitor:
+    def __init__(self, source: SessionSource) -> None:
+        self._source = source
+        self._inactive: Set[str] = set()
+        self._listeners: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    @property
+    def active(self) -> bool:
+        return not self._inactive
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        self._listeners.append(callback)
+
+    def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        try:
+            self._source.start(self._on_session_event)
+        except Exception:
+            self._started = False
+            log.exception("Failed to start session notifications")
+
+    def stop(self) -> None:
+        if self._started:
+            self._started = False
+            self._source.stop()
+
+    def _on_session_event(self, active: bool, reason: str) -> None:
+        wakeups.note("session")
+        with self._lock:
+            was_active = not self._inactive
+            if active:
+                self._inactive.discard(reason)
+            else:
+                self._inactive.add(reason)
+            now_active = not self._inactive
+        log.info("Session %s %s", reason, "ended" if active else "started")
+        if was_active == now_active:
+            return
+        log.info("Session became %s", "active" if now_active else "inactive")
+        for callback in list(self._listeners):
+            try:
+                callback(now_active)
+            except Exception:
+                log.exception("Session listener failed")
+
+
+WM_QUIT = 0x0012
+WM_POWERBROADCAST = 0x0218
+WM_WTSSESSION_CHANGE = 0x02B1
+NOTIFY_FOR_THIS_SESSION = 0
+
+_SESSION_CHANGES = {
+    0x1: (True, REASON_DISCONNECT),  # WTS_CONSOLE_CONNECT
+    0x2: (False, REASON_DISCONNECT),  # WTS_CONSOLE_DISCONNECT
+    0x3: (True, REASON_DISCONNECT),  # WTS_REMOTE_CONNECT
+    0x4: (False, REASON_DISCONNECT),  # WTS_REMOTE_DISCONNECT
+    0x7: (False, REASON_LOCK),  # WTS_SESSION_LOCK
+    0x8: (True, REASON_LOCK),  # WTS_SESSION_UNLOCK
+}
+_POWER_CHANGES = {
+    0x04: (False, REASON_SUSPEND),  # PBT_APMSUSPEND
+    0x07: (True, REASON_SUSPEND),  # PBT_APMRESUMESUSPEND
+    0x12: (True, REASON_SUSPEND),  # PBT_APMRESUMEAUTOMATIC
+}
+_WINDOW_CLASS = "YandexMusicHotkeysSession"
+
+if sys.platform == "win32":
+    WNDPROC = ctypes.WINFUNCTYPE(
+        wintypes.LPARAM,
+        wintypes.HWND,
+        wintypes.UINT,
+        wintypes.WPARAM,
+        wintypes.LPARAM,
+    )
+
+    class WNDCLASSW(ctypes.Structure):
+        _fields_ = [
+            ("style", wintypes.UINT),
+            ("lpfnWndProc", WNDPROC),
+            ("cbClsExtra", ctypes.c_int),
+            ("cbWndExtra", ctypes.c_int),
+            ("hInstance", wintypes.HINSTANCE),
+            ("hIcon", wintypes.HICON),
+            ("hCursor", wintypes.HANDLE),
+            ("hbrBackground", wintypes.HBRUSH),
+            ("lpszMenuName", wintypes.LPCWSTR),
+            ("lpszClassName", wintypes.LPCWSTR),
+        ]
+
+
+class WtsSessionSource:
+    def __init__(self) -> None:
+        self._handler: Optional[SessionHandler] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._proc: Optional[object] = None
+        self._user32: Optional[ctypes.WinDLL] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def start(self, handler: SessionHandler) -> None:
+        if self._thread is not None:
+            return
+        self._handler = handler
+        self._thread = threading.Thread(target=self._run, name="SessionWindow", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            self._thread = None
+            self._ready.clear()
+            raise error
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        if self._thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._thread_id = 0
+        self._ready.clear()
+
+    def _run(self) -> None:
+        try:
+            hwnd = self._create_window()
+        except Exception as exc:
+            self._error = exc
+            return
+        finally:
+            self._ready.set()
+
+        user32 = self._user32
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        if hwnd:
+            ctypes.WinDLL("wtsapi32").WTSUnRegisterSessionNotification(hwnd)
+            user32.DestroyWindow(hwnd)
+        self._proc = None
+
+    def _create_window(self) -> int:
+        user32 = ctypes.WinDLL("user32")
+        wtsapi32 = ctypes.WinDLL("wtsapi32")
+        kernel32 = ctypes.WinDLL("kernel32")
+        user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+        user32.DefWindowProcW.restype = wintypes.LPARAM
+        user32.RegisterClassW.argtypes = [ctypes.POINTER(WNDCLASSW)]
+        user32.RegisterClassW.restype = wintypes.ATOM
+        user32.CreateWindowExW.argtypes = [
+            wintypes.DWORD,
+            wintypes.LPCWSTR,
+            wintypes.LPCWSTR,
+            wintypes.DWORD,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            wintypes.HWND,
+            wintypes.HMENU,
+            wintypes.HINSTANCE,
+            wintypes.LPVOID,
+        ]
+        user32.CreateWindowExW.restype = wintypes.HWND
+        kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+        self._user32 = user32
+
+        self._thread_id = kernel32.GetCurrentThreadId()
+        self._proc = WNDPROC(self._window_proc)
+        window_class = WNDCLASSW()
+        window_class.lpfnWndProc = self._proc
+        window_class.hInstance = kernel32.GetModuleHandleW(None)
+        window_class.lpszClassName = _WINDOW_CLASS
+        user32.RegisterClassW(ctypes.byref(window_class))
+        hwnd = user32.CreateWindowExW(
+            0, _WINDOW_CLASS, _WINDOW_CLASS, 0, 0, 0, 0, 0, None, None, window_class.hInstance, None
+        )
+        if hwnd:
+            if not wtsapi32.WTSRegisterSessionNotification(hwnd, NOTIFY_FOR_THIS_SESSION):
+                log.warning("Failed to register for session notifications")
+        else:
+            log.warning("Failed to create the session notification window")
+        return hwnd
+
+    def _window_proc(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        change = None
+        if msg == WM_WTSSESSION_CHANGE:
+            change = _SESSION_CHANGES.get(wparam)
+        elif msg == WM_POWERBROADCAST:
+            change = _POWER_CHANGES.get(wparam)
+        if change is not None and self._handler is not None:
+            try:
+                self._handler(*change)
+            except Exception:
+                log.exception("Session handler failed")
+        return self._user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+
+LOGIND_BUS = "org.freedesktop.login1"
+LOGIND_PATH = "/org/freedesktop/login1"
+LOGIND_MANAGER = "org.freedesktop.login1.Manager"
+LOGIND_SESSION = "org.freedesktop.login1.Session"
+
+
+class LogindSessionSource:
+    def __init__(self, bus: str = "SYSTEM", timeout: float = 1.0) -> None:
+        self._bus = bus
+        self._timeout = timeout
+        self._router = None
+        self._signals: Optional[Queue] = None
+
+    def start(self, handler: SessionHandler) -> None:
+        from jeepney import DBusAddress, MatchRule, message_bus, new_method_call
+        from jeepney.io.threading import DBusRouter, Proxy, open_dbus_connection
+        from jeepney.wrappers import unwrap_msg
+
+        router = DBusRouter(open_dbus_connection(bus=self._bus))
+        bus = Proxy(message_bus, router, timeout=self._timeout)
+        rules = [MatchRule(type="signal", interface=LOGIND_MANAGER, member="PrepareForSleep", path=LOGIND_PATH)]
+        manager = DBusAddress(LOGIND_PATH, bus_name=LOGIND_BUS, interface=LOGIND_MANAGER)
+        try:
+            reply = router.send_and_get_reply(
+                new_method_call(manager, "GetSessionByPID", "u", (os.getpid(),)), timeout=self._timeout
+            )
+            session_path = unwrap_msg(reply)[0]
+            rules += [
+                MatchRule(type="signal", interface=LOGIND_SESSION, member=member, path=session_path)
+                for member in ("Lock", "Unlock")
+            ]
+        except Exception:
+            log.info("No logind session for this process, watching sleep only")
+        self._signals = Queue()
+        for rule in rules:
+            router.filter(rule, queue=self._signals)
+            bus.AddMatch(rule)
+        self._router = router
+        threading.Thread(target=self._watch, args=(handler,), name="LogindWatch", daemon=True).start()
+
+    def stop(self) -> None:
+        router = self._router
+        if router is None:
+            return
+        self._router = None
+        if self._signals is not None:
+            self._signals.put(None)
+        router.close()
+        router.conn.close()
+
+    def _watch(self, handler: SessionHandler) -> None:
+        from jeepney import HeaderFields
+
+        signals = self._signals
+        while signals is not None:
+            message = signals.get()
+            if message is None:
+                return
+            member = message.header.fields.get(HeaderFields.member)
+            try:
+                if member == "PrepareForSleep":
+                    handler(not message.body[0], REASON_SUSPEND)
+                elif member == "Lock":
+                    handler(False, REASON_LOCK)
+                elif member == "Unlock":
+                    handler(True, REASON_LOCK)
+            except Exception:
+                log.exception("Session handler failed")
+
+
+def create_session_source() -> SessionSource:
+    if sys.platform == "win32":
+        return WtsSessionSource()
+    return LogindSessionSource()
@@ -0,0 +1,75 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Set, Tuple
+
+from core.log import log
+from core.tools.wakeups import wakeups
+
+Clock = Callable[[], float]
+
+
+class TimerWheel:
+    def __init__(self, clock: Clock = time.monotonic, threaded: bool = True) -> None:
+        self._clock = clock
+        self._threaded = threaded
+        self._heap: List[Tuple[float, int, Callable[[], None]]] = []
+        self._cancelled: Set[int] = set()
+        self._counter = itertools.count(1)
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def now(self) -> float:
+        return self._clock()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> int:
+        handle = next(self._counter)
+        with self._cond:
+            heapq.heappush(self._heap, (self._clock() + delay, handle, callback))
+            if self._threaded:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="TimerWheel", daemon=True)
+                    self._thread.start()
+                elif self._heap[0][1] == handle:
+                    self._cond.notify()
+        return handle
+
+    def cancel(self, handle: int) -> None:
+        if handle:
+            with self._cond:
+                self._cancelled.add(handle)
+
+    def run_due(self, now: Optional[float] = None) -> Optional[float]:
+        current = self._clock() if now is None else now
+        while True:
+            with self._cond:
+                if not self._heap:
+                    return None
+                deadline, handle, callback = self._heap[0]
+                if deadline > current:
+                    return deadline
+                heapq.heappop(self._heap)
+                if handle in self._cancelled:
+                    self._cancelled.discard(handle)
+                    continue
+            try:
+                callback()
+            except Exception:
+                log.exception("Timer callback failed")
+
+    def _run(self) -> None:
+        while True:
+            next_deadline = self.run_due()
+            with self._cond:
+                if self._heap and self._heap[0][0] != next_deadline:
+                    continue
+                if next_deadline is None:
+                    self._cancelled.clear()
+                    self._cond.wait()
+                else:
+                    self._cond.wait(max(next_deadline - self._clock(), 0.0))
+            wakeups.note("timer")
+
+
+timers = TimerWheel()
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, List, Tuple
+
+from core.constants import WAKEUP_WINDOW_MINUTES
+
+USER_INPUT_SOURCES: FrozenSet[str] = frozenset({"keyboard"})
+
+
+class WakeupCounter:
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        window_minutes: int = WAKEUP_WINDOW_MINUTES,
+    ) -> None:
+        self._clock = clock
+        self._window = window_minutes
+        self._started = int(clock() // 60)
+        self._counts: Dict[str, int] = {}
+        self._minutes: Deque[Tuple[int, Dict[str, int]]] = deque()
+        self._lock = threading.Lock()
+
+    def note(self, source: str) -> None:
+        minute = int(self._clock() // 60)
+        with self._lock:
+            self._counts[source] = self._counts.get(source, 0) + 1
+            minutes = self._minutes
+            if not minutes or minutes[-1][0] != minute:
+                minutes.append((minute, {}))
+                while minutes[0][0] <= minute - self._window:
+                    minutes.popleft()
+            bucket = minutes[-1][1]
+            bucket[source] = bucket.get(source, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def per_minute(self) -> List[Dict[str, int]]:
+        now = int(self._clock() // 60)
+        with self._lock:
+            buckets = {minute: dict(counts) for minute, counts in self._minutes}
+        first = max(now - self._window + 1, self._started)
+        return [buckets.get(minute, {}) for minute in range(first, now + 1)]
+
+    def rates(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        minutes = self.per_minute()
+        totals: Dict[str, int] = {}
+        for counts in minutes:
+            for source, count in counts.items():
+                totals[source] = totals.get(source, 0) + count
+        span = len(minutes)
+        idle = {source: count / span for source, count in totals.items() if source not in USER_INPUT_SOURCES}
+        user_input = {source: count / span for source, count in totals.items() if source in USER_INPUT_SOURCES}
+        return idle, user_input
+
+    def idle_per_minute(self) -> List[int]:
+        return [
+            sum(count for source, count in counts.items() if source not in USER_INPUT_SOURCES)
+            for counts in self.per_minute()
+        ]
+
+
+wakeups = WakeupCounter()
@@ -0,0 +1,199 @@
+import ctypes
+import time
+from ctypes import wintypes
+from typing import Any, Callable, Optional
+
+from core.constants import (
+    WATCHDOG_MIN_INTERVAL,
+    WATCHDOG_MISS_LIMIT,
+    WATCHDOG_PROBE_TIMEOUT,
+    WATCHDOG_PROBE_VK,
+)
+from core.log import log
+from core.tools.listener import HotkeyListener
+from core.tools.timers import TimerWheel, timers
+
+KEYEVENTF_KEYUP = 0x0002
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+TOKEN_QUERY = 0x0008
+TOKEN_ELEVATION = 20
+DESKTOP_READOBJECTS = 0x0001
+UOI_NAME = 2
+
+
+def send_probe_keystroke() -> None:
+    user32 = ctypes.WinDLL("user32")
+    user32.keybd_event(WATCHDOG_PROBE_VK, 0, 0, 0)
+    user32.keybd_event(WATCHDOG_PROBE_VK, 0, KEYEVENTF_KEYUP, 0)
+
+
+class ForegroundInputCheck:
+    def __init__(self) -> None:
+        self._user32 = ctypes.WinDLL("user32")
+        self._kernel32 = ctypes.WinDLL("kernel32")
+        self._advapi32 = ctypes.WinDLL("advapi32")
+        self._user32.GetForegroundWindow.restype = wintypes.HWND
+        self._user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+        self._user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+        self._user32.OpenInputDesktop.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._user32.OpenInputDesktop.restype = wintypes.HANDLE
+        self._user32.GetThreadDesktop.argtypes = [wintypes.DWORD]
+        self._user32.GetThreadDesktop.restype = wintypes.HANDLE
+        self._user32.CloseDesktop.argtypes = [wintypes.HANDLE]
+        self._user32.GetUserObjectInformationW.argtypes = [
+            wintypes.HANDLE,
+            ctypes.c_int,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.DWORD),
+        ]
+        self._kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._advapi32.OpenProcessToken.argtypes = [wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE)]
+        self._advapi32.GetTokenInformation.argtypes = [
+            wintypes.HANDLE,
+            ctypes.c_int,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.DWORD),
+        ]
+        self._elevated = self._is_elevated(self._kernel32.GetCurrentProcess())
+
+    def __call__(self) -> bool:
+        if not self._on_input_desktop():
+            return False
+        hwnd = self._user32.GetForegroundWindow()
+        if not hwnd:
+            return True
+        pid = wintypes.DWORD()
+        self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        process = self._kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not process:
+            return False
+        try:
+            elevated = self._is_elevated(process)
+        finally:
+            self._kernel32.CloseHandle(process)
+        return elevated is not None and (self._elevated or not elevated)
+
+    def _on_input_desktop(self) -> bool:
+        desktop = self._user32.OpenInputDesktop(0, False, DESKTOP_READOBJECTS)
+        if not desktop:
+            return False
+        try:
+            current = self._user32.GetThreadDesktop(self._kernel32.GetCurrentThreadId())
+            return self._desktop_name(desktop) == self._desktop_name(current)
+        finally:
+            self._user32.CloseDesktop(desktop)
+
+    def _desktop_name(self, desktop: Any) -> Optional[str]:
+        buffer = ctypes.create_unicode_buffer(256)
+        needed = wintypes.DWORD()
+        if not self._user32.GetUserObjectInformationW(
+            desktop, UOI_NAME, buffer, ctypes.sizeof(buffer), ctypes.byref(needed)
+        ):
+            return None
+        return buffer.value.lower()
+
+    def _is_elevated(self, process: Any) -> Optional[bool]:
+        token = wintypes.HANDLE()
+        if not self._advapi32.OpenProcessToken(process, TOKEN_QUERY, ctypes.byref(token)):
+            return None
+        try:
+            elevation = wintypes.DWORD()
+            size = wintypes.DWORD()
+            if not self._advapi32.GetTokenInformation(
+                token, TOKEN_ELEVATION, ctypes.byref(elevation), ctypes.sizeof(elevation), ctypes.byref(size)
+            ):
+                return None
+            return bool(elevation.value)
+        finally:
+            self._kernel32.CloseHandle(token)
+
+
+class HookWatchdog:
+    def __init__(
+        self,
+        listener: HotkeyListener,
+        wheel: TimerWheel = timers,
+        probe: Callable[[], None] = send_probe_keystroke,
+        can_probe: Optional[Callable[[], bool]] = None,
+        min_interval: float = WATCHDOG_MIN_INTERVAL,
+        probe_timeout: float = WATCHDOG_PROBE_TIMEOUT,
+        miss_limit: int = WATCHDOG_MISS_LIMIT,
+    ) -> None:
+        self._listener = listener
+        self._wheel = wheel
+        self._probe = probe
+        self._can_probe = can_probe if can_probe is not None else ForegroundInputCheck()
+        self._min_interval = min_interval
+        self._probe_timeout = probe_timeout
+        self._miss_limit = miss_limit
+        self._last_check: Optional[float] = None
+        self._probe_sent_at = 0.0
+        self._pending = False
+        self._misses = 0
+        self.skipped_probes = 0
+        self.reinstall_count = 0
+
+    @property
+    def worst_callback_ms(self) -> float:
+        return self._listener.max_callback_seconds * 1000.0
+
+    @property
+    def slow_callbacks(self) -> int:
+        return self._listener.slow_callbacks
+
+    def check(self) -> None:
+        if self._pending or not self._listener.is_hooked:
+            return
+        now = self._wheel.now()
+        if self._last_check is not None and now - self._last_check < self._min_interval:
+            return
+        if self._send_probe():
+            self._last_check = now
+
+    def _send_probe(self) -> bool:
+        try:
+            if not self._can_probe():
+                self.skipped_probes += 1
+                return False
+        except Exception:
+            log.exception("Hook probe check failed")
+            return False
+        self._pending = True
+        self._listener.expect_probe(True)
+        self._probe_sent_at = time.perf_counter()
+        try:
+            self._probe()
+        except Exception:
+            self._pending = False
+            self._listener.expect_probe(False)
+            log.exception("Hook probe failed")
+            return False
+        self._wheel.call_later(self._probe_timeout, self._verify)
+        return True
+
+    def _verify(self) -> None:
+        self._pending = False
+        self._listener.expect_probe(False)
+        if not self._listener.is_hooked or self._listener.last_event_time >= self._probe_sent_at:
+            self._misses = 0
+            return
+        self._misses += 1
+        if self._misses < self._miss_limit:
+            log.info("Hook probe missed (%d/%d)", self._misses, self._miss_limit)
+            self._send_probe()
+            return
+        self._misses = 0
+        self.reinstall_count += 1
+        log.warning(
+            "Keyboard hook went silent, re-registering it (count=%d, worst callback=%.1f ms, slow=%d)",
+            self.reinstall_count,
+            self.worst_callback_ms,
+            self.slow_callbacks,
+        )
+        if not self._listener.reinstall_hook():
+            log.warning("Could not re-register the OS keyboard hook, only the handler was re-added")
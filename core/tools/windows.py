@@ -0,0 +1,70 @@
+import ctypes
+import sys
+import threading
+from ctypes import wintypes
+from typing import Callable, Optional
+
+from core.tools.routing import TargetRouter
+from core.tools.winevents import WinEventLoop
+
+HSHELL_WINDOWCREATED = 1
+HSHELL_WINDOWDESTROYED = 2
+HSHELL_REDRAW = 6
+
+_TITLE_BUFFER_SIZE = 512
+
+if sys.platform == "win32":
+    WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+
+class Win32WindowBackend:
+    def __init__(self) -> None:
+        self.user32 = ctypes.WinDLL("user32")
+        self._declare_prototypes()
+        self._title_buf = ctypes.create_unicode_buffer(_TITLE_BUFFER_SIZE)
+        self._enum_proc = WNDENUMPROC(self._enum_callback)
+        self._visitor: Optional[Callable[[int, str], bool]] = None
+        self._lock = threading.Lock()
+
+    def _declare_prototypes(self) -> None:
+        self.user32.EnumWindows.argtypes = [WNDENUMPROC, wintypes.LPARAM]
+        self.user32.EnumWindows.restype = wintypes.BOOL
+        self.user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        self.user32.GetWindowTextW.restype = ctypes.c_int
+        self.user32.IsWindow.argtypes = [wintypes.HWND]
+        self.user32.IsWindow.restype = wintypes.BOOL
+
+    def _enum_callback(self, hwnd: int, _lparam: int) -> int:
+        if not self.user32.GetWindowTextW(hwnd, self._title_buf, _TITLE_BUFFER_SIZE):
+            return 1
+        visitor = self._visitor
+        return 1 if visitor is not None and visitor(hwnd, self._title_buf.value) else 0
+
+    def enum_windows(self, callback: Callable[[int, str], bool]) -> None:
+        with self._lock:
+            self._visitor = callback
+            try:
+                self.user32.EnumWindows(self._enum_proc, 0)
+            finally:
+                self._visitor = None
+
+    def get_title(self, hwnd: int) -> str:
+        with self._lock:
+            if not self.user32.GetWindowTextW(hwnd, self._title_buf, _TITLE_BUFFER_SIZE):
+                return ""
+            return self._title_buf.value
+
+    def is_window(self, hwnd: int) -> bool:
+        return bool(hwnd) and bool(self.user32.IsWindow(hwnd))
+
+
+def watch_windows(events: WinEventLoop, router: TargetRouter) -> None:
+    def on_shell_event(code: int, hwnd: int) -> None:
+        if not hwnd:
+            return
+        if code in (HSHELL_WINDOWCREATED, HSHELL_REDRAW):
+            router.window_changed(hwnd)
+        elif code == HSHELL_WINDOWDESTROYED:
+            router.window_destroyed(hwnd)
+
+    events.subscribe_shell(on_shell_event)
@@ -0,0 +1,205 @@
+import ctypes
+import sys
+import threading
+from ctypes import wintypes
+from typing import Any, Callable, List, Optional, Tuple
+
+from core.log import log
+from core.tools.wakeups import wakeups
+
+WINEVENT_OUTOFCONTEXT = 0x0000
+WM_QUIT = 0x0012
+HSHELL_CODE_MASK = 0x7FFF
+_SHELL_WINDOW_CLASS = "YandexMusicHotkeysShellHook"
+
+WinEventHandler = Callable[[int, int, int, int], None]
+ShellHandler = Callable[[int, int], None]
+
+if sys.platform == "win32":
+    WINEVENTPROC = ctypes.WINFUNCTYPE(
+        None,
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.HWND,
+        wintypes.LONG,
+        wintypes.LONG,
+        wintypes.DWORD,
+        wintypes.DWORD,
+    )
+    WNDPROC = ctypes.WINFUNCTYPE(wintypes.LPARAM, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+
+    class WNDCLASSW(ctypes.Structure):
+        _fields_ = [
+            ("style", wintypes.UINT),
+            ("lpfnWndProc", WNDPROC),
+            ("cbClsExtra", ctypes.c_int),
+            ("cbWndExtra", ctypes.c_int),
+            ("hInstance", wintypes.HINSTANCE),
+            ("hIcon", wintypes.HICON),
+            ("hCursor", wintypes.HANDLE),
+            ("hbrBackground", wintypes.HBRUSH),
+            ("lpszMenuName", wintypes.LPCWSTR),
+            ("lpszClassName", wintypes.LPCWSTR),
+        ]
+
+
+class WinEventLoop:
+    def __init__(self) -> None:
+        self._subscriptions: List[Tuple[int, int, WinEventHandler]] = []
+        self._shell_handlers: List[ShellHandler] = []
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._proc: Optional[object] = None
+        self._wnd_proc: Optional[object] = None
+        self._shell_message = 0
+        self._user32: Any = None
+        self._ready = threading.Event()
+
+    def subscribe(self, event_min: int, event_max: int, handler: WinEventHandler) -> None:
+        if self._thread is not None:
+            raise RuntimeError("subscribe() must be called before start()")
+        self._subscriptions.append((event_min, event_max, handler))
+
+    def subscribe_shell(self, handler: ShellHandler) -> None:
+        if self._thread is not None:
+            raise RuntimeError("subscribe_shell() must be called before start()")
+        self._shell_handlers.append(handler)
+
+    def start(self) -> None:
+        if self._thread is not None or not (self._subscriptions or self._shell_handlers):
+            return
+        self._thread = threading.Thread(target=self._run, name="WinEventLoop", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        if self._thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._thread_id = 0
+        self._ready.clear()
+
+    def _run(self) -> None:
+        user32 = ctypes.WinDLL("user32")
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HMODULE,
+            WINEVENTPROC,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.DWORD,
+        ]
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        user32.UnhookWinEvent.restype = wintypes.BOOL
+        user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+        user32.DefWindowProcW.restype = wintypes.LPARAM
+        self._user32 = user32
+
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._proc = WINEVENTPROC(self._on_event)
+        hooks = []
+        for event_min, event_max, _ in self._subscriptions:
+            handle = user32.SetWinEventHook(
+                event_min, event_max, None, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+            if handle:
+                hooks.append(handle)
+        shell_window = self._create_shell_window(user32) if self._shell_handlers else None
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for handle in hooks:
+            user32.UnhookWinEvent(handle)
+        if shell_window:
+            user32.DeregisterShellHookWindow(shell_window)
+            user32.DestroyWindow(shell_window)
+            user32.UnregisterClassW(_SHELL_WINDOW_CLASS, None)
+        self._proc = None
+        self._wnd_proc = None
+
+    def _create_shell_window(self, user32: Any) -> Optional[int]:
+        # Shell hook messages only cover top-level windows with a taskbar button,
+        # so no per-object event from other processes reaches Python.
+        user32.RegisterClassW.argtypes = [ctypes.POINTER(WNDCLASSW)]
+        user32.RegisterClassW.restype = wintypes.ATOM
+        user32.CreateWindowExW.argtypes = [
+            wintypes.DWORD,
+            wintypes.LPCWSTR,
+            wintypes.LPCWSTR,
+            wintypes.DWORD,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            wintypes.HWND,
+            wintypes.HMENU,
+            wintypes.HINSTANCE,
+            wintypes.LPVOID,
+        ]
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.RegisterWindowMessageW.argtypes = [wintypes.LPCWSTR]
+        user32.RegisterWindowMessageW.restype = wintypes.UINT
+        user32.RegisterShellHookWindow.argtypes = [wintypes.HWND]
+        user32.RegisterShellHookWindow.restype = wintypes.BOOL
+        user32.DeregisterShellHookWindow.argtypes = [wintypes.HWND]
+        user32.DeregisterShellHookWindow.restype = wintypes.BOOL
+        user32.DestroyWindow.argtypes = [wintypes.HWND]
+        user32.DestroyWindow.restype = wintypes.BOOL
+        user32.UnregisterClassW.argtypes = [wintypes.LPCWSTR, wintypes.HINSTANCE]
+        user32.UnregisterClassW.restype = wintypes.BOOL
+
+        self._wnd_proc = WNDPROC(self._on_window_message)
+        window_class = WNDCLASSW()
+        window_class.lpfnWndProc = self._wnd_proc
+        window_class.lpszClassName = _SHELL_WINDOW_CLASS
+        if not user32.RegisterClassW(ctypes.byref(window_class)):
+            log.error("Could not register the shell hook window class")
+            return None
+        hwnd = user32.CreateWindowExW(0, _SHELL_WINDOW_CLASS, "", 0, 0, 0, 0, 0, None, None, None, None)
+        self._shell_message = user32.RegisterWindowMessageW("SHELLHOOK")
+        if not hwnd or not user32.RegisterShellHookWindow(hwnd):
+            log.error("Could not register the shell hook window")
+            if hwnd:
+                user32.DestroyWindow(hwnd)
+            user32.UnregisterClassW(_SHELL_WINDOW_CLASS, None)
+            return None
+        return hwnd
+
+    def _on_window_message(self, hwnd: int, message: int, wparam: int, lparam: int) -> int:
+        if message != self._shell_message or not self._shell_message:
+            return self._user32.DefWindowProcW(hwnd, message, wparam, lparam)
+        wakeups.note("shellhook")
+        code = wparam & HSHELL_CODE_MASK
+        for handler in self._shell_handlers:
+            try:
+                handler(code, lparam or 0)
+            except Exception:
+                log.exception("Shell hook handler failed for code %d", code)
+        return 0
+
+    def _on_event(
+        self,
+        _hook: int,
+        event: int,
+        hwnd: int,
+        id_object: int,
+        id_child: int,
+        _thread: int,
+        _time: int,
+    ) -> None:
+        wakeups.note("winevent")
+        for event_min, event_max, handler in self._subscriptions:
+            if event_min <= event <= event_max:
+                try:
+                    handler(event, hwnd or 0, id_object, id_child)
+                except Exception:
+                    log.exception("WinEvent handler failed for event 0x%04x", event)
@@ -0,0 +1,92 @@
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+from PIL import Image
+
+from core.constants import APP_VERSION, get_resource_path
+from core.log import log
+
+ICON_ACTIVE = "active"
+ICON_MISSING = "missing"
+ICON_PAUSED = "paused"
+ICON_VARIANTS = (ICON_ACTIVE, ICON_MISSING, ICON_PAUSED)
+
+SM_CXSMICON = 49
+_FALLBACK_SIZE = 64
+_FALLBACK_COLOR = (88, 166, 255, 255)
+
+
+def tray_icon_size() -> int:
+    if sys.platform == "win32":
+        try:
+            import ctypes
+
+            size = ctypes.windll.user32.GetSystemMetrics(SM_CXSMICON)
+            if size > 0:
+                return size
+        except Exception:
+            log.exception("Failed to query tray icon size")
+    return _FALLBACK_SIZE
+
+
+def _render_variants(size: int) -> Dict[str, Image.Image]:
+    path = get_resource_path(os.path.join("assets", "icon.ico"))
+    if os.path.isfile(path):
+        with Image.open(path) as source:
+            base = source.convert("RGBA").resize((size, size), Image.LANCZOS)
+    else:
+        base = Image.new("RGBA", (size, size), _FALLBACK_COLOR)
+
+    alpha = base.getchannel("A")
+    grey = base.convert("L").convert("RGBA")
+    grey.putalpha(alpha)
+    dimmed = grey.copy()
+    dimmed.putalpha(alpha.point(lambda value: value // 2))
+    return {ICON_ACTIVE: base, ICON_MISSING: grey, ICON_PAUSED: dimmed}
+
+
+class TrayIconCache:
+    def __init__(self, directory: str, size: Optional[int] = None) -> None:
+        self._directory = os.path.join(directory, "icons")
+        self._size = size or tray_icon_size()
+        self._images: Dict[str, Image.Image] = {}
+        self._lock = threading.Lock()
+
+    def get(self, variant: str) -> Image.Image:
+        image = self._images.get(variant)
+        if image is not None:
+            return image
+        with self._lock:
+            if variant not in self._images:
+                self._load(variant)
+            return self._images[variant]
+
+    def preload(self) -> None:
+        for variant in ICON_VARIANTS:
+            self.get(variant)
+
+    def _cache_path(self, variant: str) -> str:
+        return os.path.join(self._directory, f"tray-{variant}-{self._size}-{APP_VERSION}.rgba")
+
+    def _load(self, variant: str) -> None:
+        expected = self._size * self._size * 4
+        try:
+            with open(self._cache_path(variant), "rb") as f:
+                data = f.read()
+            if len(data) == expected:
+                self._images[variant] = Image.frombytes("RGBA", (self._size, self._size), data)
+                return
+        except OSError:
+            pass
+
+        rendered = _render_variants(self._size)
+        self._images.update(rendered)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            for name, image in rendered.items():
+                with open(self._cache_path(name), "wb") as f:
+                    f.write(image.tobytes())
+        except OSError:
+            log.exception("Failed to cache tray icons in %s", self._directory)
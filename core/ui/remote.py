@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.config import Config
+from core.constants import SETTINGS_UI_FLAG
+from core.i18n import set_locale
+from core.log import log
+from core.tools.listener import HotkeyListener
+from core.ui.contracts import CloseReason
+
+TOKEN_ENV = "YMH_SETTINGS_TOKEN"
+_CONNECT_TIMEOUT = 10.0
+_CALL_TIMEOUT = 5.0
+
+
+def _send_line(sock: socket.socket, lock: threading.Lock, payload: Dict[str, Any]) -> None:
+    data = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+    with lock:
+        sock.sendall(data)
+
+
+def _read_lines(sock: socket.socket):
+    with sock.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _child_command(port: int) -> List[str]:
+    if getattr(sys, "frozen", False):
+        return [sys.executable, SETTINGS_UI_FLAG, str(port)]
+    main_script = os.path.abspath(sys.argv[0])
+    return [sys.executable, main_script, SETTINGS_UI_FLAG, str(port)]
+
+
+class SettingsHost:
+    def __init__(
+        self,
+        config: Config,
+        listener: HotkeyListener,
+        on_language_changed: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._config = config
+        self._listener = listener
+        self._on_language_changed = on_language_changed
+        self._process: Optional[subprocess.Popen] = None
+        self._conn: Optional[socket.socket] = None
+        self._events: "Queue[Optional[Dict[str, Any]]]" = Queue()
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def open(self) -> bool:
+        with self._lock:
+            if self.is_running:
+                self._notify("focus")
+                return True
+            try:
+                self._spawn()
+            except OSError:
+                log.exception("Failed to start the settings process")
+                return False
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self.is_running:
+                self._notify("destroy")
+
+    def _spawn(self) -> None:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        token = secrets.token_hex(16)
+        env = dict(os.environ)
+        env[TOKEN_ENV] = token
+        self._events = Queue()
+        self._process = subprocess.Popen(_child_command(server.getsockname()[1]), env=env)
+        threading.Thread(
+            target=self._serve,
+            args=(server, token, self._process),
+            name="SettingsHost",
+            daemon=True,
+        ).start()
+
+    def _serve(self, server: socket.socket, token: str, process: subprocess.Popen) -> None:
+        events = self._events
+        server.settimeout(_CONNECT_TIMEOUT)
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            log.warning("Settings process did not connect")
+            process.kill()
+            return
+        finally:
+            server.close()
+        conn.settimeout(None)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            messages = _read_lines(conn)
+            hello = next(messages, None)
+            if not hello or not secrets.compare_digest(str(hello.get("token", "")), token):
+                log.warning("Rejected settings connection with a bad token")
+                return
+            self._conn = conn
+            threading.Thread(
+                target=self._send_events,
+                args=(conn, events),
+                name="SettingsHostEvents",
+                daemon=True,
+            ).start()
+            for message in messages:
+                self._handle(message)
+        except (OSError, ValueError):
+            log.exception("Settings connection failed")
+        finally:
+            events.put(None)
+            self._conn = None
+            self._listener.cancel_capture()
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _handle(self, message: Dict[str, Any]) -> None:
+        request_id = message.get("id")
+        op = message.get("op")
+        args = message.get("args") or {}
+        try:
+            result = self._dispatch(str(op), args)
+            reply: Dict[str, Any] = {"id": request_id, "result": result}
+        except Exception as exc:
+            log.exception("Settings request %s failed", op)
+            reply = {"id": request_id, "error": str(exc)}
+        self._send(reply)
+
+    def _dispatch(self, op: str, args: Dict[str, Any]) -> Any:
+        if op == "get_hotkeys":
+            return self._config.get_hotkeys()
+        if op == "get_language":
+            return self._config.get_language()
+        if op == "set_language":
+            self._config.set_language(args["language"])
+            set_locale(self._config.get_language())
+            if self._on_language_changed:
+                self._on_language_changed()
+            return None
+        if op == "get_plugin_hotkeys":
+            return self._config.get_plugin_hotkeys()
+        if op == "save_config":
+            self._config.save_config(args["hotkeys"], args.get("plugin_hotkeys"))
+            return None
+        if op == "is_autostart_enabled":
+            return self._config.is_autostart_enabled()
+        if op == "set_autostart":
+            self._config.set_autostart(bool(args["enabled"]))
+            return None
+        if op == "reload":
+            self._listener.reload()
+            return None
+        if op == "start_capture":
+            self._listener.start_capture(lambda combo: self._notify("captured", combo=combo))
+            return None
+        if op == "cancel_capture":
+            self._listener.cancel_capture()
+            return None
+        if op == "plugin_actions":
+            return self._listener.plugin_actions()
+        if op == "load_plugin":
+            return self._listener.load_plugin(str(args["name"]))
+        raise ValueError(f"unknown op {op!r}")
+
+    def _notify(self, event: str, **fields: Any) -> None:
+        payload: Dict[str, Any] = {"event": event}
+        payload.update(fields)
+        self._events.put(payload)
+
+    def _send_events(self, conn: socket.socket, events: "Queue[Optional[Dict[str, Any]]]") -> None:
+        while True:
+            payload = events.get()
+            if payload is None:
+                return
+            try:
+                _send_line(conn, self._send_lock, payload)
+            except OSError:
+                log.exception("Failed to send %s to the settings process", payload.get("event"))
+                return
+
+    def _send(self, payload: Dict[str, Any]) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        try:
+            _send_line(conn, self._send_lock, payload)
+        except OSError:
+            log.exception("Failed to send to the settings process")
+
+
+class SettingsConnection:
+    def __init__(self, port: int, token: str) -> None:
+        self._sock = socket.create_connection(("127.0.0.1", port), timeout=_CONNECT_TIMEOUT)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.settimeout(None)
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Tuple[threading.Event, List[Dict[str, Any]]]] = {}
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+        self.on_disconnect: Optional[Callable[[], None]] = None
+        _send_line(self._sock, self._send_lock, {"token": token})
+        threading.Thread(target=self._read, name="SettingsConnection", daemon=True).start()
+
+    def on_event(self, event: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self._handlers[event] = handler
+
+    def call(self, op: str, **args: Any) -> Any:
+        request_id = next(self._ids)
+        done = threading.Event()
+        slot: List[Dict[str, Any]] = []
+        self._pending[request_id] = (done, slot)
+        try:
+            _send_line(self._sock, self._send_lock, {"id": request_id, "op": op, "args": args})
+            if not done.wait(_CALL_TIMEOUT) or not slot:
+                raise TimeoutError(f"settings request {op!r} timed out")
+        finally:
+            self._pending.pop(request_id, None)
+        reply = slot[0]
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply.get("result")
+
+    def close(self) -> None:
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def _read(self) -> None:
+        try:
+            for message in _read_lines(self._sock):
+                if "event" in message:
+                    handler = self._handlers.get(message["event"])
+                    if handler is not None:
+                        handler(message)
+                    continue
+                pending = self._pending.get(message.get("id"))
+                if pending is not None:
+                    pending[1].append(message)
+                    pending[0].set()
+        except (OSError, ValueError):
+            pass
+        if self.on_disconnect is not None:
+            self.on_disconnect()
+
+
+class RemoteConfig:
+    def __init__(self, conn: SettingsConnection) -> None:
+        self._conn = conn
+
+    def get_hotkeys(self) -> Dict[str, str]:
+        return self._conn.call("get_hotkeys")
+
+    def get_language(self) -> str:
+        return self._conn.call("get_language")
+
+    def set_language(self, lang: str) -> None:
+        self._conn.call("set_language", language=lang)
+
+    def get_plugin_hotkeys(self) -> Dict[str, str]:
+        return self._conn.call("get_plugin_hotkeys")
+
+    def save_config(self, hotkeys: Dict[str, str], plugin_hotkeys: Optional[Dict[str, str]] = None) -> None:
+        self._conn.call("save_config", hotkeys=hotkeys, plugin_hotkeys=plugin_hotkeys)
+
+    def is_autostart_enabled(self) -> bool:
+        return bool(self._conn.call("is_autostart_enabled"))
+
+    def set_autostart(self, enabled: bool) -> None:
+        self._conn.call("set_autostart", enabled=enabled)
+
+
+class RemoteListener:
+    def __init__(self, conn: SettingsConnection) -> None:
+        self._conn = conn
+        self._capture_callback: Optional[Callable[[str], None]] = None
+        conn.on_event("captured", self._on_captured)
+
+    def reload(self) -> None:
+        self._conn.call("reload")
+
+    def start_capture(self, callback: Callable[[str], None]) -> None:
+        self._capture_callback = callback
+        self._conn.call("start_capture")
+
+    def cancel_capture(self) -> None:
+        self._capture_callback = None
+        self._conn.call("cancel_capture")
+
+    def plugin_actions(self) -> List[Tuple[str, str]]:
+        return [(str(name), str(title)) for name, title in self._conn.call("plugin_actions")]
+
+    def load_plugin(self, name: str) -> bool:
+        return bool(self._conn.call("load_plugin", name=name))
+
+    def _on_captured(self, message: Dict[str, Any]) -> None:
+        callback = self._capture_callback
+        self._capture_callback = None
+        if callback is not None:
+            callback(str(message.get("combo", "")))
+
+
+def run_settings_client(port: int) -> None:
+    from core.ui.settings import SettingsWindow
+
+    conn = SettingsConnection(port, os.environ.pop(TOKEN_ENV, ""))
+    config = RemoteConfig(conn)
+    set_locale(config.get_language())
+
+    window: Optional[SettingsWindow] = None
+
+    def on_close(reason: CloseReason) -> None:
+        if reason is CloseReason.HIDDEN and window is not None:
+            window.request_destroy()
+
+    window = SettingsWindow(config, RemoteListener(conn), on_close=on_close)  # type: ignore[arg-type]
+    conn.on_event("focus", lambda _message: window.focus_window())
+    conn.on_event("destroy", lambda _message: window.request_destroy())
+    conn.on_disconnect = window.request_destroy
+    try:
+        window.run()
+    finally:
+        conn.close()
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import os
-from typing import Callable, Dict, List, Optional, Set
+import threading
+from typing import Callable, Dict, Optional
 
 import customtkinter as ctk
-import keyboard
 
 from core.config import Config
 from core.constants import (
@@ -14,6 +14,7 @@ from core.constants import (
     get_resource_path,
 )
 from core.i18n import SUPPORTED_LOCALES, set_locale, t
+from core.log import log
 from core.tools.listener import HotkeyListener
 from core.ui.contracts import CloseReason
 
@@ -56,9 +57,12 @@ class SettingsWindow:
         self._on_language_changed_callback = on_language_changed
         self._hotkey_buttons: Dict[str, ctk.CTkButton] = {}
         self._hotkey_values: Dict[str, str] = {}
+        self._plugin_titles: Dict[str, str] = {}
         self._root = ctk.CTk()
         self._record_action_key: Optional[str] = None
-        self._record_hook: Optional[object] = None
+        self._wake = threading.Event()
+        self._hidden = False
+        self._destroy_requested = False
 
     @property
     def root(self) -> ctk.CTk:
@@ -71,25 +75,40 @@ class SettingsWindow:
             return False
 
     def focus_window(self) -> None:
+        if self._hidden:
+            self._wake.set()
+            return
         if not self.is_alive():
             return
+        try:
+            self._root.after(0, self._show)
+        except Exception:
+            log.exception("Failed to schedule settings window focus")
+
+    def _show(self) -> None:
         try:
             self._refresh_hotkeys_from_config()
             self._root.deiconify()
             self._root.lift()
             self._root.focus_force()
         except Exception:
-            pass
+            log.exception("Failed to focus settings window")
 
     def request_destroy(self) -> None:
+        if self._hidden:
+            self._destroy_requested = True
+            self._wake.set()
+            return
         if not self.is_alive():
             return
         try:
             self._root.after(0, lambda: self._close(CloseReason.DESTROYED))
         except Exception:
-            pass
+            log.exception("Failed to schedule settings window destroy")
 
     def _close(self, reason: CloseReason) -> None:
+        if reason is CloseReason.HIDDEN:
+            self._hidden = True
         self._stop_recording()
         if self._on_close_callback:
             self._on_close_callback(reason)
@@ -99,21 +118,26 @@ class SettingsWindow:
             try:
                 self._root.quit()
             except Exception:
-                pass
+                log.exception("Failed to quit settings mainloop")
             try:
                 self._root.destroy()
             except Exception:
-                pass
+                log.exception("Failed to destroy settings window")
         else:
             try:
                 self._root.withdraw()
+                self._root.quit()
             except Exception:
-                pass
+                log.exception("Failed to hide settings window")
 
     def _refresh_hotkeys_from_config(self) -> None:
         hotkeys = self._config.get_hotkeys()
+        plugin_hotkeys = self._config.get_plugin_hotkeys()
         for key in DEFAULT_HOTKEYS:
             self._hotkey_values[key] = hotkeys.get(key, DEFAULT_HOTKEYS[key])
+        for key in self._plugin_titles:
+            self._hotkey_values[key] = plugin_hotkeys.get(key, "")
+        for key in self._hotkey_values:
             btn = self._hotkey_buttons.get(key)
             if btn:
                 btn.configure(
@@ -126,7 +150,20 @@ class SettingsWindow:
             "WM_DELETE_WINDOW",
             lambda: self._close(CloseReason.HIDDEN),
         )
-        self._root.mainloop()
+        while True:
+            self._root.mainloop()
+            if not self.is_alive() or not self._hidden or not self._suspend_while_hidden():
+                break
+            self._show()
+
+    def _suspend_while_hidden(self) -> bool:
+        self._wake.wait()
+        self._wake.clear()
+        self._hidden = False
+        if self._destroy_requested:
+            self._close(CloseReason.DESTROYED)
+            return False
+        return True
 
     def _build_ui(self) -> None:
         self._configure_root()
@@ -153,7 +190,7 @@ class SettingsWindow:
             try:
                 self._root.iconbitmap(path)
             except Exception:
-                pass
+                log.warning("Failed to set window icon from %s", path)
 
     def _build_header(self, parent: ctk.CTkFrame) -> None:
         ctk.CTkLabel(
@@ -183,12 +220,18 @@ class SettingsWindow:
         hotkeys = self._config.get_hotkeys()
         for row, (key, _) in enumerate(DEFAULT_HOTKEYS.items()):
             self._hotkey_values[key] = hotkeys.get(key, DEFAULT_HOTKEYS[key])
-            self._build_hotkey_row(inner, row, key)
+            self._build_hotkey_row(inner, row, key, t(f"hotkeys.{key}"))
+
+        self._plugin_titles = dict(self._listener.plugin_actions())
+        plugin_hotkeys = self._config.get_plugin_hotkeys() if self._plugin_titles else {}
+        for row, (key, title) in enumerate(self._plugin_titles.items(), start=len(DEFAULT_HOTKEYS)):
+            self._hotkey_values[key] = plugin_hotkeys.get(key, "")
+            self._build_hotkey_row(inner, row, key, title)
 
-    def _build_hotkey_row(self, parent: ctk.CTkFrame, row: int, key: str) -> None:
+    def _build_hotkey_row(self, parent: ctk.CTkFrame, row: int, key: str, title: str) -> None:
         ctk.CTkLabel(
             parent,
-            text=t(f"hotkeys.{key}"),
+            text=title,
             font=ctk.CTkFont(size=17),
             text_color=Theme.LABEL_COLOR,
         ).grid(row=row, column=0, sticky="w", padx=(0, 16), pady=Layout.ROW_PADDING)
@@ -351,68 +394,21 @@ class SettingsWindow:
         self._root.minsize(w, h)
 
     def _start_record(self, key: str) -> None:
-        if self._record_hook is not None:
+        if self._record_action_key is not None:
             return
-        self._listener.stop()
         self._record_action_key = key
-        
-        pressed_mods: Set[str] = set()
-
-        def on_key(event: keyboard.KeyboardEvent) -> None:
-            if self._record_action_key is None:
-                return
-            
-            name = (event.name or "").strip().lower()
-            if not name:
-                return
-
-            if "ctrl" in name: name = "ctrl"
-            elif "alt" in name: name = "alt"
-            elif "shift" in name: name = "shift"
-            elif "win" in name or "cmd" in name: name = "win"
-
-            if event.event_type == keyboard.KEY_UP:
-                if name in ("ctrl", "alt", "shift", "win"):
-                    pressed_mods.discard(name)
-                return
-
-            if name in ("ctrl", "alt", "shift", "win"):
-                pressed_mods.add(name)
-                return
-
-            mods = sorted(list(pressed_mods))
-
-            order = {"ctrl": 0, "shift": 1, "alt": 2, "win": 3}
-            mods.sort(key=lambda m: order.get(m, 99))
-            
-            combo = "+".join(mods + [name]).lower()
-            
-            action_key = self._record_action_key
-            self._stop_recording()
-            if self.is_alive():
-                self._root.after(0, lambda: self._apply_recorded_combo(action_key, combo))
-
-        self._record_hook = keyboard.hook(on_key, suppress=False)
-
-    def _pressed_modifiers(self) -> List[str]:
-        result: List[str] = []
-        for mod in ("ctrl", "shift", "alt", "win"):
-            try:
-                if keyboard.is_pressed(mod):
-                    result.append(mod)
-            except Exception:
-                pass
-        return result
+        self._listener.start_capture(self._on_combo_captured)
+
+    def _on_combo_captured(self, combo: str) -> None:
+        action_key = self._record_action_key
+        self._record_action_key = None
+        if action_key is not None and self.is_alive():
+            self._root.after(0, lambda: self._apply_recorded_combo(action_key, combo))
 
     def _stop_recording(self) -> None:
-        if self._record_hook is not None:
-            try:
-                keyboard.unhook(self._record_hook)
-            except Exception:
-                pass
-            self._record_hook = None
+        if self._record_action_key is not None:
+            self._listener.cancel_capture()
         self._record_action_key = None
-        self._listener.reload()
 
     def _apply_recorded_combo(self, key: str, combo: str) -> None:
         if not self.is_alive():
@@ -424,6 +420,8 @@ class SettingsWindow:
         btn = self._hotkey_buttons.get(key)
         if btn:
             btn.configure(text=self._format_combo(combo))
+        if key in self._plugin_titles:
+            threading.Thread(target=self._listener.load_plugin, args=(key,), name="PluginLoad", daemon=True).start()
         self._save_and_reload_hotkeys()
 
     def _save_and_reload_hotkeys(self) -> None:
@@ -431,7 +429,16 @@ class SettingsWindow:
             k: (self._hotkey_values.get(k) or "").strip().lower() or DEFAULT_HOTKEYS[k]
             for k in DEFAULT_HOTKEYS
         }
-        self._config.save_config(hotkeys)
+        plugin_hotkeys = None
+        if self._plugin_titles:
+            plugin_hotkeys = self._config.get_plugin_hotkeys()
+            for key in self._plugin_titles:
+                combo = (self._hotkey_values.get(key) or "").strip().lower()
+                if combo:
+                    plugin_hotkeys[key] = combo
+                else:
+                    plugin_hotkeys.pop(key, None)
+        self._config.save_config(hotkeys, plugin_hotkeys)
         self._listener.reload()
 
     @staticmethod
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-import os
 import threading
-import webbrowser
-from typing import Optional, TYPE_CHECKING
+from typing import Callable, Optional, TYPE_CHECKING
 
 import pystray
-from PIL import Image
 
 from core.config import Config
-from core.constants import APP_NAME, YANDEX_MUSIC_PROTOCOL, get_resource_path
+from core.constants import APP_NAME, YANDEX_MUSIC_PROTOCOL
 from core.i18n import t
+from core.log import log
+from core.tools.launcher import ProtocolLauncher
 from core.tools.listener import HotkeyListener
+from core.tools.wakeups import wakeups
 from core.ui.contracts import CloseReason
+from core.ui.icons import ICON_ACTIVE, ICON_MISSING, ICON_PAUSED, TrayIconCache
+from core.ui.remote import SettingsHost
 
 if TYPE_CHECKING:
     from core.ui.settings import SettingsWindow
@@ -31,25 +33,55 @@ def _enable_dark_tray_menu() -> None:
         flush.restype = None
         flush()
     except Exception:
-        pass
-
-
-def _load_tray_icon() -> Image.Image:
-    path = get_resource_path(os.path.join("assets", "icon.ico"))
-    if os.path.isfile(path):
-        return Image.open(path)
-    return Image.new("RGBA", (64, 64), (88, 166, 255, 255))
+        log.debug("Dark tray menu is not supported on this system")
 
 
 class TrayIcon:
-    def __init__(self, listener: HotkeyListener, config: Config) -> None:
+    def __init__(self, listener: HotkeyListener, config: Config, launcher: ProtocolLauncher) -> None:
         self._listener = listener
         self._config = config
+        self._launcher = launcher
         self._icon: Optional[pystray.Icon] = None
+        self._icons = TrayIconCache(Config.get_app_data_path())
+        self._player_present = True
+        self._paused = False
+        self._shown_variant: Optional[str] = None
+        self._on_ready: Optional[Callable[[], None]] = None
         self._settings_window: Optional[SettingsWindow] = None
         self._settings_lock = threading.Lock()
+        self._settings_host = SettingsHost(config, listener, self._on_language_changed)
+
+    def preload_icon(self) -> None:
+        self._icons.preload()
+
+    def set_player_present(self, present: bool) -> None:
+        self._player_present = present
+        self._refresh_icon()
 
-    def run(self) -> None:
+    def set_paused(self, paused: bool) -> None:
+        self._paused = paused
+        self._refresh_icon()
+
+    def _current_variant(self) -> str:
+        if self._paused:
+            return ICON_PAUSED
+        return ICON_ACTIVE if self._player_present else ICON_MISSING
+
+    def _refresh_icon(self) -> None:
+        icon = self._icon
+        variant = self._current_variant()
+        if icon is None or not icon.visible or variant == self._shown_variant:
+            return
+        try:
+            # pystray's win32 backend re-encodes every assigned image to a
+            # temporary .ico and loads it, so only swap on a real change.
+            icon.icon = self._icons.get(variant)
+            self._shown_variant = variant
+        except Exception:
+            log.exception("Failed to switch tray icon to %s", variant)
+
+    def run(self, on_ready: Optional[Callable[[], None]] = None) -> None:
+        self._on_ready = on_ready
         _enable_dark_tray_menu()
         menu = pystray.Menu(
             pystray.MenuItem(
@@ -66,33 +98,38 @@ class TrayIcon:
                 lambda _: t("menu.settings"),
                 self._on_settings_click,
             ),
+            pystray.MenuItem(lambda _: t("menu.save_log"), self._on_save_log_click),
             pystray.MenuItem(lambda _: t("menu.exit"), self._on_exit_click),
         )
         self._icon = pystray.Icon(
             "yandex_music_hotkeys",
-            _load_tray_icon(),
-            APP_NAME,
-            menu,
+            title=APP_NAME,
+            menu=menu,
         )
         self._icon.run(setup=self._on_tray_ready)
 
     def _on_tray_ready(self, icon: pystray.Icon) -> None:
+        variant = self._current_variant()
+        icon.icon = self._icons.get(variant)
+        self._shown_variant = variant
         icon.visible = True
-        self._listener.reload()
+        self._refresh_icon()
+        if self._on_ready is not None:
+            self._on_ready()
 
     def _on_language_changed(self) -> None:
         if self._icon is not None:
             try:
                 self._icon.update_menu()
             except Exception:
-                pass
+                log.exception("Failed to update tray menu")
 
     def _on_open_app_click(
         self,
         _icon: pystray.Icon,
         _item: pystray.MenuItem,
     ) -> None:
-        webbrowser.open(YANDEX_MUSIC_PROTOCOL)
+        self._launcher.launch(YANDEX_MUSIC_PROTOCOL)
 
     def _on_settings_click(
         self,
@@ -102,11 +139,23 @@ class TrayIcon:
         if self._settings_window is not None:
             self._settings_window.focus_window()
             return
+        if self._config.is_settings_out_of_process() and self._settings_host.open():
+            return
         if not self._settings_lock.acquire(blocking=False):
             return
         threading.Thread(target=self._run_settings_ui, daemon=True).start()
 
 
+    def _on_save_log_click(
+        self,
+        _icon: pystray.Icon,
+        _item: pystray.MenuItem,
+    ) -> None:
+        self._report_wakeups()
+        path = log.dump()
+        if path:
+            log.info("Diagnostic log saved to %s", path)
+
     def _on_exit_click(
         self,
         icon: pystray.Icon,
@@ -115,9 +164,23 @@ class TrayIcon:
         if self._settings_window is not None:
             self._settings_window.request_destroy()
             self._settings_window = None
+        self._settings_host.close()
         self._listener.stop()
+        self._report_wakeups()
+        log.info("Exiting")
+        log.stop()
         icon.stop()
 
+    @staticmethod
+    def _report_wakeups() -> None:
+        idle, user_input = wakeups.rates()
+        log.info(
+            "Wakeups/min: idle %s, input %s",
+            {source: round(rate, 2) for source, rate in sorted(idle.items())},
+            {source: round(rate, 2) for source, rate in sorted(user_input.items())},
+        )
+        log.info("Idle wakeups per minute, oldest first: %s", wakeups.idle_per_minute())
+
     def _run_settings_ui(self) -> None:
         from core.ui.settings import SettingsWindow
 
@@ -141,4 +204,3 @@ class TrayIcon:
             self._settings_lock.release()
         except RuntimeError:
             pass
-        self._listener.reload()
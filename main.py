@@ -1,21 +1,118 @@
+import os
+import sys
+import time
+from typing import Tuple
+
+_PROCESS_START = time.perf_counter()
+
 from core.config import Config
+from core.constants import PLUGINS_DIRNAME, SETTINGS_UI_FLAG
 from core.i18n import set_locale
-from core.tools.controller import MediaController
+from core.log import log
+from core.startup import PHASE_HOOKS_LIVE, PHASE_TRAY_VISIBLE, StartupScheduler
+from core.tools.automation import ComtypesAutomation, UiaController
+from core.tools.controller import MediaController, PlayerBackend
+from core.tools.foreground import ForegroundTracker
+from core.tools.launcher import ProtocolLauncher
 from core.tools.listener import HotkeyListener
-from core.ui.tray import TrayIcon
+from core.tools.plugins import PluginRegistry
+from core.tools.routing import TargetRouter, load_targets
+from core.tools.session import SessionMonitor, create_session_source
+from core.tools.watchdog import HookWatchdog
+from core.tools.windows import Win32WindowBackend, watch_windows
+from core.tools.winevents import WinEventLoop
+
+
+def _warm_up_settings_ui() -> None:
+    import core.ui.settings  # noqa: F401
+
+
+def _add_plugins(plugins: PluginRegistry, listener: HotkeyListener) -> None:
+    plugins.discover()
+    listener.add_plugin_actions()
+
+
+def _start_windows(
+    config: Config,
+    launcher: ProtocolLauncher,
+    plugins: PluginRegistry,
+    session: SessionMonitor,
+) -> Tuple[PlayerBackend, HotkeyListener]:
+    events = WinEventLoop()
+    foreground = ForegroundTracker(events)
+    backend = Win32WindowBackend()
+    router = TargetRouter(backend, load_targets(config.get_targets()))
+    watch_windows(events, router)
+
+    controller = MediaController(router)
+    automation = UiaController(controller, ComtypesAutomation())
+    listener = HotkeyListener(controller, config, foreground, launcher, plugins, automation)
+    listener.start()
+    watchdog = HookWatchdog(listener)
+    foreground.add_listener(lambda _app: watchdog.check())
+    session.add_listener(lambda active: watchdog.check() if active else None)
+
+    events.start()
+    foreground.refresh()
+    router.rebuild()
+    return controller, listener
+
+
+def _start_mpris(
+    config: Config,
+    launcher: ProtocolLauncher,
+    plugins: PluginRegistry,
+) -> Tuple[PlayerBackend, HotkeyListener]:
+    from core.tools.mpris import MprisController
+
+    controller = MprisController()
+    try:
+        controller.start()
+    except Exception:
+        log.exception("Failed to connect to the session bus")
+    listener = HotkeyListener(controller, config, launcher=launcher, plugins=plugins)
+    listener.start()
+    return controller, listener
 
 
 def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == SETTINGS_UI_FLAG:
+        from core.ui.remote import run_settings_client
+
+        run_settings_client(int(sys.argv[2]))
+        return
+
+    startup = StartupScheduler(_PROCESS_START)
     config = Config()
-    config.fix_autostart_path()
-    set_locale(config.get_language())
+    log.start(Config.get_app_data_path())
 
-    controller = MediaController()
-    listener = HotkeyListener(controller, config)
-    listener.start()
+    launcher = ProtocolLauncher()
+    plugins = PluginRegistry(os.path.join(Config.get_app_data_path(), PLUGINS_DIRNAME))
+    session = SessionMonitor(create_session_source())
+    if sys.platform == "win32":
+        controller, listener = _start_windows(config, launcher, plugins, session)
+    else:
+        controller, listener = _start_mpris(config, launcher, plugins)
+    session.add_listener(listener.set_session_active)
+    startup.mark(PHASE_HOOKS_LIVE)
+
+    from core.ui.tray import TrayIcon
+
+    tray = TrayIcon(listener, config, launcher)
+    tray.set_player_present(controller.has_player)
+    controller.add_listener(tray.set_player_present)
+    session.add_listener(lambda active: tray.set_paused(not active))
+    startup.submit("locale", lambda: set_locale(config.get_language()), priority=0)
+    startup.submit("tray_icon", tray.preload_icon, priority=1)
+    startup.submit("autostart_fixup", config.fix_autostart_path, priority=2)
+    startup.submit("protocol_handler", launcher.warm, priority=2)
+    startup.submit("session_monitor", session.start, priority=2)
+    startup.submit("plugins", lambda: _add_plugins(plugins, listener), priority=2)
+    if not config.is_settings_out_of_process():
+        startup.submit("settings_warm_up", _warm_up_settings_ui, priority=3)
+    startup.start()
 
-    tray = TrayIcon(listener, config)
-    tray.run()
+    tray.run(on_ready=lambda: startup.mark(PHASE_TRAY_VISIBLE))
 
 
 if __name__ == "__main__":
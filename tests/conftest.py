@@ -0,0 +1,3 @@
+from tests.fakes import install_keyboard
+
+install_keyboard()
@@ -0,0 +1,87 @@
+import shutil
+import subprocess
+import threading
+from typing import List
+
+from jeepney import HeaderFields, MessageType, new_error, new_method_return
+from jeepney.bus_messages import message_bus
+from jeepney.io.blocking import open_dbus_connection
+
+MPRIS_ROOT = "/org/mpris/MediaPlayer2"
+PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+
+class DBusDaemon:
+    def __init__(self) -> None:
+        executable = shutil.which("dbus-daemon")
+        if executable is None:
+            raise RuntimeError("dbus-daemon is not installed")
+        self._process = subprocess.Popen(
+            [executable, "--session", "--nofork", "--nopidfile", "--print-address=1"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        self.address = self._process.stdout.readline().strip()
+        if not self.address:
+            self.close()
+            raise RuntimeError("dbus-daemon did not report an address")
+
+    def close(self) -> None:
+        self._process.terminate()
+        self._process.wait(timeout=5)
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+
+
+class MockPlayer:
+    def __init__(self, address: str, name: str = "org.mpris.MediaPlayer2.yandexmusic") -> None:
+        self.name = name
+        self.calls: List[str] = []
+        self.volume = 0.5
+        self.position = 0
+        self._conn = open_dbus_connection(bus=address)
+        self._conn.send_and_get_reply(message_bus.RequestName(name))
+        self._stopped = False
+        self._thread = threading.Thread(target=self._serve, name="MockPlayer", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopped = True
+        try:
+            self._conn.send_and_get_reply(message_bus.ReleaseName(self.name), timeout=1)
+        except Exception:
+            pass
+        self._conn.close()
+
+    def _serve(self) -> None:
+        while not self._stopped:
+            try:
+                message = self._conn.receive()
+            except Exception:
+                return
+            if message.header.message_type != MessageType.method_call:
+                continue
+            self._conn.send(self._reply(message))
+
+    def _reply(self, message):
+        fields = message.header.fields
+        interface = fields.get(HeaderFields.interface)
+        member = fields.get(HeaderFields.member)
+        if fields.get(HeaderFields.path) != MPRIS_ROOT:
+            return new_error(message, "org.freedesktop.DBus.Error.UnknownObject")
+        if interface == PLAYER_INTERFACE and member in ("Next", "Previous", "PlayPause"):
+            self.calls.append(member)
+            return new_method_return(message)
+        if interface == PLAYER_INTERFACE and member == "Seek":
+            self.position += message.body[0]
+            self.calls.append(member)
+            return new_method_return(message)
+        if interface == PROPERTIES_INTERFACE and member == "Get" and message.body == (PLAYER_INTERFACE, "Volume"):
+            return new_method_return(message, "v", (("d", self.volume),))
+        if interface == PROPERTIES_INTERFACE and member == "Set" and message.body[:2] == (PLAYER_INTERFACE, "Volume"):
+            self.volume = message.body[2][1]
+            self.calls.append("SetVolume")
+            return new_method_return(message)
+        return new_error(message, "org.freedesktop.DBus.Error.UnknownMethod")
@@ -0,0 +1,395 @@
+import contextlib
+import copy
+import json
+import os
+import sys
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from core.config import Config
+from core.constants import DEFAULT_HOTKEYS
+from core.tools.automation import StaleElementError
+
+KeyHandler = Callable[[Any], bool]
+
+
+class FakeKeyboardEvent:
+    __slots__ = ("event_type", "name", "scan_code")
+
+    def __init__(self, event_type: str, name: Optional[str], scan_code: int = 0) -> None:
+        self.event_type = event_type
+        self.name = name
+        self.scan_code = scan_code
+
+
+class FakeOsListener:
+    """Stands in for ``keyboard._listener``: each ``listen()`` thread owns one OS hook."""
+
+    def __init__(self) -> None:
+        self.listening_thread: Optional[threading.Thread] = None
+        self.registrations = 0
+        self.hooked = True
+        self._stops: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def start_if_necessary(self) -> None:
+        if self.listening_thread is None:
+            self.listening_thread = threading.Thread(target=self.listen, daemon=True)
+            self.listening_thread.start()
+            self.wait_for_registrations(1)
+
+    def listen(self) -> None:
+        stop = threading.Event()
+        with self._lock:
+            self._stops[threading.get_native_id()] = stop
+            self.registrations += 1
+            self.hooked = True
+        stop.wait()
+
+    def post_quit(self, thread_id: int) -> bool:
+        with self._lock:
+            stop = self._stops.pop(thread_id, None)
+        if stop is None:
+            return False
+        stop.set()
+        return True
+
+    def drop(self) -> None:
+        self.hooked = False
+
+    def wait_for_registrations(self, count: int, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while self.registrations < count:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+class FakeKeyboard(types.ModuleType):
+    KEY_DOWN = "down"
+    KEY_UP = "up"
+    KeyboardEvent = FakeKeyboardEvent
+
+    def __init__(self) -> None:
+        super().__init__("keyboard")
+        self.handlers: List[KeyHandler] = []
+        self.down: Set[str] = set()
+        self._listener = FakeOsListener()
+
+    def hook(self, callback: KeyHandler, suppress: bool = False) -> KeyHandler:
+        self._listener.start_if_necessary()
+        self.handlers.append(callback)
+        return callback
+
+    def unhook(self, handle: KeyHandler) -> None:
+        self.handlers.remove(handle)
+
+    def reset(self) -> None:
+        self.handlers.clear()
+        self.down.clear()
+        self._listener.hooked = True
+
+    def send(self, event_type: str, name: Optional[str], scan_code: int = 0) -> bool:
+        if event_type == self.KEY_DOWN and name:
+            self.down.add(name)
+        elif name:
+            self.down.discard(name)
+        if not self._listener.hooked:
+            return True
+        event = FakeKeyboardEvent(event_type, name, scan_code)
+        passed = True
+        for handler in list(self.handlers):
+            passed = handler(event) and passed
+        return passed
+
+    def press(self, name: str, scan_code: int = 0) -> bool:
+        return self.send(self.KEY_DOWN, name, scan_code)
+
+    def release(self, name: str, scan_code: int = 0) -> bool:
+        return self.send(self.KEY_UP, name, scan_code)
+
+    def tap(self, combo: str) -> bool:
+        keys = combo.split("+")
+        for key in keys[:-1]:
+            self.press(key)
+        passed = self.press(keys[-1])
+        for key in reversed(keys):
+            self.release(key)
+        return passed
+
+
+def install_keyboard() -> FakeKeyboard:
+    module = sys.modules.get("keyboard")
+    if not isinstance(module, FakeKeyboard):
+        module = FakeKeyboard()
+        sys.modules["keyboard"] = module
+    return module
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0, step: float = 0.0) -> None:
+        self.now = now
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class FakeConfig:
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        self.data: Dict[str, Any] = {"hotkeys": dict(DEFAULT_HOTKEYS), "profiles": {}, "gestures": {}}
+        self.data.update(copy.deepcopy(data or {}))
+        self.saves = 0
+
+    def load_config(self) -> Dict[str, Any]:
+        data = copy.deepcopy(self.data)
+        data["profiles"] = Config._parse_profiles(data.get("profiles"))
+        data["gestures"] = Config._parse_gestures(data.get("gestures"))
+        return data
+
+    def get_hotkeys(self) -> Dict[str, str]:
+        return dict(self.data["hotkeys"])
+
+    def get_profiles(self) -> Dict[str, Dict[str, str]]:
+        return copy.deepcopy(self.data["profiles"])
+
+    def get_plugin_hotkeys(self) -> Dict[str, str]:
+        return dict(self.data.get("plugin_hotkeys", {}))
+
+    def save_config(self, hotkeys: Dict[str, str], plugin_hotkeys: Optional[Dict[str, str]] = None) -> None:
+        self.data["hotkeys"] = dict(hotkeys)
+        if plugin_hotkeys is not None:
+            self.data["plugin_hotkeys"] = dict(plugin_hotkeys)
+        self.saves += 1
+
+
+class FakePlayer:
+    def __init__(self, has_player: bool = True) -> None:
+        self.has_player = has_player
+        self.performed: List[str] = []
+        self.counts: Dict[str, int] = {}
+        self._listeners: List[Callable[[bool], None]] = []
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        self._listeners.append(callback)
+
+    def perform(self, action: Any, count: int = 1) -> bool:
+        self.counts[action.name] = self.counts.get(action.name, 0) + count
+        if len(self.performed) < 1000:
+            self.performed.append(action.name)
+        return self.has_player
+
+
+class FakeElement:
+    __slots__ = ("name", "automation_id", "generation", "invokable")
+
+    def __init__(self, name: str, automation_id: str, generation: int) -> None:
+        self.name = name
+        self.automation_id = automation_id
+        self.generation = generation
+        self.invokable = True
+
+
+class FakeRoot:
+    __slots__ = ("hwnd", "generation")
+
+    def __init__(self, hwnd: int, generation: int) -> None:
+        self.hwnd = hwnd
+        self.generation = generation
+
+
+class FakeAutomationTree:
+    def __init__(
+        self,
+        size: int = 2000,
+        title: str = "Song",
+        artist: str = "Band",
+        like: str = "Like",
+        dislike: str = "Dislike",
+    ) -> None:
+        self.size = size
+        self.title = title
+        self.artist = artist
+        self.like = like
+        self.dislike = dislike
+        self.generation = 0
+        self.roots_built = 0
+        self.finds = 0
+        self.invoked: List[str] = []
+        self.nodes: List[FakeElement] = []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self.generation += 1
+        generation = self.generation
+        self.nodes = [FakeElement(f"node {index}", f"node-{index}", generation) for index in range(self.size)]
+        self.nodes += [
+            FakeElement(self.like, "player-like-button", generation),
+            FakeElement(self.dislike, "player-dislike-button", generation),
+            FakeElement(self.title, "player-track-title", generation),
+            FakeElement(self.artist, "player-track-artists", generation),
+        ]
+
+    def initialize(self) -> None:
+        pass
+
+    def root(self, hwnd: int) -> FakeRoot:
+        self.roots_built += 1
+        return FakeRoot(hwnd, self.generation)
+
+    def find(self, root: FakeRoot, query: Any) -> Optional[FakeElement]:
+        if root.generation != self.generation:
+            raise StaleElementError("root is gone")
+        self.finds += 1
+        for node in self.nodes:
+            if node.automation_id in query.automation_ids:
+                return node
+        for node in self.nodes:
+            if node.name in query.names:
+                return node
+        return None
+
+    def element(self, automation_id: str) -> FakeElement:
+        return next(node for node in self.nodes if node.automation_id == automation_id)
+
+    def invoke(self, element: FakeElement) -> bool:
+        self._check(element)
+        if not element.invokable:
+            return False
+        self.invoked.append(element.name)
+        return True
+
+    def read_name(self, element: FakeElement) -> str:
+        self._check(element)
+        return element.name
+
+    def _check(self, element: FakeElement) -> None:
+        if element.generation != self.generation:
+            raise StaleElementError("element is gone")
+
+
+class FakeRouter:
+    def __init__(self) -> None:
+        self.window_listeners: List[Callable[[int], None]] = []
+
+    def add_window_listener(self, callback: Callable[[int], None]) -> None:
+        self.window_listeners.append(callback)
+
+    def window_destroyed(self, hwnd: int) -> None:
+        for callback in self.window_listeners:
+            callback(hwnd)
+
+
+class FakeWindowBackend:
+    def __init__(self, titles: Optional[Dict[int, str]] = None) -> None:
+        self.titles: Dict[int, str] = dict(titles or {})
+        self.enumerations = 0
+
+    def enum_windows(self, callback: Callable[[int, str], bool]) -> None:
+        self.enumerations += 1
+        for hwnd, title in list(self.titles.items()):
+            if title and not callback(hwnd, title):
+                return
+
+    def get_title(self, hwnd: int) -> str:
+        return self.titles.get(hwnd, "")
+
+    def is_window(self, hwnd: int) -> bool:
+        return hwnd in self.titles
+
+
+class FakeWindowController:
+    def __init__(self, hwnd: Optional[int] = 0x1234) -> None:
+        self.hwnd = hwnd
+        self.router = FakeRouter()
+
+    def find_yandex_music_window(self, action: str = "play_pause") -> Optional[int]:
+        return self.hwnd
+
+
+def write_dummy_plugins(directory: str, count: int, prefix: str = "dummy") -> List[str]:
+    names = []
+    for index in range(count):
+        name = f"{prefix}_{index}"
+        with open(os.path.join(directory, f"{name}.py"), "w", encoding="utf-8") as f:
+            f.write(
+                "from types import SimpleNamespace\n\n\n"
+                f"def run(controller):\n    controller.perform(SimpleNamespace(name={name!r}))\n"
+            )
+        manifest = {"actions": [{"name": name, "title": f"Dummy {index}", "entry": f"{name}:run"}]}
+        with open(os.path.join(directory, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        names.append(name)
+    return names
+
+
+class FakeUser32:
+    def __init__(self, titles: List[str]) -> None:
+        self.titles = titles
+        self.visited = 0
+        self.text_calls = 0
+        self.EnumWindows = self._function(self._enum_windows)
+        self.GetWindowTextW = self._function(self._get_window_text)
+        self.IsWindow = self._function(lambda hwnd: 0 < hwnd <= len(self.titles))
+
+    @staticmethod
+    def _function(function: Callable[..., Any]) -> Callable[..., Any]:
+        return lambda *args: function(*args)
+
+    def _enum_windows(self, proc: Callable[[int, int], int], lparam: int) -> int:
+        for hwnd in range(1, len(self.titles) + 1):
+            self.visited += 1
+            if not proc(hwnd, lparam):
+                return 0
+        return 1
+
+    def _get_window_text(self, hwnd: int, buffer: Any, size: int) -> int:
+        self.text_calls += 1
+        title = self.titles[hwnd - 1][: size - 1]
+        buffer.value = title
+        return len(title)
+
+
+class AllocationCounter:
+    def __init__(self) -> None:
+        self.buffers = 0
+        self.callbacks = 0
+
+
+@contextlib.contextmanager
+def fake_user32(user32: FakeUser32) -> Iterator[AllocationCounter]:
+    import ctypes
+
+    from core.tools import windows
+
+    counter = AllocationCounter()
+    create_buffer = ctypes.create_unicode_buffer
+
+    def counting_buffer(*args: Any) -> Any:
+        counter.buffers += 1
+        return create_buffer(*args)
+
+    prototype = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_ssize_t, ctypes.c_ssize_t)
+
+    def counting_proc(function: Callable[[int, int], int]) -> Any:
+        counter.callbacks += 1
+        return prototype(function)
+
+    missing = object()
+    saved = (getattr(ctypes, "WinDLL", missing), getattr(windows, "WNDENUMPROC", missing))
+    ctypes.WinDLL = lambda name, **kwargs: user32  # type: ignore[attr-defined]
+    ctypes.create_unicode_buffer = counting_buffer
+    windows.WNDENUMPROC = counting_proc  # type: ignore[attr-defined]
+    try:
+        yield counter
+    finally:
+        ctypes.create_unicode_buffer = create_buffer
+        for owner, name, value in ((ctypes, "WinDLL", saved[0]), (windows, "WNDENUMPROC", saved[1])):
+            if value is missing:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, value)
@@ -0,0 +1,66 @@
+from typing import List, Tuple
+
+from core.tools.actions import ACTIONS_BY_NAME, MediaAction, StepCoalescer
+from core.tools.timers import TimerWheel
+from tests.fakes import FakeClock
+
+VOLUME_UP = ACTIONS_BY_NAME["volume_up"]
+
+
+class Dispatch:
+    def __init__(self) -> None:
+        self.sent: List[Tuple[str, int]] = []
+        self.answer = True
+
+    def __call__(self, action: MediaAction, count: int) -> bool:
+        self.sent.append((action.name, count))
+        return self.answer
+
+
+def _setup():
+    clock = FakeClock()
+    wheel = TimerWheel(clock, threaded=False)
+    dispatch = Dispatch()
+    return clock, wheel, dispatch, StepCoalescer(dispatch, window=0.1, wheel=wheel)
+
+
+def _advance(clock: FakeClock, wheel: TimerWheel, seconds: float) -> None:
+    clock.now += seconds
+    wheel.run_due()
+
+
+def test_first_step_is_immediate_and_repeats_are_coalesced():
+    clock, wheel, dispatch, coalescer = _setup()
+    for _ in range(5):
+        coalescer.push(VOLUME_UP)
+    assert dispatch.sent == [("volume_up", 1)]
+    _advance(clock, wheel, 0.1)
+    assert dispatch.sent == [("volume_up", 1), ("volume_up", 4)]
+    _advance(clock, wheel, 0.1)
+    coalescer.push(VOLUME_UP)
+    assert dispatch.sent[-1] == ("volume_up", 1)
+
+
+def test_failed_first_step_does_not_open_a_window():
+    clock, wheel, dispatch, coalescer = _setup()
+    dispatch.answer = False
+    coalescer.push(VOLUME_UP)
+    coalescer.push(VOLUME_UP)
+    assert dispatch.sent == [("volume_up", 1), ("volume_up", 1)]
+    _advance(clock, wheel, 0.1)
+    assert len(dispatch.sent) == 2
+
+
+def test_failed_flush_drops_the_coalesced_count():
+    clock, wheel, dispatch, coalescer = _setup()
+    coalescer.push(VOLUME_UP)
+    coalescer.push(VOLUME_UP)
+    coalescer.push(VOLUME_UP)
+    dispatch.answer = False
+    _advance(clock, wheel, 0.1)
+    assert dispatch.sent == [("volume_up", 1), ("volume_up", 2)]
+    dispatch.answer = True
+    coalescer.push(VOLUME_UP)
+    assert dispatch.sent[-1] == ("volume_up", 1)
+    _advance(clock, wheel, 0.1)
+    assert len(dispatch.sent) == 3
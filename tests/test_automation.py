@@ -0,0 +1,115 @@
+import pytest
+
+from core.tools.automation import (
+    DISLIKE_QUERY,
+    LIKE_QUERY,
+    ElementResolver,
+    StaleElementError,
+    TrackInfo,
+    UiaController,
+)
+from tests.fakes import FakeAutomationTree, FakeWindowController
+
+HWND = 0x1234
+
+
+def _invoke(element):
+    return True
+
+
+def test_resolver_caches_root_and_elements():
+    tree = FakeAutomationTree(size=100)
+    resolver = ElementResolver(tree)
+    for _ in range(10):
+        assert resolver.run(HWND, LIKE_QUERY, tree.invoke) is True
+    assert tree.invoked == ["Like"] * 10
+    assert tree.roots_built == 1
+    assert resolver.lookups == 1
+
+
+def test_stale_element_drops_the_whole_window_on_first_error():
+    tree = FakeAutomationTree(size=100)
+    resolver = ElementResolver(tree)
+    resolver.run(HWND, LIKE_QUERY, _invoke)
+    resolver.run(HWND, DISLIKE_QUERY, _invoke)
+    tree.rebuild()
+
+    resolver.run(HWND, LIKE_QUERY, tree.invoke)
+    assert tree.invoked == ["Like"]
+    assert tree.roots_built == 2
+    assert resolver.lookups == 3
+
+    resolver.run(HWND, DISLIKE_QUERY, tree.invoke)
+    assert tree.invoked == ["Like", "Dislike"]
+    assert tree.roots_built == 2
+    assert resolver.lookups == 4
+
+
+def test_second_stale_error_is_raised_and_leaves_no_cache():
+    tree = FakeAutomationTree(size=10)
+    resolver = ElementResolver(tree)
+
+    def always_stale(element):
+        raise StaleElementError("gone")
+
+    with pytest.raises(StaleElementError):
+        resolver.run(HWND, LIKE_QUERY, always_stale)
+    assert tree.roots_built == 2
+    resolver.run(HWND, LIKE_QUERY, _invoke)
+    assert tree.roots_built == 3
+
+
+def test_invalidate_only_drops_the_given_window():
+    tree = FakeAutomationTree(size=10)
+    resolver = ElementResolver(tree)
+    resolver.run(HWND, LIKE_QUERY, _invoke)
+    resolver.run(HWND + 1, LIKE_QUERY, _invoke)
+    resolver.invalidate(HWND)
+    resolver.run(HWND + 1, LIKE_QUERY, _invoke)
+    assert resolver.lookups == 2
+    resolver.run(HWND, LIKE_QUERY, _invoke)
+    assert resolver.lookups == 3
+
+
+def test_like_is_found_by_automation_id_in_any_language():
+    tree = FakeAutomationTree(size=10, like="Gefällt mir", dislike="Gefällt mir nicht")
+    resolver = ElementResolver(tree)
+    resolver.run(HWND, LIKE_QUERY, tree.invoke)
+    resolver.run(HWND, DISLIKE_QUERY, tree.invoke)
+    assert tree.invoked == ["Gefällt mir", "Gefällt mir nicht"]
+
+
+def test_element_without_invoke_pattern_is_not_treated_as_stale():
+    tree = FakeAutomationTree(size=10)
+    tree.element("player-like-button").invokable = False
+    window = FakeWindowController(HWND)
+    automation = UiaController(window, tree)  # type: ignore[arg-type]
+    try:
+        assert automation.like().result(timeout=5) is False
+        assert automation.like().result(timeout=5) is False
+    finally:
+        automation.shutdown()
+    assert tree.invoked == []
+    assert tree.roots_built == 1
+    assert tree.finds == 1
+
+
+def test_controller_runs_requests_on_the_worker():
+    tree = FakeAutomationTree(size=100, title="Title", artist="Artist")
+    window = FakeWindowController(HWND)
+    automation = UiaController(window, tree)  # type: ignore[arg-type]
+    try:
+        assert automation.like().result(timeout=5) is True
+        assert automation.dislike().result(timeout=5) is True
+        assert automation.track_info().result(timeout=5) == TrackInfo("Title", "Artist")
+
+        tree.rebuild()
+        window.router.window_destroyed(HWND)
+        assert automation.like().result(timeout=5) is True
+        assert tree.roots_built == 2
+
+        window.hwnd = None
+        assert automation.like().result(timeout=5) is False
+    finally:
+        automation.shutdown()
+    assert tree.invoked == ["Like", "Dislike", "Like"]
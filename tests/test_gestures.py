@@ -0,0 +1,103 @@
+from typing import List, Tuple
+
+from core.config import Config
+from core.tools.listener import HotkeyListener
+from core.tools.timers import TimerWheel
+from tests.fakes import FakeClock, FakeConfig, FakePlayer, install_keyboard
+
+GESTURES = {"ctrl+g": {"tap": "play_pause", "double_tap": "next_track", "hold": "mute"}}
+
+Trace = List[Tuple[float, str, str]]
+
+
+def _setup(data):
+    keyboard = install_keyboard()
+    keyboard.reset()
+    clock = FakeClock()
+    wheel = TimerWheel(clock, threaded=False)
+    player = FakePlayer()
+    listener = HotkeyListener(player, FakeConfig(data), wheel=wheel)  # type: ignore[arg-type]
+    listener.start()
+    return keyboard, clock, wheel, player, listener
+
+
+def _replay(data, trace: Trace, app=None, until: float = 2.0) -> List[str]:
+    keyboard, clock, wheel, player, listener = _setup(data)
+    listener._on_foreground_changed(app)
+    for at, event_type, key in trace:
+        _advance(clock, wheel, at)
+        keyboard.send(event_type, key)
+    _advance(clock, wheel, until)
+    return player.performed
+
+
+def _advance(clock: FakeClock, wheel: TimerWheel, until: float, tick: float = 0.01) -> None:
+    while clock.now + tick <= until:
+        clock.now += tick
+        wheel.run_due()
+    clock.now = until
+    wheel.run_due()
+
+
+def _press(at: float, duration: float, key: str = "g") -> Trace:
+    return [(at, "down", "ctrl"), (at, "down", key), (at + duration, "up", key), (at + duration, "up", "ctrl")]
+
+
+def test_tap_fires_after_the_double_tap_window():
+    assert _replay({"gestures": GESTURES}, _press(0.0, 0.05)) == ["play_pause"]
+
+
+def test_double_tap():
+    assert _replay({"gestures": GESTURES}, _press(0.0, 0.05) + _press(0.2, 0.05)) == ["next_track"]
+
+
+def test_slow_second_tap_is_two_taps():
+    assert _replay({"gestures": GESTURES}, _press(0.0, 0.05) + _press(0.5, 0.05)) == ["play_pause", "play_pause"]
+
+
+def test_hold_repeats_until_release():
+    assert _replay({"gestures": GESTURES}, _press(0.0, 1.1)) == ["mute", "mute", "mute"]
+
+
+def test_disabled_profile_drops_gestures():
+    data = {"gestures": GESTURES, "profiles": {"game.exe": {"play_pause": "", "next_track": "", "mute": ""}}}
+    assert _replay(data, _press(0.0, 0.05), app="game.exe") == []
+    assert _replay(data, _press(0.0, 0.05), app="other.exe") == ["play_pause"]
+
+
+def test_profile_override_drops_only_that_gesture_kind():
+    data = {"gestures": GESTURES, "profiles": {"game.exe": {"play_pause": ""}}}
+    trace = _press(0.0, 0.05) + _press(1.0, 0.05) + _press(1.2, 0.05)
+    assert _replay(data, trace, app="game.exe") == ["next_track"]
+
+
+def test_remapped_profile_action_keeps_its_gesture():
+    data = {"gestures": GESTURES, "profiles": {"game.exe": {"play_pause": "ctrl+p"}}}
+    assert _replay(data, _press(0.0, 0.05), app="game.exe") == ["play_pause"]
+
+
+def test_profiles_accept_plugin_action_names():
+    profiles = Config._parse_profiles({"game.exe": {"my_plugin": "", "mute": "Ctrl+M"}})
+    assert profiles["game.exe"]["hotkeys"] == {"my_plugin": "", "mute": "ctrl+m"}
+
+
+def test_gestures_for_non_default_actions_survive_a_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "get_app_data_path", staticmethod(lambda: str(tmp_path)))
+    config = Config()
+    config.load_config()
+    config._write_config({"gestures": {"ctrl+g": {"tap": "my_plugin", "hold": "like"}}})
+    config.save_config(config.get_hotkeys())
+    assert config.load_config()["gestures"] == {"ctrl+g": {"tap": "my_plugin", "hold": "like"}}
+
+
+def test_false_profile_disables_gestures_too():
+    data = {"gestures": GESTURES, "profiles": {"game.exe": False}}
+    assert _replay(data, _press(0.0, 0.05), app="game.exe") == []
+
+
+def test_save_keeps_raw_profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "get_app_data_path", staticmethod(lambda: str(tmp_path)))
+    config = Config()
+    config._write_config({"profiles": {"game.exe": False, "obs64.exe": {"mute": ""}}})
+    config.save_config(config.get_hotkeys())
+    assert config._read_raw()["profiles"] == {"game.exe": False, "obs64.exe": {"mute": ""}}
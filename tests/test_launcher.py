@@ -0,0 +1,91 @@
+import sys
+from typing import List
+
+import pytest
+
+import core.tools.launcher as launcher_module
+from core.tools.launcher import ProtocolLauncher, _expand, _split_command
+from tests.fakes import FakeClock
+
+URL = "yandexmusic://radio/user/onyourwave"
+
+
+class Spawned:
+    def __init__(self) -> None:
+        self.commands: List[List[str]] = []
+
+    def __call__(self, command: List[str], **kwargs) -> None:
+        self.commands.append(command)
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    spawned = Spawned()
+    monkeypatch.setattr(launcher_module.subprocess, "Popen", spawned)
+    return spawned
+
+
+@pytest.fixture
+def which(monkeypatch):
+    calls: List[str] = []
+
+    def fake_which(name: str) -> str:
+        calls.append(name)
+        return "/usr/bin/" + name
+
+    monkeypatch.setattr(launcher_module.shutil, "which", fake_which)
+    return calls
+
+
+def test_split_quoted_command_with_placeholder():
+    command = _split_command(r'"C:\Program Files\Yandex Music\Yandex Music.exe" "%1"')
+    assert command == [r"C:\Program Files\Yandex Music\Yandex Music.exe", "%1"]
+    assert _expand(command, URL) == [r"C:\Program Files\Yandex Music\Yandex Music.exe", URL]
+
+
+def test_split_unquoted_command_keeps_its_arguments():
+    assert _split_command(r"C:\Apps\ym.exe --open %L") == [r"C:\Apps\ym.exe", "--open", "%L"]
+
+
+def test_split_appends_the_url_when_the_command_has_no_placeholder():
+    assert _split_command(r'"C:\Apps\ym.exe"') == [r"C:\Apps\ym.exe", "%1"]
+
+
+def test_split_empty_command():
+    assert _split_command("") is None
+    assert _split_command('""') is None
+
+
+def test_same_url_is_throttled_for_five_seconds(spawned, which):
+    clock = FakeClock()
+    launcher = ProtocolLauncher(clock=clock)
+    assert launcher.launch(URL)
+    clock.now = 4.9
+    assert not launcher.launch(URL)
+    assert launcher.launch("yandexmusic://")
+    clock.now = 5.0
+    assert launcher.launch(URL)
+    assert len(spawned.commands) == 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="xdg-open is the non-Windows fallback")
+def test_handler_is_resolved_once_through_xdg_open(spawned, which):
+    clock = FakeClock()
+    launcher = ProtocolLauncher(clock=clock)
+    assert launcher.resolve() == ["/usr/bin/xdg-open", "%1"]
+    for index in range(3):
+        clock.now = index * 10.0
+        assert launcher.launch(URL)
+    assert which == ["xdg-open"]
+    assert spawned.commands == [["/usr/bin/xdg-open", URL]] * 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="xdg-open is the non-Windows fallback")
+def test_missing_handler_is_cached_and_launch_fails(monkeypatch, spawned):
+    calls: List[str] = []
+    monkeypatch.setattr(launcher_module.shutil, "which", lambda name: calls.append(name))
+    launcher = ProtocolLauncher(clock=FakeClock())
+    assert not launcher.launch(URL)
+    assert launcher.resolve() is None
+    assert calls == ["xdg-open"]
+    assert spawned.commands == []
@@ -0,0 +1,128 @@
+from concurrent.futures import Future
+from typing import List, Optional
+
+from core.config import Config
+from core.constants import DEFAULT_HOTKEYS, DEFAULT_LINKS
+from core.log import log
+from core.tools.automation import TrackInfo
+from core.tools.listener import HotkeyListener
+from core.tools.timers import TimerWheel
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard
+
+
+def _done(result=None, error: Optional[BaseException] = None) -> Future:
+    future: Future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class FakeAutomation:
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.calls: List[str] = []
+        self.error = error
+
+    def like(self) -> Future:
+        self.calls.append("like")
+        return _done(True, self.error)
+
+    def dislike(self) -> Future:
+        self.calls.append("dislike")
+        return _done(True, self.error)
+
+    def track_info(self) -> Future:
+        self.calls.append("track_info")
+        return _done(TrackInfo("Song", "Band"))
+
+
+def _listener(config: FakeConfig, **kwargs) -> HotkeyListener:
+    keyboard = install_keyboard()
+    keyboard.reset()
+    listener = HotkeyListener(FakePlayer(), config, **kwargs)  # type: ignore[arg-type]
+    listener.start()
+    return listener
+
+
+def test_like_and_dislike_are_unbound_hotkeys_not_links():
+    assert DEFAULT_HOTKEYS["like"] == ""
+    assert DEFAULT_HOTKEYS["dislike"] == ""
+    assert "like" not in DEFAULT_LINKS
+    assert "dislike" not in DEFAULT_LINKS
+
+
+def test_like_binding_survives_load_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "get_app_data_path", staticmethod(lambda: str(tmp_path)))
+    config = Config()
+    hotkeys = config.get_hotkeys()
+    hotkeys["like"] = "ctrl+l"
+    config.save_config(hotkeys)
+    assert config.get_hotkeys()["like"] == "ctrl+l"
+    assert "like" not in config.get_links()
+
+
+def test_like_dispatches_through_automation():
+    automation = FakeAutomation()
+    _listener(FakeConfig({"hotkeys": {"like": "ctrl+l", "dislike": "ctrl+d"}}), automation=automation)
+    keyboard = install_keyboard()
+    assert keyboard.tap("ctrl+l") is False
+    assert keyboard.tap("ctrl+d") is False
+    assert automation.calls == ["like", "track_info", "dislike", "track_info"]
+    assert any(line.endswith("INFO like: Song - Band\n") for line in log.snapshot())
+
+
+def test_failed_automation_request_is_logged():
+    automation = FakeAutomation(error=RuntimeError("invoke failed"))
+    _listener(FakeConfig({"hotkeys": {"like": "ctrl+l"}}), automation=automation)
+    assert install_keyboard().tap("ctrl+l") is False
+    assert automation.calls == ["like"]
+    assert any("Automation like failed: RuntimeError('invoke failed')" in line for line in log.snapshot())
+
+
+def test_like_is_not_registered_without_automation():
+    _listener(FakeConfig({"hotkeys": {"like": "ctrl+l"}}), launcher=object())  # type: ignore[arg-type]
+    assert install_keyboard().tap("ctrl+l") is True
+
+
+class FakeLauncher:
+    def __init__(self) -> None:
+        self.urls: List[str] = []
+
+    def launch(self, url: str) -> bool:
+        self.urls.append(url)
+        return True
+
+
+def _pass_through_setup(has_player: bool):
+    keyboard = install_keyboard()
+    keyboard.reset()
+    wheel = TimerWheel(lambda: 0.0, threaded=False)
+    player = FakePlayer(has_player)
+    launcher = FakeLauncher()
+    config = FakeConfig({"hotkeys": {"play_pause": "ctrl+space", "open_my_wave": "ctrl+w"}})
+    listener = HotkeyListener(player, config, launcher=launcher, wheel=wheel)  # type: ignore[arg-type]
+    listener.start()
+    return keyboard, wheel, player, launcher
+
+
+def test_media_key_is_suppressed_and_dispatched_with_a_player():
+    keyboard, wheel, player, launcher = _pass_through_setup(True)
+    assert keyboard.tap("ctrl+space") is False
+    assert player.performed == []
+    wheel.run_due()
+    assert player.performed == ["play_pause"]
+
+
+def test_media_key_passes_through_without_a_player():
+    keyboard, wheel, player, launcher = _pass_through_setup(False)
+    assert keyboard.tap("ctrl+space") is True
+    assert player.performed == []
+
+
+def test_player_free_action_fires_without_a_player():
+    keyboard, wheel, player, launcher = _pass_through_setup(False)
+    assert keyboard.tap("ctrl+w") is False
+    wheel.run_due()
+    assert launcher.urls == [DEFAULT_LINKS["open_my_wave"]]
+    assert player.performed == []
@@ -0,0 +1,90 @@
+import os
+import time
+
+from core.constants import LOG_FILENAME
+from core.log import RingLog
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_ring_keeps_only_the_newest_records():
+    ring = RingLog(ring_size=5)
+    for index in range(10):
+        ring.debug("event %d", index)
+    lines = ring.snapshot()
+    assert len(lines) == 5
+    assert lines[0].endswith("DEBUG event 5\n")
+    assert lines[-1].endswith("DEBUG event 9\n")
+
+
+def test_info_is_flushed_on_the_timer(tmp_path):
+    ring = RingLog(flush_interval=0.05)
+    ring.start(str(tmp_path))
+    try:
+        ring.info("Hotkey %s", "ctrl+space")
+        path = os.path.join(str(tmp_path), LOG_FILENAME)
+        assert _wait_for(lambda: os.path.exists(path) and "Hotkey ctrl+space" in _read(path))
+    finally:
+        ring.stop()
+
+
+def test_stop_flushes_pending_info(tmp_path):
+    ring = RingLog(flush_interval=60.0)
+    ring.start(str(tmp_path))
+    ring.info("last words")
+    ring.debug("ring only")
+    ring.stop()
+    contents = _read(os.path.join(str(tmp_path), LOG_FILENAME))
+    assert "last words" in contents
+    assert "ring only" not in contents
+
+
+def test_rotation_keeps_backup_count_files(tmp_path):
+    ring = RingLog(max_bytes=200, backup_count=2)
+    ring._directory = str(tmp_path)
+    for index in range(20):
+        ring.info("record %d %s", index, "x" * 40)
+        ring._write_pending()
+    names = sorted(os.listdir(str(tmp_path)))
+    assert names == [LOG_FILENAME, LOG_FILENAME + ".1", LOG_FILENAME + ".2"]
+    assert "record 19" in _read(os.path.join(str(tmp_path), LOG_FILENAME))
+    for name in names:
+        assert os.path.getsize(os.path.join(str(tmp_path), name)) < 400
+
+
+def test_dropped_records_are_counted_in_the_file(tmp_path):
+    ring = RingLog(ring_size=4)
+    ring._directory = str(tmp_path)
+    for index in range(10):
+        ring.info("record %d", index)
+    ring._write_pending()
+    ring.info("record 10")
+    ring._write_pending()
+    lines = _read(os.path.join(str(tmp_path), LOG_FILENAME)).splitlines()
+    assert lines[0].endswith("WARNING Dropped 6 log records, the writer fell behind")
+    assert [line.split(" ", 3)[3] for line in lines[1:]] == [f"record {index}" for index in range(6, 11)]
+
+
+def test_dump_writes_the_ring_including_debug(tmp_path):
+    ring = RingLog()
+    ring.debug("not in the file")
+    assert ring.dump() is None
+    ring._directory = str(tmp_path)
+    ring.warning("something odd")
+    path = ring.dump()
+    assert path is not None and os.path.dirname(path) == str(tmp_path)
+    contents = _read(path)
+    assert "DEBUG not in the file" in contents
+    assert "WARNING something odd" in contents
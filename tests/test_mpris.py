@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+pytest.importorskip("jeepney")
+
+from core.tools.actions import ACTIONS_BY_NAME  # noqa: E402
+from core.tools.mpris import MprisController  # noqa: E402
+from tests.dbus_player import DBusDaemon, MockPlayer  # noqa: E402
+
+
+@pytest.fixture
+def daemon():
+    try:
+        bus = DBusDaemon()
+    except (OSError, RuntimeError) as exc:
+        pytest.skip(f"no dbus-daemon: {exc}")
+    yield bus
+    bus.close()
+
+
+@pytest.fixture
+def controller(daemon):
+    controller = MprisController(bus=daemon.address, timeout=2.0)
+    yield controller
+    controller.stop()
+
+
+def test_commands_reach_the_player(daemon, controller):
+    player = MockPlayer(daemon.address)
+    try:
+        controller.start()
+        assert controller.player_name == player.name
+        for name in ("next_track", "previous_track", "play_pause"):
+            assert controller.perform(ACTIONS_BY_NAME[name]) is True
+        assert controller.perform(ACTIONS_BY_NAME["seek_forward"], 2) is True
+        assert controller.perform(ACTIONS_BY_NAME["volume_up"], 2) is True
+        assert player.calls == ["Next", "Previous", "PlayPause", "Seek", "SetVolume"]
+        assert player.position == 10_000_000
+        assert player.volume == pytest.approx(0.6)
+    finally:
+        player.close()
+
+
+def test_player_arrival_and_departure_are_tracked(daemon, controller):
+    changes = []
+    changed = threading.Event()
+
+    def on_change(present: bool) -> None:
+        changes.append(present)
+        changed.set()
+
+    controller.add_listener(on_change)
+    controller.start()
+    assert changes == [False]
+    assert controller.perform(ACTIONS_BY_NAME["play_pause"]) is False
+
+    changed.clear()
+    player = MockPlayer(daemon.address)
+    assert changed.wait(5)
+    assert controller.has_player
+
+    changed.clear()
+    player.close()
+    assert changed.wait(5)
+    assert changes == [False, True, False]
+    assert not controller.has_player
+
+
+def test_other_mpris_players_are_ignored(daemon, controller):
+    other = MockPlayer(daemon.address, "org.mpris.MediaPlayer2.vlc")
+    try:
+        controller.start()
+        assert not controller.has_player
+    finally:
+        other.close()
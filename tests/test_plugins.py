@@ -0,0 +1,45 @@
+import sys
+
+from core.tools.listener import HotkeyListener
+from core.tools.plugins import PluginRegistry
+from core.tools.timers import TimerWheel
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard, write_dummy_plugins
+
+
+def _setup(tmp_path, prefix: str, count: int = 3):
+    keyboard = install_keyboard()
+    keyboard.reset()
+    names = write_dummy_plugins(str(tmp_path), count, prefix)
+    wheel = TimerWheel(lambda: 0.0, threaded=False)
+    player = FakePlayer()
+    plugins = PluginRegistry(str(tmp_path), group="ymh.tests.none")
+    config = FakeConfig({"plugin_hotkeys": {names[1]: "ctrl+k"}})
+    listener = HotkeyListener(player, config, plugins=plugins, wheel=wheel)  # type: ignore[arg-type]
+    listener.start()
+    return keyboard, wheel, player, plugins, listener, names
+
+
+def test_plugin_bindings_go_live_after_discovery(tmp_path):
+    keyboard, wheel, player, plugins, listener, names = _setup(tmp_path, "late")
+    assert keyboard.tap("ctrl+k") is True
+
+    plugins.discover()
+    listener.add_plugin_actions()
+    assert all(name not in sys.modules for name in names)
+
+    assert keyboard.tap("ctrl+k") is False
+    wheel.run_due()
+    assert player.performed == [names[1]]
+    assert names[1] in sys.modules
+    assert names[0] not in sys.modules
+
+
+def test_settings_sees_plugin_titles_and_can_preload(tmp_path):
+    keyboard, wheel, player, plugins, listener, names = _setup(tmp_path, "titled")
+    plugins.discover()
+    listener.add_plugin_actions()
+    assert listener.plugin_actions() == [(name, f"Dummy {index}") for index, name in enumerate(names)]
+    assert names[2] not in sys.modules
+    assert listener.load_plugin(names[2]) is True
+    assert names[2] in sys.modules
+    assert listener.load_plugin("missing") is False
@@ -0,0 +1,121 @@
+import json
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip("pystray")
+
+from core.ui.remote import RemoteConfig, RemoteListener, SettingsConnection, SettingsHost  # noqa: E402
+from core.tools.listener import HotkeyListener  # noqa: E402
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard  # noqa: E402
+
+TOKEN = "secret"
+
+
+class FakeProcess:
+    def __init__(self) -> None:
+        self.killed = False
+
+    def poll(self):
+        return 1 if self.killed else None
+
+    def kill(self) -> None:
+        self.killed = True
+
+
+def _serve(host: SettingsHost) -> int:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    threading.Thread(target=host._serve, args=(server, TOKEN, FakeProcess()), daemon=True).start()
+    return server.getsockname()[1]
+
+
+def _setup():
+    keyboard = install_keyboard()
+    keyboard.reset()
+    config = FakeConfig({"hotkeys": {"play_pause": "ctrl+space"}})
+    listener = HotkeyListener(FakePlayer(), config)  # type: ignore[arg-type]
+    listener.start()
+    host = SettingsHost(config, listener)  # type: ignore[arg-type]
+    conn = SettingsConnection(_serve(host), TOKEN)
+    return keyboard, config, listener, conn
+
+
+def test_config_round_trip_over_the_socket():
+    keyboard, config, listener, conn = _setup()
+    try:
+        remote = RemoteConfig(conn)
+        hotkeys = remote.get_hotkeys()
+        assert hotkeys["play_pause"] == "ctrl+space"
+        hotkeys["mute"] = "ctrl+m"
+        remote.save_config(hotkeys, {"my_plugin": "ctrl+p"})
+        RemoteListener(conn).reload()
+        assert config.data["hotkeys"]["mute"] == "ctrl+m"
+        assert remote.get_plugin_hotkeys() == {"my_plugin": "ctrl+p"}
+        assert keyboard.tap("ctrl+m") is False
+    finally:
+        conn.close()
+
+
+def test_capture_is_forwarded_to_the_child():
+    keyboard, config, listener, conn = _setup()
+    captured = []
+    done = threading.Event()
+    try:
+        remote = RemoteListener(conn)
+        remote.start_capture(lambda combo: (captured.append(combo), done.set()))
+        assert keyboard.tap("ctrl+shift+k") is False
+        assert done.wait(5)
+        assert captured == ["ctrl+shift+k"]
+        assert remote.plugin_actions() == []
+    finally:
+        conn.close()
+
+
+def test_bad_token_is_rejected():
+    keyboard, config, listener, conn = _setup()
+    conn.close()
+    host = SettingsHost(config, listener)  # type: ignore[arg-type]
+    bad = SettingsConnection(_serve(host), "wrong")
+    try:
+        bad._sock.settimeout(5)
+        assert bad._sock.recv(1) == b""
+    finally:
+        bad.close()
+
+
+def test_capture_does_not_write_to_the_socket_from_the_hook():
+    keyboard = install_keyboard()
+    keyboard.reset()
+    config = FakeConfig()
+    listener = HotkeyListener(FakePlayer(), config)  # type: ignore[arg-type]
+    listener.start()
+    host = SettingsHost(config, listener)  # type: ignore[arg-type]
+    conn = SettingsConnection(_serve(host), TOKEN)
+    captured = []
+    done = threading.Event()
+    try:
+        RemoteListener(conn).start_capture(lambda combo: (captured.append(combo), done.set()))
+        with host._send_lock:
+            assert keyboard.tap("ctrl+shift+k") is False
+            assert not done.wait(0.2)
+        assert done.wait(5)
+        assert captured == ["ctrl+shift+k"]
+    finally:
+        conn.close()
+
+
+def test_focus_sent_before_the_child_connects_is_delivered():
+    keyboard, config, listener, conn = _setup()
+    conn.close()
+    host = SettingsHost(config, listener)  # type: ignore[arg-type]
+    host._notify("focus")
+    client = socket.create_connection(("127.0.0.1", _serve(host)), timeout=5)
+    try:
+        client.sendall(b'{"token": "secret"}\n')
+        with client.makefile("r", encoding="utf-8") as stream:
+            assert json.loads(stream.readline()) == {"event": "focus"}
+    finally:
+        client.close()
@@ -0,0 +1,126 @@
+import types
+from typing import List
+
+import pytest
+
+import core.tools.routing as routing_module
+from core.tools.routing import TargetDefinition, TargetRouter
+from tests.fakes import FakeClock, FakeWindowBackend
+
+MUSIC = TargetDefinition("music", ("Yandex Music",), priority=100)
+OTHER = TargetDefinition("other", ("Other Player",), priority=10, actions=frozenset({"play_pause"}))
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    clock = FakeClock(100.0, step=1.0)
+    monkeypatch.setattr(routing_module, "time", types.SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def _router(titles):
+    backend = FakeWindowBackend(titles)
+    router = TargetRouter(backend, (MUSIC, OTHER))
+    presence: List[bool] = []
+    gone: List[int] = []
+    router.add_listener(presence.append)
+    router.add_window_listener(gone.append)
+    router.rebuild()
+    return backend, router, presence, gone
+
+
+def test_ranking_prefers_playing_then_priority_then_last_used():
+    backend, router, presence, gone = _router({1: "Yandex Music", 2: "Other Player", 3: "Yandex Music"})
+    assert router.resolve("play_pause") in (1, 3)
+
+    router.note_used(3)
+    assert router.resolve("play_pause") == 3
+    router.note_used(1)
+    assert router.resolve("play_pause") == 1
+
+    router.note_used(2, playing=True)
+    assert router.resolve("play_pause") == 2
+    assert router.resolve("next_track") == 1
+
+    router.note_used(2, playing=False)
+    assert router.resolve("play_pause") == 1
+
+
+def test_routes_are_cached_until_something_changes():
+    backend, router, presence, gone = _router({1: "Yandex Music"})
+    assert router.resolve("play_pause") == 1
+    backend.titles[1] = "Renamed"
+    assert router.resolve("play_pause") == 1
+    assert router._routes == {"play_pause": 1}
+
+
+def test_incremental_updates_track_windows_without_enumerating():
+    backend, router, presence, gone = _router({})
+    assert presence == []
+    assert router.resolve("play_pause") is None
+
+    backend.titles[5] = "Yandex Music"
+    router.window_changed(5)
+    assert router.has_target
+    assert presence == [True]
+    assert router.resolve("play_pause") == 5
+
+    backend.titles[6] = "Notepad"
+    router.window_changed(6)
+    assert [window.hwnd for window in router.windows()] == [5]
+
+    backend.titles[5] = "Other Player"
+    router.window_changed(5)
+    assert router.windows()[0].target is OTHER
+    assert router.resolve("next_track") is None
+    assert gone == [5]
+
+    backend.titles[5] = "Settings"
+    router.window_changed(5)
+    assert not router.has_target
+    assert presence == [True, False]
+    assert backend.enumerations == 1
+
+
+def test_destroyed_window_drops_its_cached_route():
+    backend, router, presence, gone = _router({1: "Yandex Music", 2: "Yandex Music"})
+    router.note_used(2)
+    assert router.resolve("play_pause") == 2
+
+    router.window_destroyed(2)
+    assert "play_pause" not in router._routes
+    assert router.resolve("play_pause") == 1
+    assert gone == [2]
+
+    router.window_destroyed(2)
+    assert gone == [2]
+    router.window_destroyed(1)
+    assert router.resolve("play_pause") is None
+    assert presence == [True, False]
+
+
+def test_rebuild_reports_windows_that_went_away():
+    backend, router, presence, gone = _router({1: "Yandex Music", 2: "Yandex Music"})
+    router.resolve("play_pause")
+    del backend.titles[1]
+    router.rebuild()
+    assert gone == [1]
+    assert router._routes == {}
+    assert router.resolve("play_pause") == 2
+
+
+def test_toggle_playing_flips_the_guessed_state():
+    backend, router, presence, gone = _router({1: "Yandex Music", 2: "Other Player"})
+    window = {window.hwnd: window for window in router.windows()}[2]
+    assert router.resolve("play_pause") == 1
+
+    router.toggle_playing(2)
+    assert window.playing
+    assert router.resolve("play_pause") == 2
+
+    router.toggle_playing(2)
+    assert not window.playing
+    assert router.resolve("play_pause") == 1
+
+    router.toggle_playing(99)
+    assert not window.playing
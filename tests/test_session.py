@@ -0,0 +1,148 @@
+from typing import List, Optional
+
+import pytest
+
+import core.tools.listener as listener_module
+import core.tools.session as session_module
+from core.tools.listener import HotkeyListener
+from core.tools.session import (
+    REASON_DISCONNECT,
+    REASON_LOCK,
+    REASON_SUSPEND,
+    WM_POWERBROADCAST,
+    WM_WTSSESSION_CHANGE,
+    SessionHandler,
+    SessionMonitor,
+    WtsSessionSource,
+)
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard
+
+
+class FakeSessionSource:
+    def __init__(self, fail: bool = False) -> None:
+        self.handler: Optional[SessionHandler] = None
+        self.fail = fail
+        self.stopped = 0
+
+    def start(self, handler: SessionHandler) -> None:
+        if self.fail:
+            raise OSError("no session bus")
+        self.handler = handler
+
+    def stop(self) -> None:
+        self.stopped += 1
+
+    def emit(self, active: bool, reason: str) -> None:
+        assert self.handler is not None
+        self.handler(active, reason)
+
+
+@pytest.fixture
+def os_hook(monkeypatch):
+    os_listener = install_keyboard()._listener
+    monkeypatch.setattr(listener_module, "_post_quit", os_listener.post_quit)
+    return os_listener
+
+
+def _setup():
+    keyboard = install_keyboard()
+    keyboard.reset()
+    listener = HotkeyListener(FakePlayer(), FakeConfig())  # type: ignore[arg-type]
+    listener.start()
+    source = FakeSessionSource()
+    monitor = SessionMonitor(source)
+    monitor.add_listener(listener.set_session_active)
+    monitor.start()
+    return keyboard, listener, source, monitor
+
+
+def test_lock_stops_and_unlock_reapplies_hotkeys(os_hook):
+    keyboard, listener, source, monitor = _setup()
+    assert keyboard.tap("ctrl+space") is False
+
+    source.emit(False, REASON_LOCK)
+    assert not monitor.active
+    assert not listener.is_hooked
+    assert keyboard.handlers == []
+    assert keyboard.tap("ctrl+space") is True
+
+    source.emit(True, REASON_LOCK)
+    assert monitor.active
+    assert listener.is_hooked
+    assert keyboard.tap("ctrl+space") is False
+
+
+def test_unlock_reregisters_the_os_hook(os_hook):
+    keyboard, listener, source, monitor = _setup()
+    registrations = os_hook.registrations
+    source.emit(False, REASON_LOCK)
+    os_hook.drop()
+    source.emit(True, REASON_LOCK)
+    assert os_hook.wait_for_registrations(registrations + 1)
+    assert keyboard.tap("ctrl+space") is False
+
+
+def test_session_stays_inactive_until_every_reason_ends(os_hook):
+    keyboard, listener, source, monitor = _setup()
+    changes: List[bool] = []
+    monitor.add_listener(changes.append)
+
+    source.emit(False, REASON_LOCK)
+    source.emit(False, REASON_SUSPEND)
+    source.emit(True, REASON_LOCK)
+    assert not listener.is_hooked
+    source.emit(True, REASON_SUSPEND)
+    assert listener.is_hooked
+    assert changes == [False, True]
+
+
+def test_capture_is_not_hooked_while_locked(os_hook):
+    keyboard, listener, source, monitor = _setup()
+    source.emit(False, REASON_DISCONNECT)
+    listener.start_capture(lambda combo: None)
+    assert keyboard.handlers == []
+
+
+def test_failing_source_leaves_the_monitor_stopped():
+    source = FakeSessionSource(fail=True)
+    monitor = SessionMonitor(source)
+    monitor.start()
+    monitor.stop()
+    assert source.stopped == 0
+    assert monitor.active
+
+
+def test_wts_source_reports_a_failed_window_thread(monkeypatch):
+    def fail(name: str) -> None:
+        raise OSError(f"cannot load {name}")
+
+    monkeypatch.setattr(session_module.ctypes, "WinDLL", fail, raising=False)
+    source = WtsSessionSource()
+    monitor = SessionMonitor(source)
+    monitor.start()
+    assert source._thread is None
+    assert monitor.active
+
+
+class FakeUser32:
+    def DefWindowProcW(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        return 0
+
+
+def test_wts_messages_map_to_session_events():
+    events = []
+    source = WtsSessionSource()
+    source._handler = lambda active, reason: events.append((active, reason))
+    source._user32 = FakeUser32()  # type: ignore[assignment]
+    for change in (0x7, 0x8, 0x4, 0x3, 0x5):
+        source._window_proc(1, WM_WTSSESSION_CHANGE, change, 0)
+    for change in (0x04, 0x12):
+        source._window_proc(1, WM_POWERBROADCAST, change, 0)
+    assert events == [
+        (False, REASON_LOCK),
+        (True, REASON_LOCK),
+        (False, REASON_DISCONNECT),
+        (True, REASON_DISCONNECT),
+        (False, REASON_SUSPEND),
+        (True, REASON_SUSPEND),
+    ]
@@ -0,0 +1,256 @@
+import gc
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+import core.tools.listener as listener_module
+from core.tools.listener import _MODIFIER_VKEYS, HotkeyListener
+from core.tools.timers import TimerWheel
+from tests.fakes import FakeConfig, FakePlayer, install_keyboard
+
+SCALE = float(os.environ.get("YMH_SOAK_SCALE", "1"))
+KEY_EVENTS = int(1_000_000 * SCALE)
+RELOADS = int(1_000 * SCALE)
+SETTINGS_SESSIONS = int(500 * SCALE)
+SAMPLES = 10
+
+RSS_GROWTH_LIMIT = 16 * 1024 * 1024
+OBJECT_GROWTH_LIMIT = 500
+THREAD_GROWTH_LIMIT = 0
+
+_VK_NAMES = {vk: name for name, vks in _MODIFIER_VKEYS.items() for vk in vks}
+
+
+def _rss() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _object_counts() -> Dict[str, int]:
+    gc.collect()
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+
+class Soak:
+    def __init__(self) -> None:
+        self.keyboard = install_keyboard()
+        self.keyboard.reset()
+        self.config = FakeConfig({
+            "hotkeys": {"play_pause": "ctrl+space", "next_track": "ctrl+right", "volume_up": "ctrl+up"},
+        })
+        self.player = FakePlayer()
+        self.wheel = TimerWheel(threaded=False)
+        self.listener = HotkeyListener(self.player, self.config, wheel=self.wheel)  # type: ignore[arg-type]
+        self.listener.start()
+        self.rss = []
+        self.threads = []
+
+    def key_events(self, count: int) -> None:
+        keyboard = self.keyboard
+        sent = 0
+        while sent < count:
+            keyboard.press("ctrl")
+            keyboard.press("space")
+            keyboard.release("space")
+            keyboard.press("right")
+            keyboard.release("right")
+            keyboard.release("ctrl")
+            keyboard.press("a")
+            keyboard.release("a")
+            keyboard.press("ctrl")
+            keyboard.down.discard("ctrl")
+            keyboard.press("space")
+            keyboard.release("space")
+            self.wheel.run_due()
+            sent += 12
+
+    def reloads(self, count: int) -> None:
+        for _ in range(count):
+            self.listener.reload()
+
+    def sample(self) -> None:
+        self.rss.append(_rss())
+        self.threads.append(threading.active_count())
+
+    def run(self, key_events: int, reloads: int, samples: int) -> None:
+        for _ in range(samples):
+            self.key_events(key_events // samples)
+            self.reloads(reloads // samples)
+            self.sample()
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+class FakeSettingsChild:
+    """Popen stand-in that plays the settings process over the real host socket."""
+
+    def __init__(self, command: List[str], env: Dict[str, str]) -> None:
+        from core.ui.remote import TOKEN_ENV
+
+        self._port = int(command[-1])
+        self._token = env[TOKEN_ENV]
+        self.returncode: Optional[int] = None
+        self.capturing = threading.Event()
+        self.saved = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="FakeSettingsChild", daemon=True)
+        self._thread.start()
+
+    def poll(self) -> Optional[int]:
+        return self.returncode
+
+    def kill(self) -> None:
+        self.returncode = -9
+
+    def join(self, timeout: float = 5.0) -> bool:
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        from core.ui.remote import RemoteConfig, RemoteListener, SettingsConnection
+
+        conn = SettingsConnection(self._port, self._token)
+        closed = threading.Event()
+        captured: List[str] = []
+        conn.on_event("destroy", lambda _message: closed.set())
+        conn.on_disconnect = closed.set
+        try:
+            config = RemoteConfig(conn)
+            listener = RemoteListener(conn)
+            listener.start_capture(captured.append)
+            self.capturing.set()
+            if _wait_for(lambda: bool(captured)):
+                hotkeys = config.get_hotkeys()
+                hotkeys["mute"] = captured[0]
+                config.save_config(hotkeys)
+                listener.reload()
+                self.saved.set()
+            closed.wait(5.0)
+        finally:
+            conn.close()
+            self.returncode = 0
+
+
+class SettingsSoak:
+    def __init__(self, soak: Soak, monkeypatch) -> None:
+        from core.ui import remote
+
+        self.soak = soak
+        self.children: List[FakeSettingsChild] = []
+        self.host = remote.SettingsHost(soak.config, soak.listener)  # type: ignore[arg-type]
+        monkeypatch.setattr(remote.subprocess, "Popen", self._spawn)
+
+    def _spawn(self, command: List[str], env: Dict[str, str]) -> FakeSettingsChild:
+        child = FakeSettingsChild(command, env)
+        self.children.append(child)
+        return child
+
+    def session(self, index: int) -> None:
+        host = self.host
+        assert host.open()
+        child = self.children[-1]
+        assert child.capturing.wait(5)
+        assert self.soak.keyboard.tap("ctrl+f%d" % (index % 12 + 1)) is False
+        assert child.saved.wait(5)
+        host.close()
+        assert child.join()
+        assert _wait_for(lambda: host._conn is None and not host.is_running)
+        self.children.clear()
+
+    def run(self, sessions: int, samples: int) -> None:
+        index = 0
+        for _ in range(samples):
+            for _ in range(sessions // samples):
+                self.session(index)
+                index += 1
+            _wait_for(lambda: threading.active_count() <= self.soak.threads[0] if self.soak.threads else True, 1.0)
+            self.soak.sample()
+
+
+@pytest.fixture
+def soak(monkeypatch):
+    keyboard = install_keyboard()
+    monkeypatch.setattr(
+        listener_module,
+        "_get_async_key_state",
+        lambda vk: 0x8000 if _VK_NAMES.get(vk) in keyboard.down else 0,
+    )
+    harness = Soak()
+    yield harness
+    harness.listener.stop()
+    keyboard.reset()
+
+
+def test_soak_state_and_memory_stay_flat(soak):
+    soak.run(KEY_EVENTS // 20, RELOADS // 20, 1)
+    baseline_objects = _object_counts()
+    baseline_rss = _rss()
+    baseline_threads = threading.active_count()
+    baseline_plays = soak.player.counts["play_pause"]
+
+    soak.run(KEY_EVENTS, RELOADS, SAMPLES)
+
+    grown = {
+        name: count - baseline_objects.get(name, 0)
+        for name, count in _object_counts().items()
+        if count - baseline_objects.get(name, 0) > OBJECT_GROWTH_LIMIT
+    }
+    assert not grown, f"object counts grew: {grown}"
+    assert max(soak.threads) - baseline_threads <= THREAD_GROWTH_LIMIT, soak.threads
+    if baseline_rss is not None:
+        assert max(soak.rss) - baseline_rss <= RSS_GROWTH_LIMIT, soak.rss
+
+    assert soak.listener._pressed_keys <= {"ctrl"}
+    assert len(soak.keyboard.handlers) == 1
+    cycles = -(-(KEY_EVENTS // SAMPLES) // 12) * SAMPLES
+    assert soak.player.counts["play_pause"] - baseline_plays == cycles
+    assert soak.player.counts["next_track"] == soak.player.counts["play_pause"]
+
+
+def test_settings_open_close_does_not_leak(soak, monkeypatch):
+    pytest.importorskip("pystray")
+    settings = SettingsSoak(soak, monkeypatch)
+    settings.run(max(SETTINGS_SESSIONS // 20, 1), 1)
+    baseline_objects = _object_counts()
+    baseline_threads = threading.active_count()
+    baseline_rss = _rss()
+    soak.threads = [baseline_threads]
+    soak.rss = []
+
+    settings.run(SETTINGS_SESSIONS, SAMPLES)
+
+    grown = {
+        name: count - baseline_objects.get(name, 0)
+        for name, count in _object_counts().items()
+        if count - baseline_objects.get(name, 0) > OBJECT_GROWTH_LIMIT
+    }
+    assert not grown, f"object counts grew: {grown}"
+    assert max(soak.threads[1:]) - baseline_threads <= THREAD_GROWTH_LIMIT, soak.threads
+    if baseline_rss is not None:
+        assert max(soak.rss) - baseline_rss <= RSS_GROWTH_LIMIT, soak.rss
+    assert not settings.host.is_running
+    assert soak.listener._capture_callback is None
+    assert len(soak.keyboard.handlers) == 1
+    assert soak.config.data["hotkeys"]["mute"].startswith("ctrl+f")
+
+
+def test_missed_key_up_does_not_leave_a_stale_modifier(soak):
+    keyboard = soak.keyboard
+    keyboard.press("ctrl")
+    keyboard.down.discard("ctrl")
+    assert keyboard.press("space") is True
+    assert soak.listener._pressed_keys == set()
+    assert "play_pause" not in soak.player.counts
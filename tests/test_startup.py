@@ -0,0 +1,54 @@
+from typing import List
+
+from core.log import log
+from core.startup import PHASE_BACKGROUND_DONE, PHASE_HOOKS_LIVE, StartupScheduler
+
+
+def _run(scheduler: StartupScheduler) -> None:
+    scheduler.start()
+    assert scheduler._thread is not None
+    scheduler._thread.join(timeout=5)
+
+
+def test_tasks_run_by_priority_then_submission_order():
+    ran: List[str] = []
+    scheduler = StartupScheduler()
+    scheduler.submit("warm_up", lambda: ran.append("warm_up"), priority=3)
+    scheduler.submit("tray", lambda: ran.append("tray"), priority=1)
+    scheduler.submit("locale", lambda: ran.append("locale"), priority=0)
+    scheduler.submit("autostart", lambda: ran.append("autostart"), priority=1)
+    _run(scheduler)
+    assert ran == ["locale", "tray", "autostart", "warm_up"]
+    phases = list(scheduler.report())
+    assert phases.index("task:locale") < phases.index("task:warm_up")
+    assert phases[-1] == PHASE_BACKGROUND_DONE
+
+
+def test_failing_task_does_not_block_the_rest():
+    ran: List[str] = []
+    scheduler = StartupScheduler()
+
+    def broken() -> None:
+        raise RuntimeError("registry is locked")
+
+    scheduler.submit("autostart_fixup", broken, priority=0)
+    scheduler.submit("tray_icon", lambda: ran.append("tray_icon"), priority=1)
+    _run(scheduler)
+    assert ran == ["tray_icon"]
+    assert "task:autostart_fixup" in scheduler.phases
+    assert any("Startup task autostart_fixup failed" in line for line in log.snapshot())
+
+
+def test_missed_target_is_logged_once():
+    scheduler = StartupScheduler(target_ms=-1.0)
+    scheduler.mark(PHASE_HOOKS_LIVE)
+    scheduler.mark(PHASE_HOOKS_LIVE)
+    assert not scheduler.within_target()
+    warnings = [line for line in log.snapshot() if "Hotkeys went live after" in line]
+    assert len(warnings) == 1
+
+
+def test_hooks_live_within_target():
+    scheduler = StartupScheduler(target_ms=60_000.0)
+    scheduler.mark(PHASE_HOOKS_LIVE)
+    assert scheduler.within_target()
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import core.tools.listener as listener_module
+import core.tools.timers as timers_module
+from core.tools.listener import HotkeyListener
+from core.tools.timers import TimerWheel
+from core.tools.wakeups import WakeupCounter
+from tests.fakes import FakeClock, FakeConfig, FakePlayer, install_keyboard
+
+
+def test_counter_is_exact_under_concurrent_notes():
+    counter = WakeupCounter()
+    threads = [
+        threading.Thread(target=lambda: [counter.note("keyboard") for _ in range(20_000)]) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.snapshot() == {"keyboard": 80_000}
+
+
+def test_rates_cover_a_rolling_window_and_split_input_from_idle():
+    clock = FakeClock()
+    counter = WakeupCounter(clock, window_minutes=5)
+    for _ in range(30):
+        counter.note("timer")
+    clock.now += 600
+    counter.note("keyboard")
+    counter.note("keyboard")
+    counter.note("winevent")
+
+    assert counter.per_minute() == [{}, {}, {}, {}, {"keyboard": 2, "winevent": 1}]
+    idle, user_input = counter.rates()
+    assert idle == {"winevent": 0.2}
+    assert user_input == {"keyboard": 0.4}
+    assert counter.idle_per_minute() == [0, 0, 0, 0, 1]
+    assert counter.snapshot() == {"timer": 30, "keyboard": 2, "winevent": 1}
+
+
+def test_no_timer_wakeups_while_idle(monkeypatch):
+    clock = FakeClock()
+    counter = WakeupCounter(clock)
+    monkeypatch.setattr(timers_module, "wakeups", counter)
+    monkeypatch.setattr(listener_module, "wakeups", counter)
+    keyboard = install_keyboard()
+    keyboard.reset()
+    player = FakePlayer()
+    config = FakeConfig({"gestures": {"ctrl+g": {"tap": "play_pause", "double_tap": "next_track"}}})
+    listener = HotkeyListener(player, config, wheel=TimerWheel())  # type: ignore[arg-type]
+    listener.start()
+    try:
+        keyboard.tap("ctrl+g")
+        deadline = time.monotonic() + 5.0
+        while not player.performed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert player.performed == ["play_pause"]
+        assert counter.per_minute()[-1]["timer"] >= 1
+
+        for _ in range(5):
+            clock.now += 60
+            time.sleep(0.05)
+    finally:
+        listener.stop()
+    assert counter.idle_per_minute()[-5:] == [0, 0, 0, 0, 0]
+    assert counter.rates()[1]["keyboard"] > 0
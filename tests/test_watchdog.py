@@ -0,0 +1,134 @@
+from typing import List
+
+import pytest
+
+import core.tools.listener as listener_module
+from core.constants import WATCHDOG_PROBE_VK
+from core.tools.listener import HotkeyListener
+from core.tools.timers import TimerWheel
+from core.tools.watchdog import HookWatchdog
+from tests.fakes import FakeClock, FakeConfig, FakePlayer, install_keyboard
+
+
+class Probe:
+    def __init__(self) -> None:
+        self.keyboard = install_keyboard()
+        self.deliver: List[bool] = []
+        self.sent = 0
+        self.results: List[bool] = []
+
+    def __call__(self) -> None:
+        self.sent += 1
+        if self.deliver and not self.deliver.pop(0):
+            return
+        self.results.append(self.keyboard.send(self.keyboard.KEY_DOWN, None, -WATCHDOG_PROBE_VK))
+        self.keyboard.send(self.keyboard.KEY_UP, None, -WATCHDOG_PROBE_VK)
+
+
+@pytest.fixture(autouse=True)
+def os_hook(monkeypatch):
+    os_listener = install_keyboard()._listener
+    monkeypatch.setattr(listener_module, "_post_quit", os_listener.post_quit)
+    return os_listener
+
+
+def _setup(can_probe=lambda: True):
+    keyboard = install_keyboard()
+    keyboard.reset()
+    clock = FakeClock(1000.0)
+    wheel = TimerWheel(clock, threaded=False)
+    player = FakePlayer()
+    listener = HotkeyListener(player, FakeConfig())  # type: ignore[arg-type]
+    listener.start()
+    probe = Probe()
+    watchdog = HookWatchdog(listener, wheel, probe, can_probe, min_interval=30.0, probe_timeout=0.5, miss_limit=3)
+    return clock, wheel, listener, probe, watchdog
+
+
+def _settle(clock: FakeClock, wheel: TimerWheel) -> None:
+    for _ in range(10):
+        clock.now += 0.5
+        wheel.run_due()
+
+
+def test_probe_is_swallowed_and_not_matched():
+    clock, wheel, listener, probe, watchdog = _setup()
+    captured: List[str] = []
+    listener.start_capture(captured.append)
+    watchdog.check()
+    _settle(clock, wheel)
+    assert probe.results == [False]
+    assert captured == []
+    assert watchdog.reinstall_count == 0
+    assert install_keyboard().tap("ctrl+f5") is False
+    assert captured == ["ctrl+f5"]
+
+
+def test_single_miss_reprobes_without_reinstalling():
+    clock, wheel, listener, probe, watchdog = _setup()
+    probe.deliver = [False, True]
+    watchdog.check()
+    _settle(clock, wheel)
+    assert probe.sent == 2
+    assert watchdog.reinstall_count == 0
+
+
+def test_probe_scan_code_passes_through_when_no_probe_is_outstanding():
+    clock, wheel, listener, probe, watchdog = _setup()
+    keyboard = install_keyboard()
+    assert keyboard.send(keyboard.KEY_DOWN, None, -WATCHDOG_PROBE_VK) is True
+    assert keyboard.send(keyboard.KEY_DOWN, "f20", 0x6F) is True
+
+
+def test_repeated_misses_reregister_the_os_hook(os_hook):
+    clock, wheel, listener, probe, watchdog = _setup()
+    keyboard = install_keyboard()
+    old_thread = os_hook.listening_thread
+    registrations = os_hook.registrations
+    os_hook.drop()
+    assert keyboard.tap("ctrl+space") is True
+
+    watchdog.check()
+    _settle(clock, wheel)
+    assert probe.sent == 3
+    assert watchdog.reinstall_count == 1
+    assert os_hook.wait_for_registrations(registrations + 1)
+    assert not old_thread.is_alive()
+    assert os_hook.listening_thread is not old_thread
+    assert listener.is_hooked
+    assert len(keyboard.handlers) == 1
+    assert keyboard.tap("ctrl+space") is False
+
+
+def test_reinstall_reports_failure_when_the_hook_thread_cannot_be_stopped(monkeypatch, os_hook):
+    clock, wheel, listener, probe, watchdog = _setup()
+    monkeypatch.setattr(listener_module, "_post_quit", lambda thread_id: False)
+    registrations = os_hook.registrations
+    assert listener.reinstall_hook() is False
+    assert os_hook.registrations == registrations
+    assert listener.is_hooked
+
+
+def test_probe_is_skipped_when_input_goes_elsewhere():
+    allowed = [False]
+    clock, wheel, listener, probe, watchdog = _setup(lambda: allowed[0])
+    watchdog.check()
+    _settle(clock, wheel)
+    assert probe.sent == 0
+    assert watchdog.skipped_probes == 1
+
+    allowed[0] = True
+    watchdog.check()
+    _settle(clock, wheel)
+    assert probe.sent == 1
+
+
+def test_checks_are_rate_limited():
+    clock, wheel, listener, probe, watchdog = _setup()
+    watchdog.check()
+    _settle(clock, wheel)
+    watchdog.check()
+    assert probe.sent == 1
+    clock.now += 30.0
+    watchdog.check()
+    assert probe.sent == 2
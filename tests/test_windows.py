@@ -0,0 +1,89 @@
+from typing import Callable, List
+
+from core.tools.routing import TargetRouter
+from core.tools.windows import (
+    HSHELL_REDRAW,
+    HSHELL_WINDOWCREATED,
+    HSHELL_WINDOWDESTROYED,
+    Win32WindowBackend,
+    watch_windows,
+)
+from tests.fakes import FakeUser32, FakeWindowBackend, fake_user32
+
+TITLES = [f"Window {index}" for index in range(200)]
+TITLES[49] = "Яндекс Музыка"
+
+
+def _first_match(backend: Win32WindowBackend, fragment: str):
+    found = []
+
+    def visit(hwnd: int, title: str) -> bool:
+        if fragment in title:
+            found.append(hwnd)
+            return False
+        return True
+
+    backend.enum_windows(visit)
+    return found
+
+
+def test_lookups_reuse_one_callback_and_buffer():
+    user32 = FakeUser32(TITLES)
+    with fake_user32(user32) as allocations:
+        backend = Win32WindowBackend()
+        assert (allocations.callbacks, allocations.buffers) == (1, 1)
+        for _ in range(100):
+            assert _first_match(backend, "Музыка") == [50]
+        TargetRouter(backend).rebuild()
+        assert backend.get_title(50) == "Яндекс Музыка"
+    assert (allocations.callbacks, allocations.buffers) == (1, 1)
+
+
+def test_enumeration_stops_at_the_first_match():
+    user32 = FakeUser32(TITLES)
+    with fake_user32(user32):
+        backend = Win32WindowBackend()
+        _first_match(backend, "Музыка")
+    assert user32.visited == 50
+    assert user32.text_calls == 50
+
+
+def test_prototypes_are_declared_once():
+    user32 = FakeUser32(TITLES)
+    with fake_user32(user32):
+        backend = Win32WindowBackend()
+    for name in ("EnumWindows", "GetWindowTextW", "IsWindow"):
+        function = getattr(user32, name)
+        assert function.argtypes and function.restype is not None
+    assert backend.is_window(1) and not backend.is_window(0)
+
+
+class FakeShellEvents:
+    def __init__(self) -> None:
+        self.handlers: List[Callable[[int, int], None]] = []
+
+    def subscribe_shell(self, handler: Callable[[int, int], None]) -> None:
+        self.handlers.append(handler)
+
+    def send(self, code: int, hwnd: int) -> None:
+        for handler in self.handlers:
+            handler(code, hwnd)
+
+
+def test_shell_notifications_keep_the_router_current():
+    backend = FakeWindowBackend({1: "Notepad"})
+    router = TargetRouter(backend)
+    events = FakeShellEvents()
+    watch_windows(events, router)  # type: ignore[arg-type]
+    router.rebuild()
+    assert not router.has_target
+
+    backend.titles[2] = "Yandex Music"
+    events.send(HSHELL_WINDOWCREATED, 2)
+    assert router.resolve("play_pause") == 2
+
+    backend.titles[1] = "Яндекс Музыка"
+    events.send(HSHELL_REDRAW, 1)
+    events.send(HSHELL_WINDOWDESTROYED, 2)
+    assert router.resolve("play_pause") == 1
+    assert backend.enumerations == 1